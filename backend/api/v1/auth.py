@@ -1,9 +1,9 @@
 from http import HTTPStatus
 from typing import Any, Tuple
 
+from authentication import auth_required
 from enums import Permission
 from flask import Blueprint, Response, jsonify, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
 from permissions import permissions
 from services import users_service as service
 from services.request_validators import content_type_validation
@@ -28,7 +28,7 @@ def login() -> Tuple[Any, int]:
 
 @auth.route("/register", methods=["POST"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.CREATE_USERS)
 def register() -> Tuple[Any, int]:
     content_type_validation(request.headers["Content-Type"])
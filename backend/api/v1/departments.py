@@ -1,9 +1,9 @@
 from http import HTTPStatus
 from typing import Any, Tuple
 
+from authentication import auth_required
 from enums import Permission
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
 from permissions import permissions
 from services import departments_service as service
 from services.request_validators import content_type_validation
@@ -15,7 +15,7 @@ departments: Blueprint = Blueprint("departments", __name__)
 
 @departments.route("/departments", methods=["GET"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_DEPARTMENTS)
 def select_departments() -> Tuple[Any, int]:
     return jsonify(service.select_departments()), HTTPStatus.OK
@@ -23,15 +23,15 @@ def select_departments() -> Tuple[Any, int]:
 
 @departments.route("/departments/<int:department_id>", methods=["GET"])
 @auto.doc()
-@jwt_required()
-@permissions(Permission.MANAGE_DEPARTMENTS)
+@auth_required()
+@permissions(Permission.MANAGE_DEPARTMENTS, department_from="department_id")
 def select_single_department(department_id: int) -> Tuple[Any, int]:
     return jsonify(service.select_single_department(department_id)), HTTPStatus.OK
 
 
 @departments.route("/departments", methods=["POST"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_DEPARTMENTS)
 def insert_department() -> Tuple[Any, int]:
     content_type_validation(request.headers["Content-Type"])
@@ -42,8 +42,8 @@ def insert_department() -> Tuple[Any, int]:
 
 @departments.route("/departments/<int:department_id>", methods=["PUT", "PATCH"])
 @auto.doc()
-@jwt_required()
-@permissions(Permission.MANAGE_DEPARTMENTS)
+@auth_required()
+@permissions(Permission.MANAGE_DEPARTMENTS, department_from="department_id")
 def update_department(department_id: int) -> Tuple[Any, int]:
     content_type_validation(request.headers["Content-Type"])
     body = request.get_json()
@@ -53,7 +53,7 @@ def update_department(department_id: int) -> Tuple[Any, int]:
 
 @departments.route("/departments/<int:department_id>", methods=["DELETE"])
 @auto.doc()
-@jwt_required()
-@permissions(Permission.MANAGE_DEPARTMENTS)
+@auth_required()
+@permissions(Permission.MANAGE_DEPARTMENTS, department_from="department_id")
 def delete_department(department_id: int) -> Tuple[Any, int]:
     return jsonify(service.delete_department(department_id)), HTTPStatus.OK
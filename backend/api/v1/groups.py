@@ -1,12 +1,13 @@
 from http import HTTPStatus
 from typing import Any, Tuple
 
+from authentication import auth_required
 from enums import Permission
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
 from permissions import permissions
 from services import groups_service as service
 from services.request_validators import content_type_validation
+from streaming import stream_json_array
 
 from .documentation import auto
 
@@ -15,7 +16,7 @@ groups: Blueprint = Blueprint("groups", __name__)
 
 @groups.route("/groups", methods=["GET"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_UNITS)
 def select_groups() -> Tuple[Any, int]:
     return jsonify(service.select_groups()), HTTPStatus.OK
@@ -23,15 +24,15 @@ def select_groups() -> Tuple[Any, int]:
 
 @groups.route("/users-in-group/<int:group_id>", methods=["GET"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_UNITS)
 def select_users_in_group(group_id: int) -> Tuple[Any, int]:
-    return jsonify(service.select_users_in_group(group_id)), HTTPStatus.OK
+    return stream_json_array(service.select_users_in_group(group_id)), HTTPStatus.OK
 
 
 @groups.route("/groups/<int:group_id>", methods=["GET"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_UNITS)
 def select_single_group(group_id: int) -> Tuple[Any, int]:
     return jsonify(service.select_single_group(group_id)), HTTPStatus.OK
@@ -39,7 +40,7 @@ def select_single_group(group_id: int) -> Tuple[Any, int]:
 
 @groups.route("/groups", methods=["POST"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_UNITS)
 def insert_group() -> Tuple[Any, int]:
     content_type_validation(request.headers["Content-Type"])
@@ -50,7 +51,7 @@ def insert_group() -> Tuple[Any, int]:
 
 @groups.route("/groups/<int:group_id>", methods=["PUT", "PATCH"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_UNITS)
 def update_group(group_id: str) -> Tuple[Any, int]:
     content_type_validation(request.headers["Content-Type"])
@@ -61,7 +62,7 @@ def update_group(group_id: str) -> Tuple[Any, int]:
 
 @groups.route("/groups/<int:group_id>", methods=["DELETE"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_UNITS)
 def delete_group(group_id: int) -> Tuple[Any, int]:
     return jsonify(service.delete_group(group_id)), HTTPStatus.OK
@@ -69,7 +70,7 @@ def delete_group(group_id: int) -> Tuple[Any, int]:
 
 @groups.route("/groups/roles/<int:group_id>", methods=["GET"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_UNITS)
 def select_group_roles(group_id: int) -> Tuple[Any, int]:
     return jsonify(service.select_group_roles(group_id)), HTTPStatus.OK
@@ -77,7 +78,7 @@ def select_group_roles(group_id: int) -> Tuple[Any, int]:
 
 @groups.route("/groups/roles", methods=["POST"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_UNITS)
 def set_group_role() -> Tuple[Any, int]:
     content_type_validation(request.headers["Content-Type"])
@@ -88,7 +89,7 @@ def set_group_role() -> Tuple[Any, int]:
 
 @groups.route("/groups/roles", methods=["DELETE"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_UNITS)
 def delete_user_role() -> Tuple[Any, int]:
     group_id = request.args.get("group_id", None)
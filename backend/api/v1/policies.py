@@ -1,9 +1,9 @@
 from http import HTTPStatus
 from typing import Any, Tuple
 
+from authentication import auth_required
 from enums import Permission
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
 from permissions import permissions
 from services import policies_service as service
 from services.request_validators import content_type_validation
@@ -15,7 +15,7 @@ policies: Blueprint = Blueprint("policies", __name__)
 
 @policies.route("/policies", methods=["GET"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_POLICIES)
 def select_policies() -> Tuple[Any, int]:
     return jsonify(service.select_policies()), HTTPStatus.OK
@@ -23,15 +23,26 @@ def select_policies() -> Tuple[Any, int]:
 
 @policies.route("/policies/<int:policy_id>", methods=["GET"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_POLICIES)
 def select_single_unit(policy_id: int) -> Tuple[Any, int]:
     return jsonify(service.select_single_policy(policy_id)), HTTPStatus.OK
 
 
+@policies.route("/policies/users-with-policy/<int:policy_id>", methods=["GET"])
+@auto.doc()
+@auth_required()
+@permissions(Permission.MANAGE_POLICIES)
+def select_users_with_policy(policy_id: int) -> Tuple[Any, int]:
+    return (
+        jsonify(service.select_users_with_policy(policy_id, request.args)),
+        HTTPStatus.OK,
+    )
+
+
 @policies.route("/policies", methods=["POST"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_POLICIES)
 def insert_policy() -> Tuple[Any, int]:
     content_type_validation(request.headers["Content-Type"])
@@ -42,7 +53,7 @@ def insert_policy() -> Tuple[Any, int]:
 
 @policies.route("/policies/<int:policy_id>", methods=["PUT", "PATCH"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_POLICIES)
 def update_policy(policy_id: str) -> Tuple[Any, int]:
     content_type_validation(request.headers["Content-Type"])
@@ -53,7 +64,7 @@ def update_policy(policy_id: str) -> Tuple[Any, int]:
 
 @policies.route("/policies/<int:policy_id>", methods=["DELETE"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_POLICIES)
 def delete_policy(policy_id: int) -> Tuple[Any, int]:
     return jsonify(service.delete_policy(policy_id)), HTTPStatus.OK
@@ -1,9 +1,9 @@
 from http import HTTPStatus
 from typing import Any, Tuple
 
+from authentication import auth_required
 from enums import Permission
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
 from permissions import permissions
 from services import positions_service as service
 from services.request_validators import content_type_validation
@@ -15,7 +15,7 @@ positions: Blueprint = Blueprint("positions", __name__)
 
 @positions.route("/positions", methods=["GET"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_POSITIONS)
 def select_units() -> Tuple[Any, int]:
     return jsonify(service.select_positions()), HTTPStatus.OK
@@ -23,7 +23,7 @@ def select_units() -> Tuple[Any, int]:
 
 @positions.route("/positions/<int:position_id>", methods=["GET"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_POSITIONS)
 def select_single_position(position_id: int) -> Tuple[Any, int]:
     return jsonify(service.select_single_position(position_id)), HTTPStatus.OK
@@ -31,7 +31,7 @@ def select_single_position(position_id: int) -> Tuple[Any, int]:
 
 @positions.route("/positions", methods=["POST"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_POSITIONS)
 def insert_position() -> Tuple[Any, int]:
     content_type_validation(request.headers["Content-Type"])
@@ -42,7 +42,7 @@ def insert_position() -> Tuple[Any, int]:
 
 @positions.route("/positions/<int:position_id>", methods=["PUT", "PATCH"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_POSITIONS)
 def update_position(position_id: str) -> Tuple[Any, int]:
     content_type_validation(request.headers["Content-Type"])
@@ -53,7 +53,7 @@ def update_position(position_id: str) -> Tuple[Any, int]:
 
 @positions.route("/positions/<int:position_id>", methods=["DELETE"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_POSITIONS)
 def delete_position(position_id: int) -> Tuple[Any, int]:
     return jsonify(service.delete_position(position_id)), HTTPStatus.OK
@@ -1,9 +1,9 @@
 from http import HTTPStatus
 from typing import Any, Tuple
 
+from authentication import auth_required
 from enums import Permission
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
 from permissions import permissions
 from services import units_service as service
 from services.request_validators import content_type_validation
@@ -15,7 +15,7 @@ units: Blueprint = Blueprint("units", __name__)
 
 @units.route("/units", methods=["GET"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_UNITS)
 def select_units() -> Tuple[Any, int]:
     return jsonify(service.select_units()), HTTPStatus.OK
@@ -23,24 +23,24 @@ def select_units() -> Tuple[Any, int]:
 
 @units.route("/units/department-units/<int:department_id>", methods=["GET"])
 @auto.doc()
-@jwt_required()
-@permissions(Permission.MANAGE_UNITS)
+@auth_required()
+@permissions(Permission.MANAGE_UNITS, department_from="department_id")
 def select_department_units(department_id: int) -> Tuple[Any, int]:
     return jsonify(service.select_department_units(department_id)), HTTPStatus.OK
 
 
 @units.route("/units/<int:unit_id>", methods=["GET"])
 @auto.doc()
-@jwt_required()
-@permissions(Permission.MANAGE_UNITS)
+@auth_required()
+@permissions(Permission.MANAGE_UNITS, stored_department=service.unit_department)
 def select_single_unit(unit_id: int) -> Tuple[Any, int]:
     return jsonify(service.select_single_unit(unit_id)), HTTPStatus.OK
 
 
 @units.route("/units", methods=["POST"])
 @auto.doc()
-@jwt_required()
-@permissions(Permission.MANAGE_UNITS)
+@auth_required()
+@permissions(Permission.MANAGE_UNITS, department_from="department_id")
 def insert_unit() -> Tuple[Any, int]:
     content_type_validation(request.headers["Content-Type"])
     body = request.get_json()
@@ -50,8 +50,12 @@ def insert_unit() -> Tuple[Any, int]:
 
 @units.route("/units/<int:unit_id>", methods=["PUT", "PATCH"])
 @auto.doc()
-@jwt_required()
-@permissions(Permission.MANAGE_UNITS)
+@auth_required()
+@permissions(
+    Permission.MANAGE_UNITS,
+    department_from="department_id",
+    stored_department=service.unit_department,
+)
 def update_unit(unit_id: str) -> Tuple[Any, int]:
     content_type_validation(request.headers["Content-Type"])
     body = request.get_json()
@@ -61,7 +65,7 @@ def update_unit(unit_id: str) -> Tuple[Any, int]:
 
 @units.route("/units/<int:unit_id>", methods=["DELETE"])
 @auto.doc()
-@jwt_required()
-@permissions(Permission.MANAGE_UNITS)
+@auth_required()
+@permissions(Permission.MANAGE_UNITS, stored_department=service.unit_department)
 def delete_unit(unit_id: int) -> Tuple[Any, int]:
     return jsonify(service.delete_unit(unit_id)), HTTPStatus.OK
@@ -1,12 +1,13 @@
 from http import HTTPStatus
 from typing import Any, Tuple
 
+from authentication import auth_required, current_identity
 from enums import Permission
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
 from permissions import permissions
 from services import users_service as service
 from services.request_validators import content_type_validation
+from streaming import stream_json_array
 
 from .documentation import auto
 
@@ -15,16 +16,16 @@ users: Blueprint = Blueprint("users", __name__)
 
 @users.route("/profile", methods=["GET"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 def profile() -> Tuple[Any, int]:
-    user_identity = get_jwt_identity()
+    user_identity = current_identity()
 
     return jsonify(service.user_profile(user_identity)), HTTPStatus.OK
 
 
 @users.route("/users", methods=["DELETE"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_USERS)
 def delete_user() -> Tuple[Any, int]:
     content_type_validation(request.headers["Content-Type"])
@@ -35,7 +36,7 @@ def delete_user() -> Tuple[Any, int]:
 
 @users.route("/users", methods=["PUT", "PATCH"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_USERS)
 def update_user() -> Tuple[Any, int]:
     content_type_validation(request.headers["Content-Type"])
@@ -46,7 +47,7 @@ def update_user() -> Tuple[Any, int]:
 
 @users.route("/users/departments", methods=["PUT", "PATCH"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_USERS)
 def update_user_department() -> Tuple[Any, int]:
     content_type_validation(request.headers["Content-Type"])
@@ -57,7 +58,7 @@ def update_user_department() -> Tuple[Any, int]:
 
 @users.route("/users/units", methods=["PUT", "PATCH"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_USERS)
 def update_user_unit() -> Tuple[Any, int]:
     content_type_validation(request.headers["Content-Type"])
@@ -68,7 +69,7 @@ def update_user_unit() -> Tuple[Any, int]:
 
 @users.route("/users/positions", methods=["PUT", "PATCH"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_USERS)
 def update_user_position() -> Tuple[Any, int]:
     content_type_validation(request.headers["Content-Type"])
@@ -79,15 +80,15 @@ def update_user_position() -> Tuple[Any, int]:
 
 @users.route("/users", methods=["GET"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_USERS)
 def get_users() -> Tuple[Any, int]:
-    return jsonify(service.select_users()), HTTPStatus.OK
+    return stream_json_array(service.select_users()), HTTPStatus.OK
 
 
 @users.route("/users/roles/<int:user_id>", methods=["GET"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_USERS)
 def select_user_roles(user_id: int) -> Tuple[Any, int]:
     return jsonify(service.select_user_roles(user_id)), HTTPStatus.OK
@@ -95,7 +96,7 @@ def select_user_roles(user_id: int) -> Tuple[Any, int]:
 
 @users.route("/users/roles", methods=["POST"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_USERS)
 def set_user_role() -> Tuple[Any, int]:
     content_type_validation(request.headers["Content-Type"])
@@ -106,7 +107,7 @@ def set_user_role() -> Tuple[Any, int]:
 
 @users.route("/users/roles", methods=["DELETE"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_USERS)
 def delete_user_role() -> Tuple[Any, int]:
     user_id = request.args.get("user_id", None)
@@ -115,9 +116,31 @@ def delete_user_role() -> Tuple[Any, int]:
     return jsonify(service.delete_user_role(user_id, role_id)), HTTPStatus.OK
 
 
+@users.route("/users/roles/bulk", methods=["POST"])
+@auto.doc()
+@auth_required()
+@permissions(Permission.MANAGE_USERS)
+def set_user_roles() -> Tuple[Any, int]:
+    content_type_validation(request.headers["Content-Type"])
+    body = request.get_json()
+
+    return jsonify(service.insert_user_roles(body)), HTTPStatus.OK
+
+
+@users.route("/users/roles/bulk", methods=["DELETE"])
+@auto.doc()
+@auth_required()
+@permissions(Permission.MANAGE_USERS)
+def delete_user_roles() -> Tuple[Any, int]:
+    content_type_validation(request.headers["Content-Type"])
+    body = request.get_json()
+
+    return jsonify(service.delete_user_roles(body)), HTTPStatus.OK
+
+
 @users.route("/users/groups/<int:user_id>", methods=["GET"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_USERS)
 def select_user_groups(user_id: int) -> Tuple[Any, int]:
     return jsonify(service.select_user_groups(user_id)), HTTPStatus.OK
@@ -125,7 +148,7 @@ def select_user_groups(user_id: int) -> Tuple[Any, int]:
 
 @users.route("/users/groups", methods=["POST"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_USERS)
 def set_user_group() -> Tuple[Any, int]:
     content_type_validation(request.headers["Content-Type"])
@@ -136,10 +159,32 @@ def set_user_group() -> Tuple[Any, int]:
 
 @users.route("/users/groups", methods=["DELETE"])
 @auto.doc()
-@jwt_required()
+@auth_required()
 @permissions(Permission.MANAGE_USERS)
 def delete_user_group() -> Tuple[Any, int]:
     user_id = request.args.get("user_id", None)
     group_id = request.args.get("group_id", None)
 
     return jsonify(service.delete_user_group(user_id, group_id)), HTTPStatus.OK
+
+
+@users.route("/users/groups/bulk", methods=["POST"])
+@auto.doc()
+@auth_required()
+@permissions(Permission.MANAGE_USERS)
+def set_user_groups() -> Tuple[Any, int]:
+    content_type_validation(request.headers["Content-Type"])
+    body = request.get_json()
+
+    return jsonify(service.insert_user_groups(body)), HTTPStatus.OK
+
+
+@users.route("/users/groups/bulk", methods=["DELETE"])
+@auto.doc()
+@auth_required()
+@permissions(Permission.MANAGE_USERS)
+def delete_user_groups() -> Tuple[Any, int]:
+    content_type_validation(request.headers["Content-Type"])
+    body = request.get_json()
+
+    return jsonify(service.delete_user_groups(body)), HTTPStatus.OK
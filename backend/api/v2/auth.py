@@ -1,9 +1,9 @@
 from http import HTTPStatus
 from typing import Any, Tuple
 
+from authentication import auth_required
 from enums import Permission
 from flask import request
-from flask_jwt_extended import jwt_required
 from flask_restx import Namespace, Resource, fields
 from permissions import permissions
 from services import users_service as service
@@ -70,7 +70,7 @@ class Register(Resource):
         },
         description="User registration",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.CREATE_USERS)
     def post(self) -> Tuple[Any, int]:
         """
@@ -0,0 +1,60 @@
+from http import HTTPStatus
+from typing import Any, Tuple
+
+from authentication import auth_required, current_identity
+from flask import request
+from flask_restx import Namespace, Resource, fields
+from services import authorization_service as service
+from services.request_validators import content_type_validation
+
+api = Namespace(
+    "Authorization",
+    description="Authorization related endpoints",
+    path="/api/v2/authorization",
+)
+
+permission_check = api.model(
+    "Permission check",
+    {
+        "user_id": fields.Integer(description="User identifier", required=True),
+        "permission": fields.String(
+            description="Policy title, e.g. 'Manage units'", required=True
+        ),
+        "department_id": fields.Integer(
+            description="Department the permission is checked in"
+        ),
+    },
+)
+
+permission_checks_body = api.model(
+    "Permission checks",
+    {
+        "checks": fields.List(
+            fields.Nested(permission_check),
+            description="Checks to answer",
+            required=True,
+        ),
+    },
+)
+
+
+@api.route("/check", endpoint="authorization_check")
+class AuthorizationCheck(Resource):
+    @api.doc(
+        security="apikey",
+        body=permission_checks_body,
+        responses={
+            200: "Successfully answer all checks",
+            400: "Validation error. Invalid request body content",
+            403: "Forbidden. Checks of other users require 'Manage users' permission",
+            415: "Unsupported media type",
+            422: "Unprocessable entity. Unknown permission or invalid identifier",
+        },
+        description="Check many permissions of many users at once",
+    )
+    @auth_required()
+    def post(self) -> Tuple[Any, int]:
+        content_type_validation(request.headers["Content-Type"])
+        body = request.get_json()
+
+        return service.check_permissions(body, current_identity()), HTTPStatus.OK
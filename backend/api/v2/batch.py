@@ -0,0 +1,64 @@
+from http import HTTPStatus
+from typing import Any, Tuple
+
+from authentication import auth_required
+from flask import request
+from flask_restx import Namespace, Resource, fields
+from services import batch_service as service
+from services.request_validators import content_type_validation
+
+api = Namespace(
+    "Batch",
+    description="Run many requests in one call",
+    path="/api/v2/batch",
+)
+
+batch_item = api.model(
+    "Batch item",
+    {
+        "method": fields.String(
+            description="HTTP method", enum=list(service.BATCH_METHODS), required=True
+        ),
+        "path": fields.String(
+            description="Path of v2 endpoint with query string, e.g. '/api/v2/roles/'",
+            required=True,
+        ),
+        "body": fields.Raw(description="JSON body of request"),
+    },
+)
+
+batch_body = api.model(
+    "Batch",
+    {
+        "atomic": fields.Boolean(
+            description="Commit all items at once, stop at first failed item",
+            default=False,
+        ),
+        "items": fields.List(
+            fields.Nested(batch_item),
+            description="Requests to run in order",
+            required=True,
+        ),
+    },
+)
+
+
+@api.route("", endpoint="batch")
+class Batch(Resource):
+    @api.doc(
+        security="apikey",
+        body=batch_body,
+        responses={
+            200: "Successfully run batch, results contain status of every item",
+            400: "Validation error. Invalid request body content",
+            415: "Unsupported media type",
+        },
+        description="Run ordered list of v2 requests with one authentication "
+        "and database connection",
+    )
+    @auth_required()
+    def post(self) -> Tuple[Any, int]:
+        content_type_validation(request.headers["Content-Type"])
+        body = request.get_json()
+
+        return service.run_batch(body), HTTPStatus.OK
@@ -1,9 +1,10 @@
 from http import HTTPStatus
 from typing import Any, Tuple
 
+from async_routes import async_routes
+from authentication import auth_required
 from enums import Permission
 from flask import request
-from flask_jwt_extended import jwt_required
 from flask_restx import Namespace, Resource, fields
 from permissions import permissions
 from services import departments_service as service
@@ -34,7 +35,7 @@ class Departments(Resource):
         },
         description="List departments",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_DEPARTMENTS)
     def get(self) -> Tuple[Any, int]:
         return service.select_departments(), HTTPStatus.OK
@@ -51,7 +52,7 @@ class Departments(Resource):
         },
         description="Create new department",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_DEPARTMENTS)
     def post(self) -> Tuple[Any, int]:
         content_type_validation(request.headers["Content-Type"])
@@ -71,8 +72,8 @@ class SingleDepartment(Resource):
         },
         description="Get single department",
     )
-    @jwt_required()
-    @permissions(Permission.MANAGE_DEPARTMENTS)
+    @auth_required()
+    @permissions(Permission.MANAGE_DEPARTMENTS, department_from="department_id")
     def get(self, department_id: int) -> Tuple[Any, int]:
         return service.select_single_department(department_id), HTTPStatus.OK
 
@@ -88,8 +89,8 @@ class SingleDepartment(Resource):
         },
         description="Update single department",
     )
-    @jwt_required()
-    @permissions(Permission.MANAGE_DEPARTMENTS)
+    @auth_required()
+    @permissions(Permission.MANAGE_DEPARTMENTS, department_from="department_id")
     def put(self, department_id: int) -> Tuple[Any, int]:
         content_type_validation(request.headers["Content-Type"])
         body = request.get_json()
@@ -108,8 +109,8 @@ class SingleDepartment(Resource):
         },
         description="Update single department",
     )
-    @jwt_required()
-    @permissions(Permission.MANAGE_DEPARTMENTS)
+    @auth_required()
+    @permissions(Permission.MANAGE_DEPARTMENTS, department_from="department_id")
     def patch(self, department_id: int) -> Tuple[Any, int]:
         content_type_validation(request.headers["Content-Type"])
         body = request.get_json()
@@ -124,7 +125,22 @@ class SingleDepartment(Resource):
         },
         description="Delete single department",
     )
-    @jwt_required()
-    @permissions(Permission.MANAGE_DEPARTMENTS)
+    @auth_required()
+    @permissions(Permission.MANAGE_DEPARTMENTS, department_from="department_id")
     def delete(self, department_id: int) -> Tuple[Any, int]:
         return service.delete_department(department_id), HTTPStatus.OK
+
+
+@async_routes.route(api, "/", Permission.MANAGE_DEPARTMENTS)
+async def select_departments() -> Tuple[Any, int]:
+    return await service.select_departments_async(), HTTPStatus.OK
+
+
+@async_routes.route(
+    api,
+    "/<int:department_id>",
+    Permission.MANAGE_DEPARTMENTS,
+    department_from="department_id",
+)
+async def select_single_department(department_id: int) -> Tuple[Any, int]:
+    return await service.select_single_department_async(department_id), HTTPStatus.OK
@@ -1,13 +1,15 @@
 from http import HTTPStatus
 from typing import Any, Tuple
 
+from async_routes import async_routes
+from authentication import auth_required
 from enums import Permission
-from flask import request
-from flask_jwt_extended import jwt_required
+from flask import Response, request
 from flask_restx import Namespace, Resource, fields, reqparse
 from permissions import permissions
 from services import groups_service as service
 from services.request_validators import content_type_validation
+from streaming import stream_json_array
 
 api = Namespace("Groups", description="Group related endpoints", path="/api/v2/groups")
 
@@ -37,7 +39,7 @@ class Groups(Resource):
         },
         description="List groups",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_ROLES)
     def get(self) -> Tuple[Any, int]:
         return service.select_groups(), HTTPStatus.OK
@@ -54,7 +56,7 @@ class Groups(Resource):
         },
         description="Create new group",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_ROLES)
     def post(self) -> Tuple[Any, int]:
         content_type_validation(request.headers["Content-Type"])
@@ -73,10 +75,10 @@ class UsersInGroup(Resource):
         },
         description="List users in group",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_ROLES)
-    def get(self, group_id: int) -> Tuple[Any, int]:
-        return service.select_users_in_group(group_id), HTTPStatus.OK
+    def get(self, group_id: int) -> Response:
+        return stream_json_array(service.select_users_in_group(group_id))
 
 
 @api.route("/<int:group_id>")
@@ -89,7 +91,7 @@ class SingleGroup(Resource):
         },
         description="Get single group",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_ROLES)
     def get(self, group_id: int) -> Tuple[Any, int]:
         return service.select_single_group(group_id), HTTPStatus.OK
@@ -106,7 +108,7 @@ class SingleGroup(Resource):
         },
         description="Update single group(PUT)",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_ROLES)
     def put(self, group_id: str) -> Tuple[Any, int]:
         content_type_validation(request.headers["Content-Type"])
@@ -126,7 +128,7 @@ class SingleGroup(Resource):
         },
         description="Update single group(PATCH)",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_ROLES)
     def patch(self, group_id: str) -> Tuple[Any, int]:
         content_type_validation(request.headers["Content-Type"])
@@ -142,7 +144,7 @@ class SingleGroup(Resource):
         },
         description="Delete single role",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_ROLES)
     def delete(self, group_id: int) -> Tuple[Any, int]:
         return service.delete_group(group_id), HTTPStatus.OK
@@ -158,7 +160,7 @@ class SingleGroupRole(Resource):
         },
         description="Get group roles",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_ROLES)
     def get(self, group_id: int) -> Tuple[Any, int]:
         return service.select_group_roles(group_id), HTTPStatus.OK
@@ -182,7 +184,7 @@ class RolePolicies(Resource):
         },
         description="Create new group role",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_ROLES)
     def post(self) -> Tuple[Any, int]:
         content_type_validation(request.headers["Content-Type"])
@@ -200,10 +202,25 @@ class RolePolicies(Resource):
         description="Delete group role",
     )
     @api.expect(group_role_parser)
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_ROLES)
     def delete(self) -> Tuple[Any, int]:
         group_id = request.args.get("group_id", None)
         role_id = request.args.get("role_id", None)
 
         return service.delete_group_role(group_id, role_id), HTTPStatus.OK
+
+
+@async_routes.route(api, "/", Permission.MANAGE_ROLES)
+async def select_groups() -> Tuple[Any, int]:
+    return await service.select_groups_async(), HTTPStatus.OK
+
+
+@async_routes.route(api, "/<int:group_id>", Permission.MANAGE_ROLES)
+async def select_single_group(group_id: int) -> Tuple[Any, int]:
+    return await service.select_single_group_async(group_id), HTTPStatus.OK
+
+
+@async_routes.route(api, "/roles/<int:group_id>", Permission.MANAGE_ROLES)
+async def select_group_roles(group_id: int) -> Tuple[Any, int]:
+    return await service.select_group_roles_async(group_id), HTTPStatus.OK
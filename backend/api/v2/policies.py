@@ -1,10 +1,11 @@
 from http import HTTPStatus
 from typing import Any, Tuple
 
+from async_routes import async_routes
+from authentication import auth_required
 from enums import Permission
 from flask import request
-from flask_jwt_extended import jwt_required
-from flask_restx import Namespace, Resource, fields
+from flask_restx import Namespace, Resource, fields, reqparse
 from permissions import permissions
 from services import policies_service as service
 from services.request_validators import content_type_validation
@@ -34,7 +35,7 @@ class Policies(Resource):
         },
         description="List policies",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_POLICIES)
     def get(self) -> Tuple[Any, int]:
         return service.select_policies(), HTTPStatus.OK
@@ -51,7 +52,7 @@ class Policies(Resource):
         },
         description="Create new policy",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_POLICIES)
     def post(self) -> Tuple[Any, int]:
         content_type_validation(request.headers["Content-Type"])
@@ -60,6 +61,34 @@ class Policies(Resource):
         return service.insert_policy(body), HTTPStatus.CREATED
 
 
+users_with_policy_parser = reqparse.RequestParser()
+users_with_policy_parser.add_argument("department_id", type=int)
+users_with_policy_parser.add_argument("after", type=int)
+users_with_policy_parser.add_argument("limit", type=int)
+
+
+@api.route("/users-with-policy/<int:policy_id>")
+@api.param("policy_id", "The policy identifier")
+class UsersWithPolicy(Resource):
+    @api.doc(
+        security="apikey",
+        responses={
+            200: "Successfully get page of users with policy",
+            422: "Unprocessable entity. Invalid query parameters",
+        },
+        description="List users granted policy directly or through groups, "
+        "page by page",
+    )
+    @api.expect(users_with_policy_parser)
+    @auth_required()
+    @permissions(Permission.MANAGE_POLICIES)
+    def get(self, policy_id: int) -> Tuple[Any, int]:
+        return (
+            service.select_users_with_policy(policy_id, request.args),
+            HTTPStatus.OK,
+        )
+
+
 @api.route("/<int:policy_id>")
 @api.param("policy_id", "The policy identifier")
 class SingleDepartment(Resource):
@@ -70,7 +99,7 @@ class SingleDepartment(Resource):
         },
         description="Get single policy",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_POLICIES)
     def get(self, policy_id: int) -> Tuple[Any, int]:
         return service.select_single_policy(policy_id), HTTPStatus.OK
@@ -87,7 +116,7 @@ class SingleDepartment(Resource):
         },
         description="Update single department",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_POLICIES)
     def put(self, policy_id: str) -> Tuple[Any, int]:
         content_type_validation(request.headers["Content-Type"])
@@ -107,7 +136,7 @@ class SingleDepartment(Resource):
         },
         description="Update single department",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_POLICIES)
     def patch(self, policy_id: str) -> Tuple[Any, int]:
         content_type_validation(request.headers["Content-Type"])
@@ -123,7 +152,17 @@ class SingleDepartment(Resource):
         },
         description="Delete single policy",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_POLICIES)
     def delete(self, policy_id: int) -> Tuple[Any, int]:
         return service.delete_policy(policy_id), HTTPStatus.OK
+
+
+@async_routes.route(api, "/", Permission.MANAGE_POLICIES)
+async def select_policies() -> Tuple[Any, int]:
+    return await service.select_policies_async(), HTTPStatus.OK
+
+
+@async_routes.route(api, "/<int:policy_id>", Permission.MANAGE_POLICIES)
+async def select_single_policy(policy_id: int) -> Tuple[Any, int]:
+    return await service.select_single_policy_async(policy_id), HTTPStatus.OK
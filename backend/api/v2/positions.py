@@ -1,9 +1,10 @@
 from http import HTTPStatus
 from typing import Any, Tuple
 
+from async_routes import async_routes
+from authentication import auth_required
 from enums import Permission
 from flask import request
-from flask_jwt_extended import jwt_required
 from flask_restx import Namespace, Resource, fields
 from permissions import permissions
 from services import positions_service as service
@@ -31,7 +32,7 @@ class Policy(Resource):
         },
         description="List positions",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_POSITIONS)
     def get(self) -> Tuple[Any, int]:
         return service.select_positions(), HTTPStatus.OK
@@ -48,7 +49,7 @@ class Policy(Resource):
         },
         description="Create new position",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_POSITIONS)
     def post(self) -> Tuple[Any, int]:
         content_type_validation(request.headers["Content-Type"])
@@ -67,7 +68,7 @@ class SinglePosition(Resource):
         },
         description="Get single position",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_POSITIONS)
     def get(self, position_id: int) -> Tuple[Any, int]:
         return service.select_single_position(position_id), HTTPStatus.OK
@@ -84,7 +85,7 @@ class SinglePosition(Resource):
         },
         description="Update single position",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_POSITIONS)
     def put(self, position_id: str) -> Tuple[Any, int]:
         content_type_validation(request.headers["Content-Type"])
@@ -104,7 +105,7 @@ class SinglePosition(Resource):
         },
         description="Update single position",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_UNITS)
     def patch(self, position_id: str) -> Tuple[Any, int]:
         content_type_validation(request.headers["Content-Type"])
@@ -120,7 +121,17 @@ class SinglePosition(Resource):
         },
         description="Delete single position",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_POSITIONS)
     def delete(self, position_id: int) -> Tuple[Any, int]:
         return service.delete_position(position_id), HTTPStatus.OK
+
+
+@async_routes.route(api, "/", Permission.MANAGE_POSITIONS)
+async def select_positions() -> Tuple[Any, int]:
+    return await service.select_positions_async(), HTTPStatus.OK
+
+
+@async_routes.route(api, "/<int:position_id>", Permission.MANAGE_POSITIONS)
+async def select_single_position(position_id: int) -> Tuple[Any, int]:
+    return await service.select_single_position_async(position_id), HTTPStatus.OK
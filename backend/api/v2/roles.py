@@ -1,13 +1,15 @@
 from http import HTTPStatus
 from typing import Any, Tuple
 
+from async_routes import async_routes
+from authentication import auth_required
 from enums import Permission
-from flask import request
-from flask_jwt_extended import jwt_required
+from flask import Response, request
 from flask_restx import Namespace, Resource, fields, reqparse
 from permissions import permissions
 from services import roles_service as service
 from services.request_validators import content_type_validation
+from streaming import stream_json_array
 
 api = Namespace("Roles", description="Role related endpoints", path="/api/v2/roles")
 
@@ -38,7 +40,7 @@ class Roles(Resource):
         },
         description="List roles",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_ROLES)
     def get(self) -> Tuple[Any, int]:
         return service.select_roles(), HTTPStatus.OK
@@ -55,7 +57,7 @@ class Roles(Resource):
         },
         description="Create new role",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_ROLES)
     def post(self) -> Tuple[Any, int]:
         content_type_validation(request.headers["Content-Type"])
@@ -74,10 +76,10 @@ class UsersWithRole(Resource):
         },
         description="List users with role",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_ROLES)
-    def get(self, role_id: int) -> Tuple[Any, int]:
-        return service.select_users_with_role(role_id), HTTPStatus.OK
+    def get(self, role_id: int) -> Response:
+        return stream_json_array(service.select_users_with_role(role_id))
 
 
 @api.route("/<int:role_id>")
@@ -90,7 +92,7 @@ class SingleRole(Resource):
         },
         description="Get single role",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_ROLES)
     def get(self, role_id: int) -> Tuple[Any, int]:
         return service.select_single_role(role_id), HTTPStatus.OK
@@ -107,7 +109,7 @@ class SingleRole(Resource):
         },
         description="Update single role(PUT)",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_ROLES)
     def put(self, role_id: str) -> Tuple[Any, int]:
         content_type_validation(request.headers["Content-Type"])
@@ -127,7 +129,7 @@ class SingleRole(Resource):
         },
         description="Update single role(PATCH)",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_ROLES)
     def patch(self, role_id: str) -> Tuple[Any, int]:
         content_type_validation(request.headers["Content-Type"])
@@ -143,7 +145,7 @@ class SingleRole(Resource):
         },
         description="Delete single role",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_ROLES)
     def delete(self, role_id: int) -> Tuple[Any, int]:
         return service.delete_role(role_id), HTTPStatus.OK
@@ -159,7 +161,7 @@ class SingleRolePolicy(Resource):
         },
         description="Get role policies",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_ROLES)
     def get(self, role_id: int) -> Tuple[Any, int]:
         return service.select_role_policies(role_id), HTTPStatus.OK
@@ -183,7 +185,7 @@ class RolePolicies(Resource):
         },
         description="Create new role policy",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_ROLES)
     def post(self) -> Tuple[Any, int]:
         content_type_validation(request.headers["Content-Type"])
@@ -201,10 +203,25 @@ class RolePolicies(Resource):
         description="Delete role policy",
     )
     @api.expect(role_policies_parser)
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_ROLES)
     def delete(self) -> Tuple[Any, int]:
         content_type_validation(request.headers["Content-Type"])
         body = request.get_json()
 
         return service.delete_role_policy(body), HTTPStatus.OK
+
+
+@async_routes.route(api, "/", Permission.MANAGE_ROLES)
+async def select_roles() -> Tuple[Any, int]:
+    return await service.select_roles_async(), HTTPStatus.OK
+
+
+@async_routes.route(api, "/<int:role_id>", Permission.MANAGE_ROLES)
+async def select_single_role(role_id: int) -> Tuple[Any, int]:
+    return await service.select_single_role_async(role_id), HTTPStatus.OK
+
+
+@async_routes.route(api, "/policies/<int:role_id>", Permission.MANAGE_ROLES)
+async def select_role_policies(role_id: int) -> Tuple[Any, int]:
+    return await service.select_role_policies_async(role_id), HTTPStatus.OK
@@ -1,9 +1,10 @@
 from http import HTTPStatus
 from typing import Any, Tuple
 
+from async_routes import async_routes
+from authentication import auth_required
 from enums import Permission
 from flask import request
-from flask_jwt_extended import jwt_required
 from flask_restx import Namespace, Resource, fields
 from permissions import permissions
 from services import units_service as service
@@ -31,7 +32,7 @@ class Units(Resource):
         },
         description="List units",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_UNITS)
     def get(self) -> Tuple[Any, int]:
         return service.select_units(), HTTPStatus.OK
@@ -48,8 +49,8 @@ class Units(Resource):
         },
         description="Create new unit",
     )
-    @jwt_required()
-    @permissions(Permission.MANAGE_UNITS)
+    @auth_required()
+    @permissions(Permission.MANAGE_UNITS, department_from="department_id")
     def post(self) -> Tuple[Any, int]:
         content_type_validation(request.headers["Content-Type"])
         body = request.get_json()
@@ -67,8 +68,8 @@ class SingleUnit(Resource):
         },
         description="Get single unit",
     )
-    @jwt_required()
-    @permissions(Permission.MANAGE_UNITS)
+    @auth_required()
+    @permissions(Permission.MANAGE_UNITS, stored_department=service.unit_department)
     def get(self, unit_id: int) -> Tuple[Any, int]:
         return service.select_single_unit(unit_id), HTTPStatus.OK
 
@@ -84,8 +85,12 @@ class SingleUnit(Resource):
         },
         description="Update single unit",
     )
-    @jwt_required()
-    @permissions(Permission.MANAGE_UNITS)
+    @auth_required()
+    @permissions(
+        Permission.MANAGE_UNITS,
+        department_from="department_id",
+        stored_department=service.unit_department,
+    )
     def put(self, unit_id: str) -> Tuple[Any, int]:
         content_type_validation(request.headers["Content-Type"])
         body = request.get_json()
@@ -104,8 +109,12 @@ class SingleUnit(Resource):
         },
         description="Update single unit",
     )
-    @jwt_required()
-    @permissions(Permission.MANAGE_UNITS)
+    @auth_required()
+    @permissions(
+        Permission.MANAGE_UNITS,
+        department_from="department_id",
+        stored_department=service.unit_department,
+    )
     def patch(self, unit_id: str) -> Tuple[Any, int]:
         content_type_validation(request.headers["Content-Type"])
         body = request.get_json()
@@ -120,8 +129,8 @@ class SingleUnit(Resource):
         },
         description="Delete single unit",
     )
-    @jwt_required()
-    @permissions(Permission.MANAGE_UNITS)
+    @auth_required()
+    @permissions(Permission.MANAGE_UNITS, stored_department=service.unit_department)
     def delete(self, unit_id: int) -> Tuple[Any, int]:
         return service.delete_unit(unit_id), HTTPStatus.OK
 
@@ -136,7 +145,22 @@ class SingleDepartmentUnits(Resource):
         },
         description="Get department units",
     )
-    @jwt_required()
-    @permissions(Permission.MANAGE_UNITS)
+    @auth_required()
+    @permissions(Permission.MANAGE_UNITS, department_from="department_id")
     def get(self, department_id: int) -> Tuple[Any, int]:
         return service.select_department_units(department_id), HTTPStatus.OK
+
+
+@async_routes.route(api, "/", Permission.MANAGE_UNITS)
+async def select_units() -> Tuple[Any, int]:
+    return await service.select_units_async(), HTTPStatus.OK
+
+
+@async_routes.route(
+    api,
+    "/department-units/<int:department_id>",
+    Permission.MANAGE_UNITS,
+    department_from="department_id",
+)
+async def select_department_units(department_id: int) -> Tuple[Any, int]:
+    return await service.select_department_units_async(department_id), HTTPStatus.OK
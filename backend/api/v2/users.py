@@ -1,13 +1,16 @@
 from http import HTTPStatus
 from typing import Any, Tuple
 
+from async_routes import async_routes
+from authentication import auth_required, current_identity
 from enums import Permission
-from flask import request
-from flask_jwt_extended import get_jwt_identity, jwt_required
+from flask import Response, request
 from flask_restx import Namespace, Resource, fields, reqparse
 from permissions import permissions
+from services import user_import_service as import_service
 from services import users_service as service
 from services.request_validators import content_type_validation
+from streaming import stream_file
 
 api = Namespace("Users", description="User related endpoints", path="/api/v2/users")
 
@@ -50,6 +53,27 @@ user_group_body = api.model(
 )
 
 
+bulk_user_roles_body = api.model(
+    "Bulk user roles",
+    {
+        "user_id": fields.Integer(description="User identifier"),
+        "role_ids": fields.List(fields.Integer, description="Role identifiers"),
+        "role_id": fields.Integer(description="Role identifier"),
+        "user_ids": fields.List(fields.Integer, description="User identifiers"),
+    },
+)
+
+bulk_user_groups_body = api.model(
+    "Bulk user groups",
+    {
+        "user_id": fields.Integer(description="User identifier"),
+        "group_ids": fields.List(fields.Integer, description="Group identifiers"),
+        "group_id": fields.Integer(description="Group identifier"),
+        "user_ids": fields.List(fields.Integer, description="User identifiers"),
+    },
+)
+
+
 @api.route("/profile", endpoint="users")
 class Users(Resource):
     @api.doc(
@@ -59,13 +83,23 @@ class Users(Resource):
         },
         description="User profile",
     )
-    @jwt_required()
+    @auth_required()
     def get(self) -> Tuple[Any, int]:
-        user_identity = get_jwt_identity()
+        user_identity = current_identity()
 
         return service.user_profile(user_identity), HTTPStatus.OK
 
 
+users_page_parser = reqparse.RequestParser()
+users_page_parser.add_argument("cursor", type=str)
+users_page_parser.add_argument("limit", type=int)
+users_page_parser.add_argument("department_id", type=int)
+users_page_parser.add_argument("unit_id", type=int)
+users_page_parser.add_argument("position_id", type=int)
+users_page_parser.add_argument("registered_from", type=str, help="ISO date")
+users_page_parser.add_argument("registered_to", type=str, help="ISO date")
+
+
 @api.route("/")
 class UsersOperations(Resource):
     @api.doc(
@@ -77,7 +111,7 @@ class UsersOperations(Resource):
         },
         description="Delete user",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_USERS)
     def delete(self) -> Tuple[Any, int]:
         content_type_validation(request.headers["Content-Type"])
@@ -97,7 +131,7 @@ class UsersOperations(Resource):
         },
         description="Update user profile",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_USERS)
     def put(self) -> Tuple[Any, int]:
         content_type_validation(request.headers["Content-Type"])
@@ -117,7 +151,7 @@ class UsersOperations(Resource):
         },
         description="Update user profile",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_USERS)
     def patch(self) -> Tuple[Any, int]:
         content_type_validation(request.headers["Content-Type"])
@@ -128,14 +162,86 @@ class UsersOperations(Resource):
     @api.doc(
         security="apikey",
         responses={
-            200: "Successfully get list of users",
+            200: "Successfully get page of users",
+            422: "Unprocessable entity. Invalid query parameters",
         },
-        description="List users",
+        description="List users page by page",
     )
-    @jwt_required()
+    @api.expect(users_page_parser)
+    @auth_required()
     @permissions(Permission.MANAGE_USERS)
     def get(self) -> Tuple[Any, int]:
-        return service.select_users(), HTTPStatus.OK
+        return service.select_users_page(request.args), HTTPStatus.OK
+
+
+users_export_parser = reqparse.RequestParser()
+users_export_parser.add_argument("format", type=str, choices=("ndjson", "csv"))
+users_export_parser.add_argument(
+    "columns", type=str, help="Comma separated column names"
+)
+users_export_parser.add_argument("gzip", type=bool)
+users_export_parser.add_argument("department_id", type=int)
+users_export_parser.add_argument("unit_id", type=int)
+users_export_parser.add_argument("position_id", type=int)
+users_export_parser.add_argument("registered_from", type=str, help="ISO date")
+users_export_parser.add_argument("registered_to", type=str, help="ISO date")
+
+
+@api.route("/export")
+class UsersExport(Resource):
+    @api.doc(
+        security="apikey",
+        responses={
+            200: "Successfully stream users export",
+            422: "Unprocessable entity. Invalid query parameters",
+        },
+        description="Export users as NDJSON or CSV file",
+    )
+    @api.expect(users_export_parser)
+    @auth_required()
+    @permissions(Permission.MANAGE_USERS)
+    def get(self) -> Response:
+        export = service.export_users(request.args)
+
+        return stream_file(export.chunks, export.mimetype, export.filename)
+
+
+users_import_parser = reqparse.RequestParser()
+users_import_parser.add_argument(
+    "role_ids", type=str, help="Comma separated role identifiers"
+)
+users_import_parser.add_argument(
+    "group_ids", type=str, help="Comma separated group identifiers"
+)
+
+
+@api.route("/import")
+class UsersImport(Resource):
+    @api.doc(
+        security="apikey",
+        responses={
+            200: "Successfully import users, report contains rejected rows",
+            400: "Validation error. Empty body or invalid CSV header",
+            403: "Forbidden. Roles and groups require 'Manage users' permission",
+            413: "Too many users in one import",
+            415: "Unsupported media type",
+            422: "Unprocessable entity. Invalid query parameters",
+        },
+        description="Import users from CSV or NDJSON document",
+    )
+    @api.expect(users_import_parser)
+    @auth_required()
+    @permissions(Permission.CREATE_USERS)
+    def post(self) -> Tuple[Any, int]:
+        return (
+            import_service.import_users(
+                request.get_data(as_text=True),
+                request.headers.get("Content-Type", ""),
+                request.args,
+                current_identity(),
+            ),
+            HTTPStatus.OK,
+        )
 
 
 user_role_parser = reqparse.RequestParser()
@@ -153,7 +259,7 @@ class SingleUserRoles(Resource):
         },
         description="Get user roles",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_USERS)
     def get(self, user_id: int) -> Tuple[Any, int]:
         return service.select_user_roles(user_id), HTTPStatus.OK
@@ -172,7 +278,7 @@ class UsersRoles(Resource):
         },
         description="Create new user role",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_USERS)
     def post(self) -> Tuple[Any, int]:
         content_type_validation(request.headers["Content-Type"])
@@ -190,7 +296,7 @@ class UsersRoles(Resource):
         description="Delete user role",
     )
     @api.expect(user_role_parser)
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_USERS)
     def delete(self) -> Tuple[Any, int]:
         user_id = request.args.get("user_id", None)
@@ -199,6 +305,47 @@ class UsersRoles(Resource):
         return service.delete_user_role(user_id, role_id), HTTPStatus.OK
 
 
+@api.route("/user-roles/bulk")
+class BulkUsersRoles(Resource):
+    @api.doc(
+        security="apikey",
+        body=bulk_user_roles_body,
+        responses={
+            200: "Successfully execute creation, report contains already existing pairs",
+            400: "Validation error. Invalid request body content",
+            415: "Unsupported media type",
+            422: "Unprocessable entity. Invalid data for creating user roles",
+        },
+        description="Create many user roles at once: one user with 'role_ids' or one role with 'user_ids'",
+    )
+    @auth_required()
+    @permissions(Permission.MANAGE_USERS)
+    def post(self) -> Tuple[Any, int]:
+        content_type_validation(request.headers["Content-Type"])
+        body = request.get_json()
+
+        return service.insert_user_roles(body), HTTPStatus.OK
+
+    @api.doc(
+        security="apikey",
+        body=bulk_user_roles_body,
+        responses={
+            200: "Successfully execute delete operation, report contains missing pairs",
+            400: "Validation error. Invalid request body content",
+            415: "Unsupported media type",
+            422: "Unprocessable entity. Invalid data for deleting user roles",
+        },
+        description="Delete many user roles at once: one user with 'role_ids' or one role with 'user_ids'",
+    )
+    @auth_required()
+    @permissions(Permission.MANAGE_USERS)
+    def delete(self) -> Tuple[Any, int]:
+        content_type_validation(request.headers["Content-Type"])
+        body = request.get_json()
+
+        return service.delete_user_roles(body), HTTPStatus.OK
+
+
 user_group_parser = reqparse.RequestParser()
 user_group_parser.add_argument("user_id", type=int)
 user_group_parser.add_argument("group_id", type=int)
@@ -214,7 +361,7 @@ class SingleUserGroups(Resource):
         },
         description="Get user groups",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_USERS)
     def get(self, user_id: int) -> Tuple[Any, int]:
         return service.select_user_groups(user_id), HTTPStatus.OK
@@ -233,7 +380,7 @@ class UsersGroups(Resource):
         },
         description="Create new user group",
     )
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_USERS)
     def post(self) -> Tuple[Any, int]:
         content_type_validation(request.headers["Content-Type"])
@@ -251,10 +398,61 @@ class UsersGroups(Resource):
         description="Delete single user group",
     )
     @api.expect(user_group_parser)
-    @jwt_required()
+    @auth_required()
     @permissions(Permission.MANAGE_USERS)
     def delete(self) -> Tuple[Any, int]:
         user_id = request.args.get("user_id", None)
         group_id = request.args.get("group_id", None)
 
         return service.delete_user_group(user_id, group_id), HTTPStatus.OK
+
+
+@api.route("/user-groups/bulk")
+class BulkUsersGroups(Resource):
+    @api.doc(
+        security="apikey",
+        body=bulk_user_groups_body,
+        responses={
+            200: "Successfully execute creation, report contains already existing pairs",
+            400: "Validation error. Invalid request body content",
+            415: "Unsupported media type",
+            422: "Unprocessable entity. Invalid data for creating user groups",
+        },
+        description="Create many user groups at once: one user with 'group_ids' or one group with 'user_ids'",
+    )
+    @auth_required()
+    @permissions(Permission.MANAGE_USERS)
+    def post(self) -> Tuple[Any, int]:
+        content_type_validation(request.headers["Content-Type"])
+        body = request.get_json()
+
+        return service.insert_user_groups(body), HTTPStatus.OK
+
+    @api.doc(
+        security="apikey",
+        body=bulk_user_groups_body,
+        responses={
+            200: "Successfully execute delete operation, report contains missing pairs",
+            400: "Validation error. Invalid request body content",
+            415: "Unsupported media type",
+            422: "Unprocessable entity. Invalid data for deleting user groups",
+        },
+        description="Delete many user groups at once: one user with 'group_ids' or one group with 'user_ids'",
+    )
+    @auth_required()
+    @permissions(Permission.MANAGE_USERS)
+    def delete(self) -> Tuple[Any, int]:
+        content_type_validation(request.headers["Content-Type"])
+        body = request.get_json()
+
+        return service.delete_user_groups(body), HTTPStatus.OK
+
+
+@async_routes.route(api, "/user-roles/<int:user_id>", Permission.MANAGE_USERS)
+async def select_user_roles(user_id: int) -> Tuple[Any, int]:
+    return await service.select_user_roles_async(user_id), HTTPStatus.OK
+
+
+@async_routes.route(api, "/user-groups/<int:user_id>", Permission.MANAGE_USERS)
+async def select_user_groups(user_id: int) -> Tuple[Any, int]:
+    return await service.select_user_groups_async(user_id), HTTPStatus.OK
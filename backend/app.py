@@ -1,12 +1,27 @@
 import logging
-from typing import Any, Tuple
+from http import HTTPStatus
+from typing import Any, Optional, Tuple
 
+import click
+from authentication import auth_required, authenticate, verified_tokens
+from authorization_graph import authorization_graph
 from config import CONFIG
-from enums import APIVersions
-from flask import Flask, Response, jsonify
+from enums import APIVersions, Permission
+from flask import Flask, Response, jsonify, request
 from flask_jwt_extended import JWTManager
 from flask_restx import Api, Resource
 from http_exception import HTTPException
+from models.change_listener import change_listener
+from models.effective_policy import effective_policies
+from models.postgresql_handler import (
+    PoolTimeoutError,
+    PostgreSQLHandler,
+    StatementTimeoutError,
+)
+from models.query_registry import QUERIES, find_query_references
+from permission_cache import permission_cache
+from permissions import permissions
+from services.batch_service import is_batch_item
 
 authorizations = {
     "apikey": {
@@ -32,6 +47,9 @@ def create_flask_app() -> Tuple[Flask, Any]:
     application.config.from_object(CONFIG)
     configure_logging()
 
+    # Fail fast if any model references missing SQL query
+    QUERIES.check_references(find_query_references())
+
     version = application.config["APPLICATION_VERSION"]
 
     modules = [
@@ -45,6 +63,9 @@ def create_flask_app() -> Tuple[Flask, Any]:
         "users",
     ]
 
+    if version == APIVersions.v2.value:
+        modules.extend(["authorization", "batch"])
+
     for module in modules:
         api = __import__(f"api.{version}.{module}")
 
@@ -92,6 +113,43 @@ def create_flask_app() -> Tuple[Flask, Any]:
                 swagger = True  # Export Swagger specifications
                 return api.as_postman(urlvars=urlvars, swagger=swagger)
 
+        @api.route("/database-pool", endpoint="database_pool")
+        class DatabasePool(Resource):
+            @api.doc(security="apikey", description="Connection pool statistics")
+            @auth_required()
+            @permissions(Permission.MANAGE_POLICIES)
+            def get(self):
+                return PostgreSQLHandler.pool_stats()
+
+        @api.route("/permission-cache", endpoint="permission_cache")
+        class PermissionCache(Resource):
+            @api.doc(security="apikey", description="Authorization cache statistics")
+            @auth_required()
+            @permissions(Permission.MANAGE_POLICIES)
+            def get(self):
+                stats = permission_cache.stats()
+                stats["change_listener"] = change_listener.stats()
+                stats["verified_tokens"] = verified_tokens.stats()
+
+                if CONFIG.AUTHORIZATION_GRAPH:
+                    stats["authorization_graph"] = authorization_graph.stats()
+
+                return stats
+
+        @api.errorhandler(HTTPException)
+        def handle_api_exception(error: HTTPException) -> Tuple[Any, int]:
+            return error.to_dict(), error.status_code
+
+        @api.errorhandler(PoolTimeoutError)
+        def handle_api_pool_timeout(error: PoolTimeoutError) -> Tuple[Any, int]:
+            return {"message": str(error)}, HTTPStatus.SERVICE_UNAVAILABLE
+
+        @api.errorhandler(StatementTimeoutError)
+        def handle_api_statement_timeout(
+            error: StatementTimeoutError,
+        ) -> Tuple[Any, int]:
+            return {"message": str(error)}, HTTPStatus.GATEWAY_TIMEOUT
+
     return application, api
 
 
@@ -99,6 +157,35 @@ application, api = create_flask_app()
 jwt = JWTManager(application)
 
 
+@application.cli.command("check-effective-policies")
+@click.option("--repair", is_flag=True, help="Backfill table when it is inconsistent")
+def check_effective_policies(repair: bool) -> None:
+    """
+    Compare 'user_effective_policy' table with grants of roles and groups
+    """
+
+    inconsistencies = effective_policies.select_inconsistencies()
+
+    for row in inconsistencies:
+        click.echo(
+            "{problem}: user {user_id}, policy {policy_id}, "
+            "department {department_id}".format(**row)
+        )
+
+    click.echo(f"{len(inconsistencies)} inconsistent rows")
+
+    if inconsistencies and repair:
+        if (rows := effective_policies.backfill()) is None:
+            raise click.ClickException("Backfill failed")
+
+        click.echo(f"Backfilled {rows} rows")
+
+    PostgreSQLHandler.release_connection()
+
+    if inconsistencies and not repair:
+        raise SystemExit(1)
+
+
 @application.errorhandler(HTTPException)
 def handle_invalid_usage(error: HTTPException) -> Response:
     response = jsonify(error.to_dict())
@@ -106,6 +193,80 @@ def handle_invalid_usage(error: HTTPException) -> Response:
     return response
 
 
+@application.errorhandler(PoolTimeoutError)
+def handle_pool_timeout(error: PoolTimeoutError) -> Response:
+    response = jsonify({"message": str(error)})
+    response.status_code = HTTPStatus.SERVICE_UNAVAILABLE
+    return response
+
+
+@application.errorhandler(StatementTimeoutError)
+def handle_statement_timeout(error: StatementTimeoutError) -> Response:
+    response = jsonify({"message": str(error)})
+    response.status_code = HTTPStatus.GATEWAY_TIMEOUT
+    return response
+
+
+@application.teardown_request
+def release_database_connection(exception: Optional[BaseException]) -> None:
+    """
+    Return request database connection back to pool. Unfinished unit of work
+    is rolled back by the pool. Batch items keep connection of their batch
+    """
+
+    if is_batch_item():
+        return
+
+    PostgreSQLHandler.release_connection()
+
+
+@application.before_request
+def start_change_listener() -> None:
+    """
+    Receive cache invalidation events of other processes in this worker
+    """
+
+    change_listener.ensure_started()
+
+
+@application.before_request
+def authenticate_request() -> None:
+    """
+    Verify access token once per request, endpoints read identity from 'g'
+    """
+
+    authenticate()
+
+
+@application.before_request
+def begin_unit_of_work() -> None:
+    """
+    Group all database writes of request into single transaction
+    """
+
+    PostgreSQLHandler.begin()
+
+
+@application.before_request
+def set_statement_timeout() -> None:
+    """
+    Use statement timeout budget of requested endpoint, if it has one
+    """
+
+    PostgreSQLHandler.use_endpoint_timeout(request.endpoint)
+
+
+@application.after_request
+def finish_unit_of_work(response: Response) -> Response:
+    """
+    Commit request transaction once, roll it back for error responses
+    """
+
+    PostgreSQLHandler.finish(commit=response.status_code < HTTPStatus.BAD_REQUEST)
+
+    return response
+
+
 @application.after_request
 def after_request(response: Response) -> Response:
     """
@@ -0,0 +1,173 @@
+import json
+import logging
+from http import HTTPStatus
+from typing import Any, Awaitable, Callable, Dict, Mapping, Tuple
+
+import jwt
+from a2wsgi import WSGIMiddleware
+from app import application as wsgi_application
+from async_routes import AsyncEndpoint, async_routes
+from authentication import Token, header_token, verify_token
+from flask_jwt_extended.exceptions import (
+    JWTDecodeError,
+    JWTExtendedException,
+    NoAuthorizationError,
+)
+from http_exception import HTTPException
+from models.async_handler import AsyncPostgreSQLHandler
+from models.postgresql_handler import PoolTimeoutError, StatementTimeoutError
+from permissions import is_allowed_async
+
+LOG = logging.getLogger(__name__)
+
+# Threads serving requests passed to WSGI application, per worker process
+WSGI_THREADS = 10
+
+Receive = Callable[[], Awaitable[Dict]]
+Send = Callable[[Dict], Awaitable[None]]
+
+
+def access_token_decoder(config: Mapping) -> Callable[[str], Dict]:
+    """
+    Decoder of access tokens with JWT settings of application 'config',
+    checks the same claims as flask-jwt-extended does
+    """
+
+    def decode(encoded_token: str) -> Dict:
+        jwt_data = jwt.decode(
+            encoded_token,
+            config["JWT_SECRET_KEY"],
+            algorithms=config["JWT_DECODE_ALGORITHMS"] or [config["JWT_ALGORITHM"]],
+            leeway=config["JWT_DECODE_LEEWAY"],
+        )
+
+        if config["JWT_IDENTITY_CLAIM"] not in jwt_data:
+            raise JWTDecodeError(f"Missing claim: {config['JWT_IDENTITY_CLAIM']}")
+
+        jwt_data.setdefault("type", "access")
+
+        return jwt_data
+
+    return decode
+
+
+def token_error(error: Exception) -> Tuple[str, int]:
+    """
+    Message and status flask-jwt-extended answers token error with
+    """
+
+    if isinstance(error, jwt.ExpiredSignatureError):
+        return "Token has expired", HTTPStatus.UNAUTHORIZED
+
+    if isinstance(error, NoAuthorizationError):
+        return str(error), HTTPStatus.UNAUTHORIZED
+
+    return str(error), HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+class ASGIApplication:
+    """
+    ASGI entrypoint. GET endpoints which v2 namespaces register in
+    'async_routes' are awaited on the event loop, so one worker serves many
+    of them at once. Every other request goes to WSGI application, which
+    runs on a thread pool
+    """
+
+    def __init__(self, wsgi_app: Any, threads: int = WSGI_THREADS) -> None:
+        self.wsgi = WSGIMiddleware(wsgi_app, workers=threads)
+        self.config = wsgi_app.config
+        self.decode = access_token_decoder(self.config)
+
+    async def __call__(self, scope: Dict, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+            return
+
+        if scope["type"] == "http" and scope["method"] == "GET":
+            if (route := async_routes.match(scope["path"])) is not None:
+                await self.serve(*route, scope, send)
+                return
+
+        await self.wsgi(scope, receive, send)
+
+    async def lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await AsyncPostgreSQLHandler.close_pool()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def serve(
+        self, endpoint: AsyncEndpoint, arguments: Dict, scope: Dict, send: Send
+    ) -> None:
+        error_key = self.config["JWT_ERROR_MESSAGE_KEY"]
+
+        try:
+            _, claims = self.authenticate(scope)
+            await self.authorize(endpoint, arguments, claims)
+            body, status = await endpoint.handler(**arguments)
+        except HTTPException as error:
+            body, status = error.to_dict(), error.status_code
+        except (JWTExtendedException, jwt.PyJWTError) as error:
+            message, status = token_error(error)
+            body = {error_key: message}
+        except PoolTimeoutError as error:
+            body, status = {"message": str(error)}, HTTPStatus.SERVICE_UNAVAILABLE
+        except StatementTimeoutError as error:
+            body, status = {"message": str(error)}, HTTPStatus.GATEWAY_TIMEOUT
+        except Exception:
+            LOG.exception(f"GET {scope['path']} failed")
+            body = {"message": "Internal Server Error"}
+            status = HTTPStatus.INTERNAL_SERVER_ERROR
+
+        await self.send_json(send, status, body)
+
+    def authenticate(self, scope: Dict) -> Token:
+        """
+        Header and claims of access token of request
+        """
+
+        header_name = self.config["JWT_HEADER_NAME"].lower().encode("latin-1")
+        header = next(
+            (value for name, value in scope["headers"] if name == header_name), b""
+        )
+
+        return verify_token(
+            header_token(header.decode("latin-1"), self.config), self.decode
+        )
+
+    async def authorize(
+        self, endpoint: AsyncEndpoint, arguments: Dict, claims: Dict
+    ) -> None:
+        identity = claims[self.config["JWT_IDENTITY_CLAIM"]]
+        department_id = arguments.get(endpoint.department_from)
+
+        if not await is_allowed_async(
+            identity, claims, endpoint.permission, department_id
+        ):
+            raise HTTPException(
+                "You have no permissions for execute such operation", 403
+            )
+
+    @staticmethod
+    async def send_json(send: Send, status: int, body: Any) -> None:
+        content = json.dumps(body, default=str).encode()
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(content)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": content})
+
+
+application = ASGIApplication(wsgi_application)
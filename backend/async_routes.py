@@ -0,0 +1,73 @@
+from typing import Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+
+from enums import Permission
+from flask_restx import Namespace
+from werkzeug.exceptions import HTTPException as RoutingException
+from werkzeug.routing import Map, Rule
+
+
+class AsyncEndpoint(NamedTuple):
+    """
+    Coroutine endpoint with permission it requires, policy has to be granted
+    in department from URL parameter 'department_from' when it is given
+    """
+
+    handler: Callable[..., Awaitable[Tuple]]
+    permission: Permission
+    department_from: Optional[str] = None
+
+
+class AsyncRoutes:
+    """
+    GET endpoints v2 namespaces serve as coroutines under ASGI entrypoint.
+    Same URLs stay served by flask-restx resources under WSGI
+    """
+
+    def __init__(self) -> None:
+        self._map = Map()
+        self._endpoints: Dict[str, AsyncEndpoint] = {}
+
+    def route(
+        self,
+        namespace: Namespace,
+        rule: str,
+        permission: Permission,
+        department_from: Optional[str] = None,
+    ) -> Callable:
+        """
+        Decorator registering coroutine for GET requests to 'rule' of
+        namespace. Rule uses Flask syntax, its parameters are passed to
+        coroutine as keyword arguments
+        """
+
+        def register(handler: Callable) -> Callable:
+            endpoint = f"{namespace.name}.{handler.__name__}"
+            self._map.add(
+                Rule(namespace.path + rule, endpoint=endpoint, methods=["GET"])
+            )
+            self._endpoints[endpoint] = AsyncEndpoint(
+                handler, permission, department_from
+            )
+
+            return handler
+
+        return register
+
+    def match(self, path: str) -> Optional[Tuple[AsyncEndpoint, Dict]]:
+        """
+        Endpoint of GET request to 'path' with its URL parameters, None when
+        path is left to WSGI application
+        """
+
+        try:
+            endpoint, arguments = self._map.bind("").match(path, "GET")
+        except RoutingException:
+            return None
+
+        return self._endpoints[endpoint], arguments
+
+    def __len__(self) -> int:
+        return len(self._endpoints)
+
+
+async_routes = AsyncRoutes()
@@ -0,0 +1,211 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+from config import CONFIG
+from flask import current_app, g, request
+from flask_jwt_extended import decode_token
+from flask_jwt_extended.exceptions import (
+    InvalidHeaderError,
+    JWTExtendedException,
+    NoAuthorizationError,
+    WrongTokenError,
+)
+from jwt import PyJWTError, get_unverified_header
+
+# Methods flask-jwt-extended lets in without access token
+EXEMPT_METHODS = ("OPTIONS",)
+
+Token = Tuple[Dict, Dict]
+
+
+class VerifiedTokens:
+    """
+    LRU of recently verified access tokens with their header and claims.
+    Known token skips signature verification until it expires
+    """
+
+    def __init__(self, max_size: int = 1024) -> None:
+        self.max_size = max_size
+
+        self._entries: "OrderedDict[str, Token]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0}
+
+    def get(self, encoded_token: str) -> Optional[Token]:
+        with self._lock:
+            token = self._entries.get(encoded_token)
+
+            if token is not None and token[1].get("exp", float("inf")) <= time.time():
+                del self._entries[encoded_token]
+                token = None
+
+            if token is None:
+                self._counters["misses"] += 1
+                return None
+
+            self._entries.move_to_end(encoded_token)
+            self._counters["hits"] += 1
+            return token
+
+    def put(self, encoded_token: str, jwt_header: Dict, jwt_data: Dict) -> None:
+        with self._lock:
+            self._entries[encoded_token] = (jwt_header, jwt_data)
+            self._entries.move_to_end(encoded_token)
+
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                **self._counters,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+            }
+
+
+verified_tokens = VerifiedTokens(CONFIG.AUTH_TOKEN_CACHE_SIZE)
+
+
+def authenticate() -> None:
+    """
+    Verify access token of request once, before any endpoint decorator.
+    Identity and claims are kept on 'g', verification error is raised by
+    'auth_required'
+    """
+
+    g.identity = None
+    g.token_claims = None
+    g.authentication_error = None
+
+    if request.method in EXEMPT_METHODS:
+        return
+
+    try:
+        _, jwt_data = verify_request_token()
+    except (JWTExtendedException, PyJWTError) as error:
+        g.authentication_error = error
+        return
+
+    g.identity = jwt_data[current_app.config["JWT_IDENTITY_CLAIM"]]
+    g.token_claims = jwt_data
+
+
+def verify_request_token() -> Token:
+    """
+    Header and claims of request access token
+    """
+
+    return verify_token(request_token(), decode_token)
+
+
+def verify_token(encoded_token: str, decode: Callable[[str], Dict]) -> Token:
+    """
+    Header and claims of access token, 'decode' verifies its signature and
+    expiration. Signature of known token is not verified again until it
+    expires
+    """
+
+    if (token := verified_tokens.get(encoded_token)) is not None:
+        return token
+
+    jwt_data = decode(encoded_token)
+
+    if jwt_data.get("type") != "access":
+        raise WrongTokenError("Only non-refresh tokens are allowed")
+
+    jwt_header = get_unverified_header(encoded_token)
+    verified_tokens.put(encoded_token, jwt_header, jwt_data)
+
+    return jwt_header, jwt_data
+
+
+def request_token() -> str:
+    """
+    Token from 'Authorization: Bearer <JWT>' header of request
+    """
+
+    header_name = current_app.config["JWT_HEADER_NAME"]
+
+    return header_token(request.headers.get(header_name, ""), current_app.config)
+
+
+def header_token(header: str, config: Mapping) -> str:
+    """
+    Token from value of 'Authorization: Bearer <JWT>' header, name and type
+    of header are taken from JWT settings of application 'config'
+    """
+
+    header_name = config["JWT_HEADER_NAME"]
+    header_type = config["JWT_HEADER_TYPE"]
+    expected = f"Expected '{header_name}: {header_type} <JWT>'".replace("  ", " ")
+
+    if not (header := header.strip()):
+        raise NoAuthorizationError(f"Missing {header_name} Header")
+
+    parts = header.split()
+
+    if header_type:
+        if parts[0] != header_type:
+            raise NoAuthorizationError(
+                f"Missing '{header_type}' type in '{header_name}' header. {expected}"
+            )
+
+        parts = parts[1:]
+
+    if len(parts) != 1:
+        raise InvalidHeaderError(f"Bad {header_name} header. {expected}")
+
+    return parts[0]
+
+
+def auth_required() -> Callable:
+    """
+    Decorator which lets in only requests with valid access token, verified
+    earlier by 'authenticate'
+    """
+
+    def required_authentication(endpoint_handler: Callable) -> Callable:
+        @wraps(endpoint_handler)
+        def wrapper(*args, **kwargs):
+            if request.method not in EXEMPT_METHODS:
+                ensure_authenticated()
+
+            return endpoint_handler(*args, **kwargs)
+
+        return wrapper
+
+    return required_authentication
+
+
+def ensure_authenticated() -> None:
+    if g.get("authentication_error") is not None:
+        raise g.authentication_error
+
+    if g.get("identity") is None:
+        raise NoAuthorizationError(
+            f"Missing {current_app.config['JWT_HEADER_NAME']} Header"
+        )
+
+
+def current_identity() -> Dict:
+    """
+    Identity of authenticated user of request
+    """
+
+    ensure_authenticated()
+
+    return g.identity
+
+
+def current_claims() -> Dict:
+    """
+    Claims of verified access token of request
+    """
+
+    ensure_authenticated()
+
+    return g.token_claims
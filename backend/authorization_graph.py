@@ -0,0 +1,298 @@
+import threading
+from collections import defaultdict
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from enums import PERMISSION_BITS, Permission
+from models.authorization import authorization as db
+
+PERMISSION_COUNT = len(PERMISSION_BITS)
+
+
+def bit_positions(bits: int) -> Iterator[int]:
+    """
+    Indexes of set bits in ascending order
+    """
+
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+
+    for index, byte in enumerate(data):
+        while byte:
+            lowest = byte & -byte
+            yield index * 8 + lowest.bit_length() - 1
+            byte ^= lowest
+
+
+def group_edges(edges: Iterable[Tuple[int, int]]) -> Dict[int, Set[int]]:
+    grouped = defaultdict(set)
+
+    for source, target in edges:
+        grouped[source].add(target)
+
+    return grouped
+
+
+class AuthorizationGraph:
+    """
+    Compiled user -> group -> role -> policy graph.
+    Every user gets a bitmask of 'Permission' policies, and every permission
+    a bitset of user ids, so single checks are bit tests and bulk questions
+    are bitwise operations. Department scoped masks are combined from
+    per-department masks of user roles.
+
+    Graph follows RBAC versions: a changed user version reloads edges of
+    that user only, a changed global version reloads small group -> role
+    and role -> policy layers and recomputes masks without touching user
+    edges
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._global_version = 0
+        self._user_versions: Dict[int, int] = {}
+
+        self._role_masks: Dict[int, int] = {}
+        self._role_department_masks: Dict[int, Dict[int, int]] = {}
+        self._group_roles: Dict[int, Set[int]] = {}
+        self._user_roles: Dict[int, Set[int]] = {}
+        self._user_groups: Dict[int, Set[int]] = {}
+        self._user_masks: Dict[int, int] = {}
+        self._permission_users: List[int] = [0] * PERMISSION_COUNT
+
+        self._counters = {"full_loads": 0, "layer_reloads": 0, "user_reloads": 0}
+
+    def permission_mask(
+        self,
+        user_id: int,
+        versions: Tuple[int, int],
+        department_id: Optional[int] = None,
+    ) -> int:
+        """
+        Bitmask of policies granted to user, synchronised to 'versions'.
+        Without 'department_id' policies granted in any department count
+        """
+
+        with self._lock:
+            self._sync(user_id, versions)
+
+            if department_id is None:
+                return self._user_masks.get(user_id, 0)
+
+            return self._department_masks(user_id).get(department_id, 0)
+
+    def department_masks(
+        self, user_id: int, versions: Tuple[int, int]
+    ) -> Dict[int, int]:
+        """
+        Bitmasks of policies granted to user in every department
+        """
+
+        with self._lock:
+            self._sync(user_id, versions)
+
+            return self._department_masks(user_id)
+
+    def has_permission(
+        self,
+        user_id: int,
+        permission: Permission,
+        versions: Tuple[int, int],
+        department_id: Optional[int] = None,
+    ) -> bool:
+        return bool(
+            self.permission_mask(user_id, versions, department_id)
+            & PERMISSION_BITS[permission.value]
+        )
+
+    def users_with(
+        self, *permissions: Permission, after: int = 0, limit: Optional[int] = None
+    ) -> List[int]:
+        """
+        Ids of users holding all given permissions, in ascending order.
+        Page starts after id 'after' and holds at most 'limit' ids
+        """
+
+        with self._lock:
+            self.refresh()
+            bits = self._users_bitset(permissions) >> (after + 1) << (after + 1)
+
+        return list(islice(bit_positions(bits), limit))
+
+    def count_users_with(self, *permissions: Permission) -> int:
+        with self._lock:
+            self.refresh()
+
+            return bin(self._users_bitset(permissions)).count("1")
+
+    def refresh(self) -> None:
+        """
+        Catch up with all RBAC changes, reloading edges of changed users only
+        """
+
+        with self._lock:
+            if not self._loaded:
+                self._load()
+                return
+
+            versions = db.select_versions()
+            changed_users = [
+                user_id
+                for user_id, version in versions.items()
+                if user_id and self._user_versions.get(user_id, 0) != version
+            ]
+
+            if versions.get(0, 0) != self._global_version:
+                self._reload_layers(versions.get(0, 0))
+
+            if changed_users:
+                self._reload_users(changed_users, versions)
+
+    def granted_departments(self, user_id: int, permission: Permission) -> List[int]:
+        """
+        Departments user holds permission in, as of last refresh
+        """
+
+        bit = PERMISSION_BITS[permission.value]
+
+        with self._lock:
+            masks = self._department_masks(user_id)
+
+        return sorted(
+            department_id for department_id, mask in masks.items() if mask & bit
+        )
+
+    def invalidate(self) -> None:
+        """
+        Drop compiled graph, it is loaded again on next use
+        """
+
+        with self._lock:
+            self._loaded = False
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                **self._counters,
+                "loaded": self._loaded,
+                "global_version": self._global_version,
+                "users": len(self._user_masks),
+                "roles": len(self._role_masks),
+                "groups": len(self._group_roles),
+            }
+
+    def _sync(self, user_id: int, versions: Tuple[int, int]) -> None:
+        global_version, user_version = versions
+
+        if not self._loaded:
+            self._load()
+
+        # Versions only grow, older ones come from short-lived version cache
+        if global_version > self._global_version:
+            self._reload_layers(global_version)
+
+        if user_version > self._user_versions.get(user_id, 0):
+            self._reload_users([user_id], {user_id: user_version})
+
+    def _users_bitset(self, permissions: Iterable[Permission]) -> int:
+        bits = -1
+
+        for permission in permissions:
+            index = PERMISSION_BITS[permission.value].bit_length() - 1
+            bits &= self._permission_users[index]
+
+        return max(bits, 0)
+
+    def _load(self) -> None:
+        # Versions are read before edges, so edges are never older than them
+        versions = db.select_versions()
+        self._user_versions = {
+            user_id: version for user_id, version in versions.items() if user_id
+        }
+        self._user_roles = group_edges(db.select_user_roles())
+        self._user_groups = group_edges(db.select_user_groups())
+        self._reload_layers(versions.get(0, 0))
+        self._loaded = True
+        self._counters["full_loads"] += 1
+
+    def _reload_layers(self, global_version: int) -> None:
+        role_masks = defaultdict(int)
+        role_department_masks = defaultdict(lambda: defaultdict(int))
+
+        for role_id, title, department_id in db.select_role_policies():
+            bit = PERMISSION_BITS.get(title, 0)
+            role_masks[role_id] |= bit
+            role_department_masks[role_id][department_id] |= bit
+
+        self._role_masks = role_masks
+        self._role_department_masks = role_department_masks
+        self._group_roles = group_edges(db.select_group_roles())
+        self._global_version = global_version
+        self._user_masks = {
+            user_id: self._compute_mask(user_id)
+            for user_id in self._user_roles.keys() | self._user_groups.keys()
+        }
+        self._rebuild_permission_users()
+        self._counters["layer_reloads"] += 1
+
+    def _reload_users(self, user_ids: List[int], versions: Dict[int, int]) -> None:
+        user_roles = group_edges(db.select_user_roles(user_ids))
+        user_groups = group_edges(db.select_user_groups(user_ids))
+
+        for user_id in user_ids:
+            self._user_roles[user_id] = user_roles.get(user_id, set())
+            self._user_groups[user_id] = user_groups.get(user_id, set())
+            self._user_versions[user_id] = versions.get(user_id, 0)
+            self._set_user_mask(user_id, self._compute_mask(user_id))
+
+        self._counters["user_reloads"] += len(user_ids)
+
+    def _roles(self, user_id: int) -> Set[int]:
+        roles = set(self._user_roles.get(user_id, ()))
+
+        for group_id in self._user_groups.get(user_id, ()):
+            roles |= self._group_roles.get(group_id, set())
+
+        return roles
+
+    def _compute_mask(self, user_id: int) -> int:
+        mask = 0
+
+        for role_id in self._roles(user_id):
+            mask |= self._role_masks.get(role_id, 0)
+
+        return mask
+
+    def _department_masks(self, user_id: int) -> Dict[int, int]:
+        masks = defaultdict(int)
+
+        for role_id in self._roles(user_id):
+            for department_id, mask in self._role_department_masks.get(
+                role_id, {}
+            ).items():
+                masks[department_id] |= mask
+
+        return dict(masks)
+
+    def _set_user_mask(self, user_id: int, mask: int) -> None:
+        previous = self._user_masks.get(user_id, 0)
+        self._user_masks[user_id] = mask
+        user_bit = 1 << user_id
+
+        for index in bit_positions(previous ^ mask):
+            self._permission_users[index] ^= user_bit
+
+    def _rebuild_permission_users(self) -> None:
+        size = (max(self._user_masks, default=0) >> 3) + 1
+        bitmaps = [bytearray(size) for _ in range(PERMISSION_COUNT)]
+
+        for user_id, mask in self._user_masks.items():
+            for index in bit_positions(mask):
+                bitmaps[index][user_id >> 3] |= 1 << (user_id & 7)
+
+        self._permission_users = [
+            int.from_bytes(bitmap, "little") for bitmap in bitmaps
+        ]
+
+
+authorization_graph = AuthorizationGraph()
@@ -9,6 +9,24 @@ class Config:
     def __init__(self) -> None:
         self.JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY", "super-secret-key")
         self.APPLICATION_VERSION = os.environ.get("APPLICATION_VERSION", "v2")
+        self.PERMISSION_CACHE_TTL = float(os.environ.get("PERMISSION_CACHE_TTL", "60"))
+        self.PERMISSION_CACHE_SIZE = int(
+            os.environ.get("PERMISSION_CACHE_SIZE", "10000")
+        )
+        self.PERMISSION_CACHE_BACKEND = os.environ.get(
+            "PERMISSION_CACHE_BACKEND", "local"
+        )
+        self.PERMISSION_CACHE_URL = os.environ.get(
+            "PERMISSION_CACHE_URL", "redis://localhost:6379/0"
+        )
+        self.RBAC_VERSION_TTL = float(os.environ.get("RBAC_VERSION_TTL", "1"))
+        self.AUTH_TOKEN_CACHE_SIZE = int(
+            os.environ.get("AUTH_TOKEN_CACHE_SIZE", "1024")
+        )
+        self.PASSWORD_HASHING_PROCESSES = int(
+            os.environ.get("PASSWORD_HASHING_PROCESSES", str(os.cpu_count() or 1))
+        )
+        self.AUTHORIZATION_GRAPH = os.environ.get("AUTHORIZATION_GRAPH", "1") == "1"
 
 
 CONFIG = Config()
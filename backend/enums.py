@@ -17,6 +17,11 @@ class Permission(Enum):
     MANAGE_POLICIES = "Manage policies"
 
 
+PERMISSION_BITS = {
+    permission.value: 1 << index for index, permission in enumerate(Permission)
+}
+
+
 class APIVersions(Enum):
     v1 = "v1"
     v2 = "v2"
@@ -0,0 +1,296 @@
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+import asyncpg
+
+from .postgresql_handler import (
+    DEFAULT_STATEMENT_TIMEOUT_SETTINGS,
+    PoolTimeoutError,
+    PostgreSQLHandler,
+    StatementTimeoutError,
+    load_database_connection_settings,
+    settings_section,
+    split_connection_settings,
+)
+
+LOG = logging.getLogger(__name__)
+
+_connection: ContextVar[Optional[asyncpg.Connection]] = ContextVar(
+    "async_connection", default=None
+)
+_unit_of_work: ContextVar[Optional[Dict]] = ContextVar(
+    "async_unit_of_work", default=None
+)
+
+
+def convert_record_to_dictionary(records: List[asyncpg.Record]) -> List[Dict]:
+    """
+    Convert 'asyncpg.Record' response from database to 'dict'
+    """
+
+    return [dict(record) for record in records]
+
+
+def run_callbacks(callbacks: List) -> None:
+    for callback, args in callbacks:
+        try:
+            callback(*args)
+        except Exception:
+            LOG.exception(f"After commit callback {callback} failed")
+
+
+def affected_rows(status: str) -> int:
+    """
+    Number of rows from command status like 'DELETE 3'
+    """
+
+    try:
+        return int(status.split()[-1])
+    except (AttributeError, IndexError, ValueError):
+        return 0
+
+
+class AsyncPostgreSQLHandler:
+    """
+    Asyncio counterpart of 'PostgreSQLHandler'.
+    Uses the same SQL registry and returns the same shapes, connections are
+    bound to current task context instead of current thread
+    """
+
+    _pool: Optional[asyncpg.pool.Pool] = None
+    _pool_lock: Optional[asyncio.Lock] = None
+    _acquire_timeout = 5.0
+    _statement_timeouts = DEFAULT_STATEMENT_TIMEOUT_SETTINGS
+
+    @classmethod
+    async def init_connection(cls) -> None:
+        settings = load_database_connection_settings()
+        connection_settings, pool_settings = split_connection_settings(settings)
+
+        if "port" in connection_settings:
+            connection_settings["port"] = int(connection_settings["port"])
+
+        AsyncPostgreSQLHandler._acquire_timeout = pool_settings["timeout"]
+        AsyncPostgreSQLHandler._statement_timeouts = settings_section(
+            settings, "statement_timeout"
+        )
+        AsyncPostgreSQLHandler._pool = await asyncpg.create_pool(
+            **connection_settings,
+            min_size=pool_settings["min_size"],
+            max_size=pool_settings["max_size"],
+        )
+
+    @classmethod
+    async def pool(cls) -> asyncpg.pool.Pool:
+        if AsyncPostgreSQLHandler._pool_lock is None:
+            AsyncPostgreSQLHandler._pool_lock = asyncio.Lock()
+
+        if cls._pool is None:
+            async with cls._pool_lock:
+                if cls._pool is None:
+                    await cls.init_connection()
+
+        return cls._pool
+
+    @classmethod
+    def reset_after_fork(cls) -> None:
+        """
+        Forget pool inherited from parent process, it belongs to parent's
+        event loop. Child process creates its own pool on first use
+        """
+
+        AsyncPostgreSQLHandler._pool = None
+        AsyncPostgreSQLHandler._pool_lock = None
+
+    @classmethod
+    async def close_pool(cls) -> None:
+        if cls._pool is not None:
+            await cls._pool.close()
+            AsyncPostgreSQLHandler._pool = None
+
+    @classmethod
+    @asynccontextmanager
+    async def acquire(cls) -> AsyncIterator[asyncpg.Connection]:
+        """
+        Check out connection for current task. Nested calls reuse it
+        """
+
+        bound = _connection.get()
+
+        if bound is not None:
+            yield bound
+            return
+
+        pool = await cls.pool()
+
+        try:
+            checked_out = await pool.acquire(timeout=cls._acquire_timeout)
+        except asyncio.TimeoutError:
+            raise PoolTimeoutError(
+                f"No database connection available after {cls._acquire_timeout} seconds"
+            ) from None
+
+        token = _connection.set(checked_out)
+
+        try:
+            yield checked_out
+        finally:
+            _connection.reset(token)
+            await pool.release(checked_out)
+
+    @staticmethod
+    def get_query(folder: str, query: str) -> str:
+        """
+        SQL query from directory 'sql/' with '$n' placeholders
+        """
+
+        return PostgreSQLHandler.prepared_statement(folder, query).numbered_text
+
+    @classmethod
+    def statement_timeout(cls, folder: str, query: str) -> Optional[float]:
+        """
+        Statement timeout in seconds of particular query, else of its class.
+        Zero timeout means no limit
+        """
+
+        statement = PostgreSQLHandler.prepared_statement(folder, query)
+        timeouts = cls._statement_timeouts
+        timeout = timeouts["queries"].get(
+            statement.key, timeouts[statement.query_class]
+        )
+
+        return timeout or None
+
+    @contextmanager
+    def cancellable(self, timeout: Optional[float]) -> Iterator[None]:
+        """
+        asyncpg cancels query running longer than its timeout, it is reported
+        as 'StatementTimeoutError'
+        """
+
+        try:
+            yield
+        except (asyncio.TimeoutError, asyncpg.QueryCanceledError) as error:
+            LOG.debug(f"Statement cancelled after {timeout} seconds. Error: {error}")
+            self.rollback()
+
+            raise StatementTimeoutError(
+                f"Database query did not finish in {timeout} seconds"
+            ) from None
+
+    async def fetch(self, folder: str, query: str, *parameters: Any) -> List[Dict]:
+        timeout = self.statement_timeout(folder, query)
+
+        async with self.acquire() as connection:
+            with self.cancellable(timeout):
+                records = await connection.fetch(
+                    self.get_query(folder, query), *parameters, timeout=timeout
+                )
+
+        return convert_record_to_dictionary(records)
+
+    async def fetchrow(
+        self, folder: str, query: str, *parameters: Any
+    ) -> Optional[Dict]:
+        timeout = self.statement_timeout(folder, query)
+
+        async with self.acquire() as connection:
+            with self.cancellable(timeout):
+                record = await connection.fetchrow(
+                    self.get_query(folder, query), *parameters, timeout=timeout
+                )
+
+        return None if record is None else dict(record)
+
+    async def fetchval(self, folder: str, query: str, *parameters: Any) -> Any:
+        timeout = self.statement_timeout(folder, query)
+
+        async with self.acquire() as connection:
+            with self.cancellable(timeout):
+                return await connection.fetchval(
+                    self.get_query(folder, query), *parameters, timeout=timeout
+                )
+
+    async def execute(self, folder: str, query: str, *parameters: Any) -> int:
+        """
+        Execute statement and return number of affected rows
+        """
+
+        timeout = self.statement_timeout(folder, query)
+
+        async with self.acquire() as connection:
+            with self.cancellable(timeout):
+                status = await connection.execute(
+                    self.get_query(folder, query), *parameters, timeout=timeout
+                )
+
+        return affected_rows(status)
+
+    @staticmethod
+    def after_commit(callback: Callable, *args: Any) -> None:
+        """
+        Call 'callback(*args)' once current transaction is committed. Outside
+        of transaction statement is already committed, so it is called at once
+        """
+
+        state = _unit_of_work.get()
+
+        if state is None:
+            run_callbacks([(callback, args)])
+        else:
+            state["after_commit"].append((callback, args))
+
+    @staticmethod
+    def rollback() -> None:
+        """
+        Mark current unit of work as failed. Outside of unit of work every
+        statement is committed on its own, so there is nothing to roll back
+        """
+
+        state = _unit_of_work.get()
+
+        if state is not None:
+            state["failed"] = True
+
+
+@asynccontextmanager
+async def transaction() -> AsyncIterator[None]:
+    """
+    Group async model calls into single transaction, committed once on exit
+    """
+
+    if _unit_of_work.get() is not None:
+        try:
+            yield
+        except BaseException:
+            AsyncPostgreSQLHandler.rollback()
+            raise
+
+        return
+
+    async with AsyncPostgreSQLHandler.acquire() as connection:
+        state = {"failed": False, "after_commit": []}
+        token = _unit_of_work.set(state)
+        database_transaction = connection.transaction()
+        await database_transaction.start()
+
+        try:
+            yield
+        except BaseException:
+            await database_transaction.rollback()
+            raise
+        else:
+            if state["failed"]:
+                await database_transaction.rollback()
+            else:
+                await database_transaction.commit()
+                run_callbacks(state["after_commit"])
+        finally:
+            _unit_of_work.reset(token)
+
+
+os.register_at_fork(after_in_child=AsyncPostgreSQLHandler.reset_after_fork)
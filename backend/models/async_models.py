@@ -0,0 +1,577 @@
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
+
+from asyncpg import PostgresError
+from enums import TransactionResult
+
+from .async_handler import AsyncPostgreSQLHandler
+from .rbac_events import RBACChange, publish
+
+LOG = logging.getLogger(__name__)
+
+
+def stringify_register_date(rows: List[Dict]) -> List[Dict]:
+    for row in rows:
+        row["register_date"] = str(row["register_date"])
+
+    return rows
+
+
+class AsyncUserModel(AsyncPostgreSQLHandler):
+    async def user_exist(self, email: str) -> bool:
+        return await self.fetchval("user", "user_exists", email)
+
+    async def insert_user(self, user: Dict) -> Union[int, TransactionResult]:
+        if not await self.user_exist(user["email"]):
+            try:
+                return await self.fetchval(
+                    "user",
+                    "insert_user",
+                    user["first_name"],
+                    user["last_name"],
+                    user["middle_name"],
+                    user["email"],
+                    user["password"],
+                )
+            except PostgresError as error:
+                LOG.debug(error)
+
+                self.rollback()
+                return TransactionResult.ERROR
+
+        return TransactionResult.SUCCESS
+
+    async def select_user(self, email: str) -> Dict:
+        user = await self.fetchrow("user", "select_user", email)
+        user.pop("password", None)
+        user.pop("id", None)
+
+        return user
+
+    async def select_users(self) -> List[Dict]:
+        return stringify_register_date(await self.fetch("user", "select_users"))
+
+    async def delete_user(self, email: str) -> bool:
+        deleted = bool(await self.execute("user", "delete_user", email))
+        self.after_commit(publish, RBACChange("user"))
+
+        return deleted
+
+    async def update_user(self, user: Dict) -> Optional[bool]:
+        try:
+            return bool(
+                await self.execute(
+                    "user",
+                    "update_user",
+                    user.get("first_name", None),
+                    user.get("last_name", None),
+                    user.get("middle_name", None),
+                    user.get("department_id", None),
+                    user.get("unit_id", None),
+                    user.get("position_id", None),
+                    user["email"],
+                )
+            )
+        except PostgresError as error:
+            LOG.debug(error)
+            self.rollback()
+
+    async def find_user_by_email(self, email: str) -> Optional[Tuple[int, str]]:
+        async with self.acquire() as connection:
+            response = await connection.fetchrow(
+                self.get_query("user", "select_user"), email
+            )
+
+        if response is None:
+            return response
+
+        return response[0], response["password"]
+
+    async def insert_user_role(self, user_id: int, role_id: int) -> Optional[int]:
+        try:
+            identifier = await self.fetchval(
+                "user_role", "insert_user_role", user_id, role_id
+            )
+        except PostgresError as error:
+            LOG.debug(error)
+            self.rollback()
+        else:
+            self.after_commit(publish, RBACChange("user_role", user_id))
+            return identifier
+
+    async def delete_user_role(self, user_id: int, role_id: int) -> Optional[bool]:
+        try:
+            deleted = bool(
+                await self.execute("user_role", "delete_user_role", user_id, role_id)
+            )
+        except PostgresError as error:
+            LOG.debug(error)
+            self.rollback()
+        else:
+            self.after_commit(publish, RBACChange("user_role", user_id))
+            return deleted
+
+    async def select_user_roles(self, user_id: int) -> List[Dict]:
+        return stringify_register_date(
+            await self.fetch("user_role", "select_user_roles", user_id)
+        )
+
+    async def insert_user_group(self, user_id: int, group_id: int) -> Optional[int]:
+        try:
+            identifier = await self.fetchval(
+                "user_group", "insert_user_group", group_id, user_id
+            )
+        except PostgresError as error:
+            LOG.debug(error)
+            self.rollback()
+        else:
+            self.after_commit(publish, RBACChange("user_group", user_id))
+            return identifier
+
+    async def delete_user_group(self, user_id: int, group_id: int) -> Optional[bool]:
+        try:
+            deleted = bool(
+                await self.execute("user_group", "delete_user_group", user_id, group_id)
+            )
+        except PostgresError as error:
+            LOG.debug(error)
+            self.rollback()
+        else:
+            self.after_commit(publish, RBACChange("user_group", user_id))
+            return deleted
+
+    async def select_user_groups(self, user_id: int) -> List[Dict]:
+        return stringify_register_date(
+            await self.fetch("user_group", "select_user_groups", user_id)
+        )
+
+    async def select_user_policies(self, user_id: int) -> List[Dict]:
+        return await self.fetch("user", "select_user_policies", user_id)
+
+    async def select_user_policy_departments(self, user_id: int) -> List[Dict]:
+        return await self.fetch("user", "select_user_policy_departments", user_id)
+
+
+class AsyncDepartmentModel(AsyncPostgreSQLHandler):
+    async def select_departments(self) -> List[Dict]:
+        return await self.fetch("department", "select_departments")
+
+    async def select_department_by_name(self, name: str) -> Dict:
+        return await self.fetchrow("department", "select_department_by_name", name)
+
+    async def select_department_by_id(self, department_id: int) -> Optional[Dict]:
+        return await self.fetchrow(
+            "department", "select_department_by_id", department_id
+        )
+
+    async def delete_department(self, identifier: int) -> bool:
+        return bool(await self.execute("department", "delete_department", identifier))
+
+    async def insert_department(
+        self, department: Dict
+    ) -> Union[int, TransactionResult]:
+        if not await self.department_exists(department["name"]):
+            try:
+                return await self.fetchval(
+                    "department",
+                    "insert_department",
+                    department["name"],
+                    department["description"],
+                    department["head_id"],
+                )
+            except PostgresError as error:
+                LOG.debug(error)
+
+                self.rollback()
+                return TransactionResult.ERROR
+
+        return TransactionResult.SUCCESS
+
+    async def update_department(self, department_id, department) -> Optional[bool]:
+        try:
+            return bool(
+                await self.execute(
+                    "department",
+                    "update_department",
+                    department.get("name", None),
+                    department.get("description", None),
+                    department.get("head_id", None),
+                    department_id,
+                )
+            )
+        except PostgresError as error:
+            LOG.debug(error)
+            self.rollback()
+
+    async def department_exists(self, name: str) -> bool:
+        return await self.fetchval("department", "department_exists", name)
+
+
+class AsyncGroupModel(AsyncPostgreSQLHandler):
+    async def select_groups(self) -> List[Dict]:
+        return await self.fetch("group", "select_groups")
+
+    async def select_group_by_id(self, group_id: int) -> Optional[Dict]:
+        return await self.fetchrow("group", "select_group_by_id", group_id)
+
+    async def delete_group(self, identifier: int) -> bool:
+        deleted = bool(await self.execute("group", "delete_group", identifier))
+        self.after_commit(publish, RBACChange("group"))
+
+        return deleted
+
+    async def insert_group(self, group: Dict) -> Union[int, TransactionResult]:
+        if not await self.group_exists(group["name"]):
+            try:
+                return await self.fetchval(
+                    "group", "insert_group", group["name"], group["description"]
+                )
+            except PostgresError as error:
+                LOG.debug(error)
+
+                self.rollback()
+                return TransactionResult.ERROR
+
+        return TransactionResult.SUCCESS
+
+    async def update_group(self, group_id: int, group: Dict) -> Optional[bool]:
+        try:
+            return bool(
+                await self.execute(
+                    "group",
+                    "update_group",
+                    group.get("name", None),
+                    group.get("description", None),
+                    group_id,
+                )
+            )
+        except PostgresError as error:
+            LOG.debug(error)
+            self.rollback()
+
+    async def group_exists(self, name: str) -> bool:
+        return await self.fetchval("group", "group_exists", name)
+
+    async def insert_group_role(self, group_id: int, role_id: int) -> Optional[int]:
+        try:
+            identifier = await self.fetchval(
+                "group_role", "insert_group_role", group_id, role_id
+            )
+        except PostgresError as error:
+            LOG.debug(error)
+            self.rollback()
+        else:
+            self.after_commit(publish, RBACChange("group_role"))
+            return identifier
+
+    async def delete_group_role(self, group_id: int, role_id: int) -> Optional[bool]:
+        try:
+            deleted = bool(
+                await self.execute("group_role", "delete_group_role", group_id, role_id)
+            )
+        except PostgresError as error:
+            LOG.debug(error)
+            self.rollback()
+        else:
+            self.after_commit(publish, RBACChange("group_role"))
+            return deleted
+
+    async def select_group_roles(self, group_id: int) -> List[Dict]:
+        return await self.fetch("group_role", "select_group_roles", group_id)
+
+    async def select_users_in_group(self, group_id: int) -> List[Dict]:
+        return stringify_register_date(
+            await self.fetch("user_group", "select_users_in_group", group_id)
+        )
+
+
+class AsyncRoleModel(AsyncPostgreSQLHandler):
+    async def select_roles(self) -> List[Dict]:
+        return await self.fetch("role", "select_roles")
+
+    async def select_role_by_id(self, role_id: int) -> Optional[Dict]:
+        return await self.fetchrow("role", "select_role_by_id", role_id)
+
+    async def select_users_with_role(self, role_id: int) -> List[Dict]:
+        return stringify_register_date(
+            await self.fetch("user_role", "select_users_with_role", role_id)
+        )
+
+    async def select_roles_with_policy(self, policy_id: int) -> List[Dict]:
+        return await self.fetch("role_policy", "select_roles_with_policy", policy_id)
+
+    async def select_single_role(self, identifier: int) -> Optional[Dict]:
+        return await self.select_role_by_id(identifier)
+
+    async def delete_role(self, identifier: int) -> bool:
+        deleted = bool(await self.execute("role", "delete_role", identifier))
+        self.after_commit(publish, RBACChange("role"))
+
+        return deleted
+
+    async def insert_role(self, role: Dict) -> Union[int, TransactionResult]:
+        if not await self.role_exists(role["name"]):
+            try:
+                return await self.fetchval(
+                    "role", "insert_role", role["name"], role["description"]
+                )
+            except PostgresError as error:
+                LOG.debug(error)
+
+                self.rollback()
+                return TransactionResult.ERROR
+
+        return TransactionResult.SUCCESS
+
+    async def update_role(self, role_id: int, role: Dict) -> Optional[bool]:
+        try:
+            return bool(
+                await self.execute(
+                    "role",
+                    "update_role",
+                    role.get("name", None),
+                    role.get("description", None),
+                    role_id,
+                )
+            )
+        except PostgresError as error:
+            LOG.debug(error)
+            self.rollback()
+
+    async def role_exists(self, name: str) -> bool:
+        return await self.fetchval("role", "role_exists", name)
+
+    async def insert_role_policy(self, body: Dict) -> Optional[int]:
+        try:
+            identifier = await self.fetchval(
+                "role_policy",
+                "insert_role_policy",
+                body["role_id"],
+                body["policy_id"],
+                body["department_id"],
+            )
+        except PostgresError as error:
+            LOG.debug(error)
+            self.rollback()
+        else:
+            self.after_commit(publish, RBACChange("role_policy"))
+            return identifier
+
+    async def delete_role_policy(self, body: Dict) -> Optional[bool]:
+        try:
+            deleted = bool(
+                await self.execute(
+                    "role_policy",
+                    "delete_role_policy",
+                    body["role_id"],
+                    body["policy_id"],
+                    body["department_id"],
+                )
+            )
+        except PostgresError as error:
+            LOG.debug(error)
+            self.rollback()
+        else:
+            self.after_commit(publish, RBACChange("role_policy"))
+            return deleted
+
+    async def select_role_policies(self, role_id: int) -> List[Dict]:
+        return await self.fetch("role_policy", "select_role_policies", role_id)
+
+
+class AsyncPolicyModel(AsyncPostgreSQLHandler):
+    async def select_policies(self) -> List[Dict]:
+        return await self.fetch("policy", "select_policies")
+
+    async def select_policy_by_id(self, policy_id: int) -> Optional[Dict]:
+        return await self.fetchrow("policy", "select_policy_by_id", policy_id)
+
+    async def delete_policy(self, identifier: int) -> bool:
+        deleted = bool(await self.execute("policy", "delete_policy", identifier))
+        self.after_commit(publish, RBACChange("policy"))
+
+        return deleted
+
+    async def insert_policy(self, policy: Dict) -> Union[int, TransactionResult]:
+        if not await self.policy_exists(policy["title"]):
+            try:
+                return await self.fetchval(
+                    "policy",
+                    "insert_policy",
+                    policy["title"],
+                    policy["description"],
+                    policy["is_administrative"],
+                )
+            except PostgresError as error:
+                LOG.debug(error)
+
+                self.rollback()
+                return TransactionResult.ERROR
+
+        return TransactionResult.SUCCESS
+
+    async def update_policy(self, policy_id: int, policy: Dict) -> Optional[bool]:
+        try:
+            updated = bool(
+                await self.execute(
+                    "policy",
+                    "update_policy",
+                    policy.get("title", None),
+                    policy.get("description", None),
+                    policy.get("is_administrative", None),
+                    policy_id,
+                )
+            )
+        except PostgresError as error:
+            LOG.debug(error)
+            self.rollback()
+        else:
+            self.after_commit(publish, RBACChange("policy"))
+            return updated
+
+    async def policy_exists(self, name: str) -> bool:
+        return await self.fetchval("policy", "policy_exists", name)
+
+
+class AsyncPositionModel(AsyncPostgreSQLHandler):
+    async def select_positions(self) -> List[Dict]:
+        return await self.fetch("position", "select_positions")
+
+    async def select_position_by_id(self, position_id: int) -> Optional[Dict]:
+        return await self.fetchrow("position", "select_position_by_id", position_id)
+
+    async def delete_position(self, identifier: int) -> bool:
+        return bool(await self.execute("position", "delete_position", identifier))
+
+    async def insert_position(self, position: Dict) -> Union[int, TransactionResult]:
+        if not await self.position_exists(position["title"]):
+            try:
+                return await self.fetchval(
+                    "position", "insert_position", position["title"], position["level"]
+                )
+            except PostgresError as error:
+                LOG.debug(error)
+
+                self.rollback()
+                return TransactionResult.ERROR
+
+        return TransactionResult.SUCCESS
+
+    async def update_position(self, position_id: int, position: Dict) -> Optional[bool]:
+        try:
+            return bool(
+                await self.execute(
+                    "position",
+                    "update_position",
+                    position.get("name", None),
+                    position.get("description", None),
+                    position_id,
+                )
+            )
+        except PostgresError as error:
+            LOG.debug(error)
+            self.rollback()
+
+    async def position_exists(self, name: str) -> bool:
+        return await self.fetchval("position", "position_exists", name)
+
+
+class AsyncUnitModel(AsyncPostgreSQLHandler):
+    async def select_units(self) -> List[Dict]:
+        return await self.fetch("unit", "select_units")
+
+    async def select_department_units(self, department_id: int) -> List[Dict]:
+        return await self.fetch("unit", "select_department_units", department_id)
+
+    async def select_single_unit(self, identifier: int) -> Optional[Dict]:
+        return await self.fetchrow("unit", "select_unit_by_id", identifier)
+
+    async def delete_unit(self, identifier: int) -> bool:
+        return bool(await self.execute("unit", "delete_unit", identifier))
+
+    async def insert_unit(self, unit: Dict) -> Union[int, TransactionResult]:
+        if not await self.unit_exists(unit["name"]):
+            try:
+                return await self.fetchval(
+                    "unit",
+                    "insert_unit",
+                    unit["name"],
+                    unit["description"],
+                    unit["department_id"],
+                    unit["head_id"],
+                )
+            except PostgresError as error:
+                LOG.debug(error)
+
+                self.rollback()
+                return TransactionResult.ERROR
+
+        return TransactionResult.SUCCESS
+
+    async def update_unit(self, unit_id: int, unit: Dict) -> Optional[bool]:
+        try:
+            return bool(
+                await self.execute(
+                    "unit",
+                    "update_unit",
+                    unit.get("name", None),
+                    unit.get("description", None),
+                    unit.get("department_id", None),
+                    unit.get("head_id", None),
+                    unit_id,
+                )
+            )
+        except PostgresError as error:
+            LOG.debug(error)
+            self.rollback()
+
+    async def unit_exists(self, name: str) -> bool:
+        return await self.fetchval("unit", "unit_exists", name)
+
+
+class AsyncAuditModel(AsyncPostgreSQLHandler):
+    async def rollback_changes(self, date: datetime) -> bool:
+        LOG.debug(f"Execute rollback to {date}")
+
+        timeout = self._statement_timeouts["queries"].get(
+            "rollback_changes", self._statement_timeouts["procedure"]
+        )
+
+        try:
+            async with self.acquire() as connection:
+                with self.cancellable(timeout):
+                    await connection.execute(
+                        "SELECT rollback_changes($1);", date, timeout=timeout or None
+                    )
+        except PostgresError as error:
+            LOG.debug(f"Rollback failed. Error: {error}")
+            return False
+
+        LOG.debug("Successfully rollback")
+        return True
+
+    async def select_audit_information(self, date: float) -> List[Dict]:
+        return await self.fetch("user", "select_audit_entries", date)
+
+
+class AsyncRBACVersionModel(AsyncPostgreSQLHandler):
+    async def select_versions(self, user_id: int) -> Tuple[int, int]:
+        """
+        Global and per-user versions of policy grants
+        """
+
+        row = await self.fetchrow("rbac_version", "select_rbac_versions", user_id)
+
+        return row["global_version"], row["user_version"]
+
+
+users = AsyncUserModel()
+departments = AsyncDepartmentModel()
+groups = AsyncGroupModel()
+roles = AsyncRoleModel()
+policies = AsyncPolicyModel()
+positions = AsyncPositionModel()
+units = AsyncUnitModel()
+audit = AsyncAuditModel()
+rbac_versions = AsyncRBACVersionModel()
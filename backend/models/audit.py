@@ -4,17 +4,17 @@ from typing import Dict, List
 
 from psycopg2 import Error
 
-from .postgresql_handler import PostgreSQLHandler, convert_row_to_dictionary
+from .postgresql_handler import PostgreSQLHandler
 
 LOG = logging.getLogger(__name__)
 
 
 class AuditModel(PostgreSQLHandler):
-    def rollback(self, date: datetime) -> bool:
+    def rollback_changes(self, date: datetime) -> bool:
         LOG.debug(f"Execute rollback to {date}")
 
         try:
-            self.cursor.callproc("rollback_changes", (date,))
+            self.callproc("rollback_changes", (date,))
         except Error as error:
             LOG.debug(f"Rollback failed. Error: {error}")
             return False
@@ -23,10 +23,7 @@ class AuditModel(PostgreSQLHandler):
         return True
 
     def select_audit_information(self, date: datetime) -> List[Dict]:
-        self.cursor.execute(self.get_query("user", "select_audit_entries"), (date,))
-        audit_entries = self.cursor.fetchall()
-
-        return convert_row_to_dictionary(audit_entries)
+        return self.fetch_all("user", "select_audit_entries", (date,))
 
 
 audit = AuditModel()
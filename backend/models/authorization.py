@@ -0,0 +1,41 @@
+from typing import Dict, List, Optional, Tuple
+
+from .postgresql_handler import PostgreSQLHandler
+
+
+class AuthorizationModel(PostgreSQLHandler):
+    """
+    Raw edges of user -> group -> role -> policy graph
+    """
+
+    def select_versions(self) -> Dict[int, int]:
+        cursor = self.execute("rbac_version", "select_all_rbac_versions")
+
+        return dict(cursor.fetchall())
+
+    def select_role_policies(self) -> List[Tuple[int, str, int]]:
+        return self.execute("authorization", "select_role_policy_edges").fetchall()
+
+    def select_group_roles(self) -> List[Tuple[int, int]]:
+        return self.execute("authorization", "select_group_role_edges").fetchall()
+
+    def select_user_roles(
+        self, user_ids: Optional[List[int]] = None
+    ) -> List[Tuple[int, int]]:
+        cursor = self.execute(
+            "authorization", "select_user_role_edges", (user_ids, user_ids)
+        )
+
+        return cursor.fetchall()
+
+    def select_user_groups(
+        self, user_ids: Optional[List[int]] = None
+    ) -> List[Tuple[int, int]]:
+        cursor = self.execute(
+            "authorization", "select_user_group_edges", (user_ids, user_ids)
+        )
+
+        return cursor.fetchall()
+
+
+authorization = AuthorizationModel()
@@ -0,0 +1,150 @@
+import json
+import logging
+import os
+import select
+import threading
+from typing import Dict, Optional
+
+import psycopg2
+from psycopg2.extensions import connection
+
+from .postgresql_handler import (
+    PostgreSQLHandler,
+    database_connection,
+    detach_connection,
+    settings_section,
+    split_connection_settings,
+)
+from .rbac_events import ANY_TABLE, RBACChange, publish
+
+LOG = logging.getLogger(__name__)
+
+
+class ChangeListener:
+    """
+    Background thread of every worker process which receives change events
+    sent by table triggers with 'pg_notify' and publishes them to RBAC change
+    subscribers, so caches of all workers and nodes are invalidated right
+    after commit instead of after their TTL expires
+    """
+
+    def __init__(self) -> None:
+        self._pid: Optional[int] = None
+        self._connection: Optional[connection] = None
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._counters = {"events": 0, "malformed": 0, "connects": 0}
+
+    def ensure_started(self) -> None:
+        """
+        Start listener thread once in current process, when enabled in
+        'events' section of connection settings
+        """
+
+        if self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+
+            self._pid = os.getpid()
+            settings = settings_section(PostgreSQLHandler.settings(), "events")
+
+            if not settings["listen"]:
+                return
+
+            self._stopped = threading.Event()
+            threading.Thread(
+                target=self._run,
+                args=(settings["poll_interval"], settings["reconnect_delay"]),
+                name="change-listener",
+                daemon=True,
+            ).start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def reset_after_fork(self) -> None:
+        """
+        Forget listener of parent process, child starts its own one
+        """
+
+        inherited = self._connection
+        self._pid = None
+        self._connection = None
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+
+        if inherited is not None:
+            detach_connection(inherited)
+
+    def stats(self) -> Dict:
+        return {**self._counters, "listening": self._connection is not None}
+
+    def _run(self, poll_interval: float, reconnect_delay: float) -> None:
+        stopped = self._stopped
+
+        while not stopped.is_set():
+            try:
+                self._connection = self._connect()
+            except psycopg2.Error as error:
+                LOG.warning(f"Change listener can not connect. Error: {error}")
+                stopped.wait(reconnect_delay)
+                continue
+
+            # Events sent while nobody listened are lost
+            publish(RBACChange(ANY_TABLE))
+
+            try:
+                self._listen(self._connection, stopped, poll_interval)
+            except (psycopg2.Error, OSError) as error:
+                LOG.warning(f"Change listener disconnected. Error: {error}")
+                stopped.wait(reconnect_delay)
+            finally:
+                listener_connection, self._connection = self._connection, None
+                listener_connection.close()
+
+    def _connect(self) -> connection:
+        connection_settings, _ = split_connection_settings(PostgreSQLHandler.settings())
+        listener_connection = database_connection(connection_settings)
+        listener_connection.autocommit = True
+
+        with listener_connection.cursor() as cursor:
+            PostgreSQLHandler.prepared_statement("cache_events", "listen").execute(
+                cursor
+            )
+
+        self._counters["connects"] += 1
+
+        return listener_connection
+
+    def _listen(
+        self,
+        listener_connection: connection,
+        stopped: threading.Event,
+        poll_interval: float,
+    ) -> None:
+        while not stopped.is_set():
+            # Timeout only lets listener notice 'stop'
+            select.select([listener_connection], [], [], poll_interval)
+            listener_connection.poll()
+
+            while listener_connection.notifies:
+                self._dispatch(listener_connection.notifies.pop(0).payload)
+
+    def _dispatch(self, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+            change = RBACChange(event["table"], event.get("user_id"))
+        except (ValueError, KeyError, TypeError) as error:
+            LOG.warning(f"Malformed change event {payload!r}. Error: {error}")
+            self._counters["malformed"] += 1
+            return
+
+        self._counters["events"] += 1
+        publish(change)
+
+
+change_listener = ChangeListener()
+os.register_at_fork(after_in_child=change_listener.reset_after_fork)
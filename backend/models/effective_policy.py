@@ -0,0 +1,41 @@
+import logging
+from typing import Dict, List, Optional
+
+from psycopg2 import Error
+
+from .postgresql_handler import PostgreSQLHandler
+
+LOG = logging.getLogger(__name__)
+
+
+class EffectivePolicyModel(PostgreSQLHandler):
+    """
+    Denormalised 'user_effective_policy' table, kept up to date by triggers
+    on user_role, user_group, group_role and role_policy
+    """
+
+    def select_inconsistencies(self) -> List[Dict]:
+        """
+        Rows 'missing' from the table or 'unexpected' in it, compared with
+        policies granted through roles and groups
+        """
+
+        return self.fetch_all("user_effective_policy", "check_user_effective_policy")
+
+    def backfill(self) -> Optional[int]:
+        """
+        Recompute effective policies of every user, returns count of rows
+        """
+
+        try:
+            cursor = self.callproc("backfill_user_effective_policy")
+        except Error as error:
+            LOG.debug(error)
+            self.rollback()
+        else:
+            rows = cursor.fetchone()[0]
+            self.commit()
+            return rows
+
+
+effective_policies = EffectivePolicyModel()
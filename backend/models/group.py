@@ -1,41 +1,35 @@
 import logging
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 from enums import TransactionResult
 from psycopg2 import Error
 
-from .postgresql_handler import PostgreSQLHandler, convert_row_to_dictionary
+from .postgresql_handler import REGISTER_DATE_MAPPING, PostgreSQLHandler
+from .rbac_events import RBACChange, publish
 
 LOG = logging.getLogger(__name__)
 
 
 class GroupModel(PostgreSQLHandler):
     def select_groups(self) -> List[Dict]:
-        self.cursor.execute(self.get_query("group", "select_groups"))
-        groups = self.cursor.fetchall()
-
-        return convert_row_to_dictionary(groups)
+        return self.fetch_all("group", "select_groups")
 
     def select_group_by_id(self, group_id: int) -> Optional[Dict]:
-        self.cursor.execute(self.get_query("group", "select_group_by_id"), (group_id,))
-        group = self.cursor.fetchone()
-
-        if group is not None:
-            return dict(group)
-
-        return None
+        return self.fetch_one("group", "select_group_by_id", (group_id,))
 
     def delete_group(self, identifier: int) -> bool:
-        self.cursor.execute(self.get_query("group", "delete_group"), (identifier,))
-        self.connection.commit()
+        self.execute("group", "delete_group", (identifier,))
+        self.after_commit(publish, RBACChange("group"))
+        self.commit()
 
         return bool(self.cursor.rowcount)
 
     def insert_group(self, group: Dict) -> Union[int, TransactionResult]:
         if not self.group_exists(group["name"]):
             try:
-                self.cursor.execute(
-                    self.get_query("group", "insert_group"),
+                self.execute(
+                    "group",
+                    "insert_group",
                     (
                         group["name"],
                         group["description"],
@@ -44,18 +38,19 @@ class GroupModel(PostgreSQLHandler):
             except Error as error:
                 LOG.debug(error)
 
-                self.connection.rollback()
+                self.rollback()
                 return TransactionResult.ERROR
             else:
-                self.connection.commit()
+                self.commit()
                 return self.cursor.fetchone()[0]
 
         return TransactionResult.SUCCESS
 
     def update_group(self, group_id: int, group: Dict) -> Optional[bool]:
         try:
-            self.cursor.execute(
-                self.get_query("group", "update_group"),
+            self.execute(
+                "group",
+                "update_group",
                 (
                     group.get("name", None),
                     group.get("description", None),
@@ -64,62 +59,47 @@ class GroupModel(PostgreSQLHandler):
             )
         except Error as error:
             LOG.debug(error)
-            self.connection.rollback()
+            self.rollback()
         else:
-            self.connection.commit()
+            self.commit()
             return bool(self.cursor.rowcount)
 
     def group_exists(self, name: str) -> bool:
-        self.cursor.execute(self.get_query("group", "group_exists"), (name,))
-        return self.cursor.fetchall()[0][0]
+        return self.fetch_value("group", "group_exists", (name,))
 
     def insert_group_role(self, group_id: int, role_id: int) -> Optional[bool]:
         try:
-            self.cursor.execute(
-                self.get_query("group_role", "insert_group_role"),
+            self.execute(
+                "group_role",
+                "insert_group_role",
                 (group_id, role_id),
             )
         except Error as error:
             LOG.debug(error)
-            self.connection.rollback()
+            self.rollback()
         else:
-            self.connection.commit()
+            self.after_commit(publish, RBACChange("group_role"))
+            self.commit()
             return self.cursor.fetchone()[0]
 
     def delete_group_role(self, group_id: int, role_id: int) -> Optional[bool]:
         try:
-            self.cursor.execute(
-                self.get_query("group_role", "delete_group_role"), (group_id, role_id)
-            )
+            self.execute("group_role", "delete_group_role", (group_id, role_id))
         except Error as error:
             LOG.debug(error)
-            self.connection.rollback()
+            self.rollback()
         else:
-            self.connection.commit()
+            self.after_commit(publish, RBACChange("group_role"))
+            self.commit()
             return bool(self.cursor.rowcount)
 
     def select_group_roles(self, group_id: int) -> List[Dict]:
-        self.cursor.execute(
-            self.get_query("group_role", "select_group_roles"), (group_id,)
-        )
-        roles = self.cursor.fetchall()
+        return self.fetch_all("group_role", "select_group_roles", (group_id,))
 
-        for index, role in enumerate(roles):
-            roles[index] = dict(role)
-
-        return roles
-
-    def select_users_in_group(self, group_id: int) -> List[Dict]:
-        self.cursor.execute(
-            self.get_query("user_group", "select_users_in_group"), (group_id,)
+    def select_users_in_group(self, group_id: int) -> Iterator[Dict]:
+        return self.stream(
+            "user_group", "select_users_in_group", (group_id,), REGISTER_DATE_MAPPING
         )
-        users = self.cursor.fetchall()
-
-        for index, user in enumerate(users):
-            users[index] = dict(user)
-            users[index]["register_date"] = str(users[index]["register_date"])
-
-        return users
 
 
 groups = GroupModel()
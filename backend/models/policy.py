@@ -4,40 +4,57 @@ from typing import Dict, List, Optional, Union
 from enums import TransactionResult
 from psycopg2 import Error
 
-from .postgresql_handler import PostgreSQLHandler, convert_row_to_dictionary
+from .postgresql_handler import PostgreSQLHandler
+from .rbac_events import RBACChange, publish
 
 LOG = logging.getLogger(__name__)
 
 
 class PolicyModel(PostgreSQLHandler):
     def select_policies(self) -> List[Dict]:
-        self.cursor.execute(self.get_query("policy", "select_policies"))
-        policies = self.cursor.fetchall()
-
-        return convert_row_to_dictionary(policies)
+        return self.fetch_all("policy", "select_policies")
 
     def select_policy_by_id(self, policy_id: int) -> Optional[Dict]:
-        self.cursor.execute(
-            self.get_query("policy", "select_policy_by_id"), (policy_id,)
+        return self.fetch_one("policy", "select_policy_by_id", (policy_id,))
+
+    def select_users_with_policy(
+        self,
+        policy_id: int,
+        department_id: Optional[int] = None,
+        after: int = 0,
+        limit: int = 100,
+    ) -> List[Dict]:
+        """
+        Page of users granted policy directly or through groups, ordered by
+        user identifier and starting after 'after'
+        """
+
+        return self.fetch_all(
+            "policy",
+            "select_users_with_policy",
+            (policy_id, department_id, department_id, after, limit, policy_id),
         )
-        policy = self.cursor.fetchone()
 
-        if policy is not None:
-            return dict(policy)
+    def select_users_by_ids(self, user_ids: List[int]) -> List[Dict]:
+        """
+        Users listed by policy holders page, ordered by user identifier
+        """
 
-        return None
+        return self.fetch_all("policy", "select_users_by_ids", (user_ids,))
 
     def delete_policy(self, identifier: int) -> bool:
-        self.cursor.execute(self.get_query("policy", "delete_policy"), (identifier,))
-        self.connection.commit()
+        self.execute("policy", "delete_policy", (identifier,))
+        self.after_commit(publish, RBACChange("policy"))
+        self.commit()
 
         return bool(self.cursor.rowcount)
 
     def insert_policy(self, policy: Dict) -> Union[int, TransactionResult]:
         if not self.policy_exists(policy["title"]):
             try:
-                self.cursor.execute(
-                    self.get_query("policy", "insert_policy"),
+                self.execute(
+                    "policy",
+                    "insert_policy",
                     (
                         policy["title"],
                         policy["description"],
@@ -47,18 +64,19 @@ class PolicyModel(PostgreSQLHandler):
             except Error as error:
                 LOG.debug(error)
 
-                self.connection.rollback()
+                self.rollback()
                 return TransactionResult.ERROR
             else:
-                self.connection.commit()
+                self.commit()
                 return self.cursor.fetchone()[0]
 
         return TransactionResult.SUCCESS
 
     def update_policy(self, policy_id: int, policy: Dict) -> Optional[bool]:
         try:
-            self.cursor.execute(
-                self.get_query("policy", "update_policy"),
+            self.execute(
+                "policy",
+                "update_policy",
                 (
                     policy.get("title", None),
                     policy.get("description", None),
@@ -68,14 +86,14 @@ class PolicyModel(PostgreSQLHandler):
             )
         except Error as error:
             LOG.debug(error)
-            self.connection.rollback()
+            self.rollback()
         else:
-            self.connection.commit()
+            self.after_commit(publish, RBACChange("policy"))
+            self.commit()
             return bool(self.cursor.rowcount)
 
     def policy_exists(self, name: str) -> bool:
-        self.cursor.execute(self.get_query("policy", "policy_exists"), (name,))
-        return self.cursor.fetchall()[0][0]
+        return self.fetch_value("policy", "policy_exists", (name,))
 
 
 policies = PolicyModel()
@@ -1,8 +1,84 @@
 import json
-from typing import Dict, List, Optional, Tuple
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from itertools import count
+from operator import itemgetter
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import psycopg2
-from psycopg2.extras import DictCursor
+from psycopg2.errors import QueryCanceled
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, connection
+from psycopg2.extras import execute_values
+
+from .query_registry import QUERIES
+
+LOG = logging.getLogger(__name__)
+
+CONNECTION_SETTINGS_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "db_connection_setting.json",
+)
+
+PREPARABLE_STATEMENTS = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "VALUES")
+LOCKING_CLAUSE = re.compile(r"\bFOR\s+(NO\s+KEY\s+)?(UPDATE|SHARE|KEY\s+SHARE)\b", re.I)
+READ_STATEMENTS = ("SELECT", "WITH", "VALUES", "TABLE")
+MODIFYING_KEYWORD = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE|TRUNCATE)\b", re.I)
+SQL_COMMENT = re.compile(r"--[^\n]*")
+
+DEFAULT_POOL_SETTINGS = {
+    "min_size": 1,
+    "max_size": 10,
+    "timeout": 5.0,
+    "ping_interval": 30.0,
+}
+
+DEFAULT_CURSOR_SETTINGS = {
+    "itersize": 2000,
+}
+
+DEFAULT_REPLICATION_SETTINGS = {
+    "replicas": [],
+    "max_lag": 5.0,
+    "lag_check_interval": 1.0,
+}
+
+DEFAULT_STATEMENT_TIMEOUT_SETTINGS = {
+    "read": 10.0,
+    "write": 10.0,
+    "stream": 60.0,
+    "procedure": 60.0,
+    "queries": {},
+    "endpoints": {},
+}
+
+DEFAULT_EVENTS_SETTINGS = {
+    "listen": True,
+    "poll_interval": 5.0,
+    "reconnect_delay": 1.0,
+}
+
+SETTINGS_SECTIONS = {
+    "pool": DEFAULT_POOL_SETTINGS,
+    "cursor": DEFAULT_CURSOR_SETTINGS,
+    "replication": DEFAULT_REPLICATION_SETTINGS,
+    "statement_timeout": DEFAULT_STATEMENT_TIMEOUT_SETTINGS,
+    "events": DEFAULT_EVENTS_SETTINGS,
+}
 
 
 def load_database_connection_settings():
@@ -10,70 +86,1135 @@ def load_database_connection_settings():
     Load connection setting from json file in this directory
     """
 
-    with open("db_connection_setting.json") as json_file:
+    with open(CONNECTION_SETTINGS_FILE) as json_file:
         return json.load(json_file)
 
 
+def settings_section(settings: Dict, section: str) -> Dict:
+    """
+    Section of connection settings file merged with its default values
+    """
+
+    return {**SETTINGS_SECTIONS[section], **settings.get(section, {})}
+
+
+def split_connection_settings(settings: Dict) -> Tuple[Dict, Dict]:
+    """
+    Separate 'psycopg2.connect' arguments from connection pool settings
+    """
+
+    connection_settings = {
+        key: value for key, value in settings.items() if key not in SETTINGS_SECTIONS
+    }
+
+    return connection_settings, settings_section(settings, "pool")
+
+
+def replica_connection_settings(primary_settings: Dict, replica) -> Dict:
+    """
+    Replica is either DSN string or 'dict' with keys overriding primary settings
+    """
+
+    if isinstance(replica, str):
+        return {"dsn": replica}
+
+    return {**primary_settings, **replica}
+
+
+class PreparingConnection(connection):
+    """
+    Connection which remembers statements prepared in its session.
+    New connection after reconnect starts with empty set and prepares again
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.prepared_statements = set()
+        self.statement_timeout = None
+
+    def rollback(self) -> None:
+        # Rollback may revert 'statement_timeout' set inside the transaction
+        self.statement_timeout = None
+        super().rollback()
+
+
 def database_connection(connection_settings: Dict):
     """
     Get connection to database from 'connection_settings'
     """
 
-    return psycopg2.connect(**connection_settings)
+    return psycopg2.connect(
+        **connection_settings, connection_factory=PreparingConnection
+    )
+
+
+def detach_connection(inherited: connection) -> None:
+    """
+    Drop connection inherited from parent process without ending its session.
+    The socket is swapped for '/dev/null' first, so goodbye message sent on
+    close does not reach the server while parent still uses the session
+    """
+
+    if inherited.closed:
+        return
+
+    devnull = os.open(os.devnull, os.O_RDWR)
+
+    try:
+        os.dup2(devnull, inherited.fileno())
+    finally:
+        os.close(devnull)
 
+    try:
+        inherited.close()
+    except psycopg2.Error as error:
+        LOG.debug(error)
 
-def load_query(filename: str):
+
+class RowMapping(NamedTuple):
     """
-    Load SQL query from files as text
+    Projection of query columns into response: columns to leave out and
+    converters applied to not null values of particular columns
     """
 
-    with open(filename, "r") as sql_query:
-        return sql_query.read()
+    exclude: Tuple[str, ...] = ()
+    converters: Tuple[Tuple[str, Callable], ...] = ()
+
+
+DEFAULT_ROW_MAPPING = RowMapping()
+REGISTER_DATE_MAPPING = RowMapping(converters=(("register_date", str),))
 
 
-def convert_row_to_dictionary(rows: List):
+def compile_row_mapper(
+    description: Tuple, mapping: RowMapping = DEFAULT_ROW_MAPPING
+) -> Callable[[Tuple], Dict]:
     """
-    Convert DictRow response from database to 'dict'
+    Build function which maps tuple row straight to JSON-ready 'dict' in one
+    pass. Duplicated column names keep the last value, like 'DictRow' does
     """
 
-    for index, row in enumerate(rows):
-        rows[index] = dict(row)
+    positions = {}
 
-    return rows
+    for index, column in enumerate(description):
+        positions[column.name] = index
 
+    names = tuple(name for name in positions if name not in mapping.exclude)
+    converters = tuple(
+        (name, converter) for name, converter in mapping.converters if name in names
+    )
 
-class PostgreSQLHandler:
-    _connection = None
+    if len(names) == len(description):
+        select = None
+    elif len(names) == 1:
+        only = positions[names[0]]
+        select = lambda row: (row[only],)  # noqa: E731
+    else:
+        select = itemgetter(*(positions[name] for name in names))
+
+    if not converters:
+        if select is None:
+            return lambda row: dict(zip(names, row))
+
+        return lambda row: dict(zip(names, select(row)))
+
+    def map_row(row: Tuple) -> Dict:
+        result = dict(zip(names, row if select is None else select(row)))
+
+        for name, converter in converters:
+            if result[name] is not None:
+                result[name] = converter(result[name])
+
+        return result
+
+    return map_row
+
+
+def is_read_only(text: str) -> bool:
+    """
+    Statement only reads rows: query which modifies no rows, neither by
+    itself nor in data-modifying CTE, and locks none of them
+    """
+
+    statement = SQL_COMMENT.sub(" ", text).lstrip()
+
+    return (
+        statement.upper().startswith(READ_STATEMENTS)
+        and not MODIFYING_KEYWORD.search(statement)
+        and not LOCKING_CLAUSE.search(statement)
+    )
+
+
+class PreparedStatement:
+    """
+    SQL query from 'sql/' directory in server-side prepared form.
+    Positional '%s' placeholders are translated into '$n' parameters
+    """
+
+    def __init__(self, folder: str, query: str, text: str) -> None:
+        self.key = f"{folder}/{query}"
+        self.name = f"{folder}__{query}"
+        self.text = text
+        self.parameters_count = text.count("%s")
+        self.preparable = (
+            text.lstrip().upper().startswith(PREPARABLE_STATEMENTS) and "%%" not in text
+        )
+        self.read_only = is_read_only(text)
+        self.query_class = "read" if self.read_only else "write"
+
+        counter = iter(range(1, self.parameters_count + 1))
+        self.numbered_text = re.sub("%s", lambda _: f"${next(counter)}", text)
+        self.prepare_sql = f"PREPARE {self.name} AS {self.numbered_text}"
+        self.execute_sql = f"EXECUTE {self.name}"
+
+        if self.parameters_count:
+            self.execute_sql += "({})".format(", ".join(["%s"] * self.parameters_count))
+
+    def execute(self, cursor, parameters: Optional[Tuple] = None) -> None:
+        """
+        Prepare statement once per connection, then execute it by name
+        """
+
+        prepared_statements = getattr(cursor.connection, "prepared_statements", None)
+
+        if not self.preparable or prepared_statements is None:
+            cursor.execute(self.text, parameters)
+            return
+
+        if self.name not in prepared_statements:
+            cursor.execute(self.prepare_sql)
+            prepared_statements.add(self.name)
+
+        if self.parameters_count:
+            cursor.execute(self.execute_sql, parameters)
+        else:
+            cursor.execute(self.execute_sql)
+
+
+class PoolTimeoutError(Exception):
+    """
+    No connection became available during pool wait time limit
+    """
+
+
+class StatementTimeoutError(Exception):
+    """
+    Query was cancelled by database after its statement timeout
+    """
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of database connections.
+    Connections are checked for liveness on checkout, callers wait up to
+    'timeout' seconds when all 'max_size' connections are in use.
+    """
+
+    def __init__(
+        self,
+        connection_settings: Dict,
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 5.0,
+        ping_interval: float = 30.0,
+        read_only: bool = False,
+    ) -> None:
+        self.connection_settings = connection_settings
+        self.read_only = read_only
+        self.min_size = min_size
+        self.max_size = max(max_size, min_size, 1)
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+
+        self._idle: List[Tuple[connection, float]] = []
+        self._size = 0
+        self._condition = threading.Condition()
+        self._counters = {
+            "connections_created": 0,
+            "connections_closed": 0,
+            "checkouts": 0,
+            "checkins": 0,
+            "timeouts": 0,
+            "failed_pings": 0,
+            "wait_time_total": 0.0,
+            "wait_time_max": 0.0,
+        }
+
+    def open(self) -> None:
+        """
+        Fill pool with 'min_size' connections
+        """
+
+        while self._size < self.min_size:
+            new_connection = self._connect()
+
+            with self._condition:
+                self._size += 1
+                self._idle.append((new_connection, time.monotonic()))
+                self._condition.notify()
+
+    def getconn(self, timeout: Optional[float] = None) -> connection:
+        """
+        Check out connection from pool, waiting for free one if pool is exhausted
+        """
+
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        pooled_connection, last_used = None, None
+
+        with self._condition:
+            while True:
+                if self._idle:
+                    pooled_connection, last_used = self._idle.pop()
+                    break
+
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+
+                remaining = deadline - time.monotonic()
+
+                if remaining <= 0:
+                    self._counters["timeouts"] += 1
+                    raise PoolTimeoutError(
+                        f"No database connection available after {timeout} seconds"
+                    )
+
+                self._condition.wait(remaining)
+
+        try:
+            if pooled_connection is None or not self._is_alive(
+                pooled_connection, last_used
+            ):
+                pooled_connection = self._connect()
+        except psycopg2.Error:
+            self._forget()
+            raise
+
+        waited = time.monotonic() - started
+
+        with self._condition:
+            self._counters["checkouts"] += 1
+            self._counters["wait_time_total"] += waited
+            self._counters["wait_time_max"] = max(
+                self._counters["wait_time_max"], waited
+            )
+
+        return pooled_connection
+
+    def putconn(self, pooled_connection: connection, discard: bool = False) -> None:
+        """
+        Return connection to pool. Broken or discarded connections are closed
+        """
+
+        if not discard and not pooled_connection.closed:
+            try:
+                if (
+                    pooled_connection.get_transaction_status()
+                    != TRANSACTION_STATUS_IDLE
+                ):
+                    pooled_connection.rollback()
+            except psycopg2.Error as error:
+                LOG.debug(f"Discard connection on return. Error: {error}")
+                discard = True
+
+        if discard or pooled_connection.closed:
+            self._close(pooled_connection)
+            self._forget()
+            return
+
+        with self._condition:
+            self._counters["checkins"] += 1
+            self._idle.append((pooled_connection, time.monotonic()))
+            self._condition.notify()
+
+    def close(self) -> None:
+        """
+        Close all idle connections
+        """
+
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+
+        for pooled_connection, _ in idle:
+            self._close(pooled_connection)
+
+    def detach(self) -> None:
+        """
+        Drop idle connections inherited from parent process after fork.
+        Pool lock is not taken, parent may have held it during fork
+        """
+
+        idle, self._idle = self._idle, []
+
+        for pooled_connection, _ in idle:
+            detach_connection(pooled_connection)
+
+    def stats(self) -> Dict:
+        """
+        Pool counters for monitoring
+        """
+
+        with self._condition:
+            return {
+                **self._counters,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+            }
+
+    def _connect(self) -> connection:
+        new_connection = database_connection(self.connection_settings)
+
+        if self.read_only:
+            new_connection.set_session(readonly=True)
+
+        with self._condition:
+            self._counters["connections_created"] += 1
+
+        return new_connection
+
+    def _close(self, pooled_connection: connection) -> None:
+        try:
+            pooled_connection.close()
+        except psycopg2.Error as error:
+            LOG.debug(error)
+
+        with self._condition:
+            self._counters["connections_closed"] += 1
+
+    def _forget(self) -> None:
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    def _is_alive(self, pooled_connection: connection, last_used: float) -> bool:
+        if pooled_connection.closed:
+            return False
+
+        if time.monotonic() - last_used < self.ping_interval:
+            return True
+
+        try:
+            with pooled_connection.cursor() as cursor:
+                cursor.execute("SELECT 1;")
+            pooled_connection.rollback()
+        except psycopg2.Error as error:
+            LOG.debug(f"Connection liveness check failed. Error: {error}")
+            self._close(pooled_connection)
+
+            with self._condition:
+                self._counters["failed_pings"] += 1
+
+            return False
 
-    def __init__(self):
-        self.cursor = self.connection.cursor(cursor_factory=DictCursor)
-        self.sql_queries = {}
+        return True
 
-    def __del__(self):
-        self.close_connection()
+
+class ReplicaSet:
+    """
+    Read-only replicas taken in turn. Replica is skipped while its replication
+    lag exceeds 'max_lag' seconds or it can not be reached, lag is measured at
+    most once per 'lag_check_interval' seconds
+    """
+
+    def __init__(
+        self,
+        pools: List[ConnectionPool],
+        max_lag: float = 5.0,
+        lag_check_interval: float = 1.0,
+    ) -> None:
+        self.pools = pools
+        self.max_lag = max_lag
+        self.lag_check_interval = lag_check_interval
+
+        self._lags: Dict[ConnectionPool, Tuple[Optional[float], float]] = {}
+        self._turns = count()
+
+    def getconn(self) -> Optional[Tuple[ConnectionPool, connection]]:
+        """
+        Check out connection from next replica which is up to date enough.
+        None when no replica can be used right now
+        """
+
+        if not self.pools:
+            return None
+
+        first = next(self._turns)
+
+        for offset in range(len(self.pools)):
+            pool = self.pools[(first + offset) % len(self.pools)]
+            lag, checked_at = self._lags.get(pool, (None, None))
+            measured = (
+                checked_at is not None
+                and time.monotonic() - checked_at < self.lag_check_interval
+            )
+
+            if measured and not self._acceptable(lag):
+                continue
+
+            try:
+                replica_connection = pool.getconn(timeout=0)
+            except (psycopg2.Error, PoolTimeoutError) as error:
+                LOG.debug(f"Replica is not available. Error: {error}")
+                self._lags[pool] = (None, time.monotonic())
+                continue
+
+            if not measured:
+                lag = self._measure_lag(replica_connection)
+                self._lags[pool] = (lag, time.monotonic())
+
+                if not self._acceptable(lag):
+                    pool.putconn(replica_connection)
+                    continue
+
+            return pool, replica_connection
+
+        return None
+
+    def discard(self, pool: ConnectionPool, replica_connection: connection) -> None:
+        """
+        Close broken replica connection and skip replica until next lag check
+        """
+
+        self._lags[pool] = (None, time.monotonic())
+        pool.putconn(replica_connection, discard=True)
+
+    def close(self) -> None:
+        for pool in self.pools:
+            pool.close()
+
+    def stats(self) -> List[Dict]:
+        stats = []
+
+        for pool in self.pools:
+            lag, _ = self._lags.get(pool, (None, None))
+            stats.append(
+                {**pool.stats(), "lag": lag, "available": self._acceptable(lag)}
+            )
+
+        return stats
+
+    def _acceptable(self, lag: Optional[float]) -> bool:
+        return lag is not None and lag <= self.max_lag
+
+    @staticmethod
+    def _measure_lag(replica_connection: connection) -> Optional[float]:
+        statement = PostgreSQLHandler.prepared_statement(
+            "replication", "select_replica_lag"
+        )
+
+        try:
+            with replica_connection.cursor() as cursor:
+                statement.execute(cursor)
+                lag = cursor.fetchone()[0]
+            replica_connection.rollback()
+        except psycopg2.Error as error:
+            LOG.debug(f"Replication lag check failed. Error: {error}")
+            return None
+
+        return None if lag is None else float(lag)
+
+
+class PostgreSQLHandler:
+    _settings: Optional[Dict] = None
+    _pool: Optional[ConnectionPool] = None
+    _replicas: Optional[ReplicaSet] = None
+    _pool_lock = threading.Lock()
+    _local = threading.local()
+    _itersize = DEFAULT_CURSOR_SETTINGS["itersize"]
+    _statement_timeouts = DEFAULT_STATEMENT_TIMEOUT_SETTINGS
+    _cursor_names = count()
+    _row_mappers: Dict[Tuple[str, RowMapping], Callable[[Tuple], Dict]] = {}
+
+    _prepared_statements: Dict[str, PreparedStatement] = {
+        key: PreparedStatement(*key.split("/"), text) for key, text in QUERIES.items()
+    }
 
     def get_query(self, folder: str, query: str):
         """
-        Loading SQL query from directory 'sql/'
+        SQL query from directory 'sql/'
+        """
+
+        return QUERIES.query(folder, query)
+
+    @classmethod
+    def prepared_statement(cls, folder: str, query: str) -> PreparedStatement:
+        key = f"{folder}/{query}"
+
+        if key not in cls._prepared_statements:
+            QUERIES.query(folder, query)
+
+        return cls._prepared_statements[key]
+
+    def execute(self, folder: str, query: str, parameters: Optional[Tuple] = None):
+        """
+        Execute query from directory 'sql/' as server-side prepared statement.
+        Read-only queries go to replica, falling back to primary if replica
+        connection breaks
+        """
+
+        statement = self.prepared_statement(folder, query)
+        timeout = self.statement_timeout(statement.key, statement.query_class)
+
+        if not statement.read_only:
+            self._local.primary_only = True
+        elif (cursor := self.replica_cursor) is not None:
+            try:
+                with self.cancellable(cursor, timeout):
+                    statement.execute(cursor, parameters)
+            except psycopg2.OperationalError as error:
+                LOG.debug(f"Replica query failed, use primary. Error: {error}")
+                self.release_replica(discard=True)
+            else:
+                return cursor
+
+        cursor = self.cursor
+
+        with self.cancellable(cursor, timeout):
+            statement.execute(cursor, parameters)
+
+        return cursor
+
+    def callproc(self, procedure: str, parameters: Optional[Tuple] = None):
+        """
+        Call stored procedure on primary with 'procedure' statement timeout
+        """
+
+        self._local.primary_only = True
+        cursor = self.cursor
+
+        with self.cancellable(cursor, self.statement_timeout(procedure, "procedure")):
+            cursor.callproc(procedure, parameters)
+
+        return cursor
+
+    def execute_values(
+        self, folder: str, query: str, rows: Sequence[Tuple], page_size: int = 1000
+    ) -> List[Tuple]:
+        """
+        Run query from directory 'sql/' with single 'VALUES %s' placeholder
+        on primary, expanded to 'page_size' rows per statement. Returns rows
+        returned by all statements
         """
 
-        if not self.sql_queries.get(query, False):
-            self.sql_queries[query] = load_query(
-                "".join([f"sql/{folder}/", query, ".sql"])
+        self._local.primary_only = True
+        cursor = self.cursor
+        timeout = self.statement_timeout(f"{folder}/{query}", "write")
+
+        with self.cancellable(cursor, timeout):
+            return execute_values(
+                cursor,
+                self.get_query(folder, query),
+                rows,
+                page_size=page_size,
+                fetch=True,
             )
 
-        return self.sql_queries[query]
+    def copy_from(self, folder: str, query: str, source: IO) -> int:
+        """
+        Run 'COPY ... FROM STDIN' query from directory 'sql/' on primary,
+        reading data from file-like 'source'. Returns number of copied rows
+        """
+
+        self._local.primary_only = True
+        cursor = self.cursor
+
+        with self.cancellable(
+            cursor, self.statement_timeout(f"{folder}/{query}", "write")
+        ):
+            cursor.copy_expert(self.get_query(folder, query), source)
+
+        return cursor.rowcount
+
+    @classmethod
+    def statement_timeout(cls, key: str, query_class: str) -> float:
+        """
+        Statement timeout in seconds: budget of current endpoint, else of
+        particular query, else of its class
+        """
+
+        request_timeout = getattr(cls._local, "statement_timeout", None)
+
+        if request_timeout is not None:
+            return request_timeout
+
+        timeouts = cls._statement_timeouts
+
+        return timeouts["queries"].get(key, timeouts[query_class])
+
+    @classmethod
+    def use_endpoint_timeout(cls, endpoint: Optional[str]):
+        """
+        Apply statement timeout budget of endpoint to all queries of request
+        """
+
+        cls.settings()
+        cls._local.statement_timeout = cls._statement_timeouts["endpoints"].get(
+            endpoint
+        )
+
+    @contextmanager
+    def cancellable(self, cursor, timeout: float) -> Iterator[None]:
+        """
+        Run statement under 'timeout' seconds limit. Cancelled statement
+        aborts its transaction and raises 'StatementTimeoutError'
+        """
+
+        set_statement_timeout = self.prepared_statement(
+            "session", "set_statement_timeout"
+        )
+
+        try:
+            if cursor.connection.statement_timeout != timeout:
+                set_statement_timeout.execute(cursor, (f"{int(timeout * 1000)}ms",))
+                cursor.connection.statement_timeout = timeout
+
+            yield
+        except QueryCanceled as error:
+            LOG.debug(f"Statement cancelled after {timeout} seconds. Error: {error}")
+
+            if cursor.connection is getattr(self._local, "connection", None):
+                self.rollback()
+            else:
+                cursor.connection.rollback()
+
+            raise StatementTimeoutError(
+                f"Database query did not finish in {timeout} seconds"
+            ) from None
+
+    def row_mapper(
+        self, folder: str, query: str, cursor, mapping: RowMapping
+    ) -> Callable[[Tuple], Dict]:
+        """
+        Row mapper compiled once per query and mapping, columns of prepared
+        query do not change between executions
+        """
+
+        key = (f"{folder}/{query}", mapping)
+        mapper = self._row_mappers.get(key)
+
+        if mapper is None:
+            mapper = compile_row_mapper(cursor.description, mapping)
+            self._row_mappers[key] = mapper
+
+        return mapper
+
+    def fetch_all(
+        self,
+        folder: str,
+        query: str,
+        parameters: Optional[Tuple] = None,
+        mapping: RowMapping = DEFAULT_ROW_MAPPING,
+    ) -> List[Dict]:
+        cursor = self.execute(folder, query, parameters)
+        rows = cursor.fetchall()
+
+        if not rows:
+            return []
+
+        return list(map(self.row_mapper(folder, query, cursor, mapping), rows))
+
+    def fetch_one(
+        self,
+        folder: str,
+        query: str,
+        parameters: Optional[Tuple] = None,
+        mapping: RowMapping = DEFAULT_ROW_MAPPING,
+    ) -> Optional[Dict]:
+        cursor = self.execute(folder, query, parameters)
+        row = cursor.fetchone()
+
+        if row is None:
+            return None
+
+        return self.row_mapper(folder, query, cursor, mapping)(row)
+
+    def fetch_value(
+        self, folder: str, query: str, parameters: Optional[Tuple] = None
+    ) -> Any:
+        """
+        First column of first row, for example 'exists' check or 'RETURNING id'
+        """
+
+        row = self.execute(folder, query, parameters).fetchone()
+
+        return None if row is None else row[0]
+
+    def stream(
+        self,
+        folder: str,
+        query: str,
+        parameters: Optional[Tuple] = None,
+        mapping: RowMapping = DEFAULT_ROW_MAPPING,
+    ) -> Iterator[Dict]:
+        """
+        Yield rows of query from directory 'sql/' one by one. Rows are read
+        through named server-side cursor, 'itersize' rows per round trip
+        """
+
+        if self.replica_connection is not None:
+            source = self.replica_connection
+        else:
+            source = self.connection
+
+        cursor = source.cursor(name=f"{folder}__{query}__{next(self._cursor_names)}")
+        cursor.itersize = self._itersize
+        timeout = self.statement_timeout(f"{folder}/{query}", "stream")
+
+        try:
+            # Named cursor only declares the query, timeout is set through
+            # plain cursor closed together with the stream
+            with source.cursor() as control, self.cancellable(control, timeout):
+                cursor.execute(self.get_query(folder, query), parameters)
+                rows = iter(cursor)
+                first = next(rows, None)
+
+                if first is None:
+                    return
+
+                map_row = self.row_mapper(folder, query, cursor, mapping)
+                yield map_row(first)
+
+                for row in rows:
+                    yield map_row(row)
+        except GeneratorExit:
+            LOG.debug(f"Stream of '{folder}/{query}' closed before its last row")
+            raise
+        finally:
+            try:
+                cursor.close()
+            except psycopg2.Error as error:
+                LOG.debug(error)
 
     def close_connection(self):
-        self.connection.close()
+        self.release_connection()
+
+    @classmethod
+    def settings(cls) -> Dict:
+        """
+        Connection settings, read from file once on first use
+        """
+
+        if PostgreSQLHandler._settings is None:
+            settings = load_database_connection_settings()
+            cursor_settings = settings_section(settings, "cursor")
+            PostgreSQLHandler._itersize = cursor_settings["itersize"]
+            PostgreSQLHandler._statement_timeouts = settings_section(
+                settings, "statement_timeout"
+            )
+            PostgreSQLHandler._settings = settings
+
+        return PostgreSQLHandler._settings
 
     @classmethod
     def init_connection(cls):
-        cls._connection = database_connection(load_database_connection_settings())
+        """
+        Open connection pools. Called on first database access in every
+        process, so nothing is connected at import time or before fork
+        """
+
+        settings = cls.settings()
+        connection_settings, pool_settings = split_connection_settings(settings)
+        replication = settings_section(settings, "replication")
+        pool = ConnectionPool(connection_settings, **pool_settings)
+        pool.open()
+        PostgreSQLHandler._replicas = ReplicaSet(
+            [
+                ConnectionPool(
+                    replica_connection_settings(connection_settings, replica),
+                    **{**pool_settings, "min_size": 0},
+                    read_only=True,
+                )
+                for replica in replication["replicas"]
+            ],
+            replication["max_lag"],
+            replication["lag_check_interval"],
+        )
+        PostgreSQLHandler._pool = pool
+
+    @classmethod
+    def pool(cls) -> ConnectionPool:
+        if cls._pool is None:
+            with cls._pool_lock:
+                if cls._pool is None:
+                    cls.init_connection()
+
+        return cls._pool
+
+    @classmethod
+    def reset_after_fork(cls):
+        """
+        Forget pools and connections inherited from parent process, child
+        process opens its own ones on first use
+        """
+
+        inherited = [
+            getattr(cls._local, "connection", None),
+            getattr(cls._local, "replica_connection", None),
+        ]
+        pools = [PostgreSQLHandler._pool]
+
+        if PostgreSQLHandler._replicas is not None:
+            pools.extend(PostgreSQLHandler._replicas.pools)
+
+        PostgreSQLHandler._pool = None
+        PostgreSQLHandler._replicas = None
+        PostgreSQLHandler._pool_lock = threading.Lock()
+        PostgreSQLHandler._local = threading.local()
+
+        for inherited_connection in inherited:
+            if inherited_connection is not None:
+                detach_connection(inherited_connection)
+
+        for pool in pools:
+            if pool is not None:
+                pool.detach()
+
+    @classmethod
+    def replicas(cls) -> ReplicaSet:
+        cls.pool()
+
+        return cls._replicas
+
+    @classmethod
+    def pool_stats(cls) -> Dict:
+        """
+        Primary pool counters with counters and lag of every replica
+        """
+
+        return {**cls.pool().stats(), "replicas": cls.replicas().stats()}
+
+    @classmethod
+    def release_replica(cls, discard: bool = False):
+        """
+        Return replica connection checked out by current thread back to its pool
+        """
+
+        checked_out = getattr(cls._local, "replica_connection", None)
+        cls._local.replica_checked = False
+
+        if checked_out is None:
+            return
+
+        pool = cls._local.replica_pool
+        cursor = getattr(cls._local, "replica_cursor", None)
+        cls._local.replica_connection = None
+        cls._local.replica_pool = None
+        cls._local.replica_cursor = None
+
+        if discard:
+            cls.replicas().discard(pool, checked_out)
+            return
+
+        if cursor is not None and not cursor.closed:
+            cursor.close()
+
+        pool.putconn(checked_out)
+
+    @classmethod
+    def release_connection(cls):
+        """
+        Return connections checked out by current thread back to pools
+        """
+
+        cls.release_replica()
+        cls.run_after_commit(committed=False)
+        cls._local.primary_only = False
+        cls._local.statement_timeout = None
+        checked_out = getattr(cls._local, "connection", None)
+
+        if checked_out is None:
+            return
+
+        cursor = getattr(cls._local, "cursor", None)
+
+        if cursor is not None and not cursor.closed:
+            cursor.close()
+
+        cls._local.connection = None
+        cls._local.cursor = None
+        cls._local.depth = 0
+        cls._local.written = False
+        cls._local.failed = False
+        cls.pool().putconn(checked_out)
+
+    @classmethod
+    def begin(cls):
+        """
+        Open unit of work. Model commits are deferred until the outermost
+        unit of work is finished
+        """
+
+        cls._local.depth = getattr(cls._local, "depth", 0) + 1
+
+    @classmethod
+    def finish(cls, commit: bool = True):
+        """
+        Close unit of work. The outermost one commits all deferred writes at
+        once, or rolls them back if 'commit' is False or any statement failed
+        """
+
+        depth = getattr(cls._local, "depth", 0)
+
+        if depth == 0:
+            return
+
+        cls._local.depth = depth - 1
+
+        if not commit:
+            cls._local.failed = True
+
+        if depth > 1:
+            return
+
+        checked_out = getattr(cls._local, "connection", None)
+        written = getattr(cls._local, "written", False)
+        failed = getattr(cls._local, "failed", False)
+
+        cls._local.written = False
+        cls._local.failed = False
+
+        if checked_out is None or checked_out.closed:
+            cls.run_after_commit(committed=False)
+            return
+
+        if written and not failed:
+            checked_out.commit()
+            cls.run_after_commit(committed=True)
+        else:
+            cls.run_after_commit(committed=False)
+
+            if checked_out.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                checked_out.rollback()
+
+    def after_commit(self, callback: Callable, *args: Any):
+        """
+        Call 'callback(*args)' once current transaction is committed.
+        It is not called if the transaction is rolled back
+        """
+
+        callbacks = getattr(self._local, "after_commit", None)
+
+        if callbacks is None:
+            callbacks = self._local.after_commit = []
+
+        callbacks.append((callback, args))
+
+    @classmethod
+    def run_after_commit(cls, committed: bool):
+        callbacks = getattr(cls._local, "after_commit", None) or []
+        cls._local.after_commit = []
+
+        if not committed:
+            return
+
+        for callback, args in callbacks:
+            try:
+                callback(*args)
+            except Exception:
+                LOG.exception(f"After commit callback {callback} failed")
+
+    def commit(self):
+        """
+        Commit current transaction unless it is part of unit of work
+        """
+
+        if getattr(self._local, "depth", 0):
+            self._local.written = True
+            return
+
+        self.connection.commit()
+        self.run_after_commit(committed=True)
+
+    def rollback(self):
+        """
+        Roll back current transaction. Inside unit of work the whole unit is
+        rolled back, so it is marked as failed
+        """
+
+        if getattr(self._local, "depth", 0):
+            self._local.failed = True
+        else:
+            self.run_after_commit(committed=False)
+
+        self.connection.rollback()
 
     @property
     def connection(self):
-        if self._connection is None:
-            self.init_connection()
+        checked_out = getattr(self._local, "connection", None)
+
+        if checked_out is None:
+            checked_out = self.pool().getconn()
+            self._local.connection = checked_out
+
+        return checked_out
+
+    @property
+    def cursor(self):
+        cursor = getattr(self._local, "cursor", None)
+
+        if cursor is None or cursor.closed:
+            cursor = self.connection.cursor()
+            self._local.cursor = cursor
+
+        return cursor
+
+    @property
+    def replica_connection(self):
+        """
+        Replica connection of current thread. None once anything was written
+        by current thread, so it reads its own writes, or if no replica is
+        available
+        """
+
+        if getattr(self._local, "primary_only", False):
+            return None
+
+        checked_out = getattr(self._local, "replica_connection", None)
+
+        if checked_out is None and not getattr(self._local, "replica_checked", False):
+            self._local.replica_checked = True
+
+            if (replica := self.replicas().getconn()) is not None:
+                self._local.replica_pool, checked_out = replica
+                self._local.replica_connection = checked_out
+
+        return checked_out
+
+    @property
+    def replica_cursor(self):
+        if (replica_connection := self.replica_connection) is None:
+            return None
+
+        cursor = getattr(self._local, "replica_cursor", None)
+
+        if cursor is None or cursor.closed:
+            cursor = replica_connection.cursor()
+            self._local.replica_cursor = cursor
+
+        return cursor
+
+
+@contextmanager
+def transaction() -> Iterator[None]:
+    """
+    Group model calls into single transaction, committed once on exit.
+    Any exception, including 'HTTPException', rolls the transaction back
+    """
+
+    PostgreSQLHandler.begin()
+
+    try:
+        yield
+    except BaseException:
+        PostgreSQLHandler.finish(commit=False)
+        raise
+    else:
+        PostgreSQLHandler.finish()
+
 
-        return self._connection
+os.register_at_fork(after_in_child=PostgreSQLHandler.reset_after_fork)
@@ -0,0 +1,130 @@
+import ast
+import os
+from types import MappingProxyType
+from typing import Iterable, Iterator, Mapping, Tuple
+
+SQL_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sql"
+)
+MODELS_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+QUERY_METHODS = (
+    "execute",
+    "fetch",
+    "fetchrow",
+    "fetchval",
+    "fetch_all",
+    "fetch_one",
+    "fetch_value",
+    "stream",
+    "copy_from",
+    "execute_values",
+    "get_query",
+)
+
+
+class MissingQueryError(LookupError):
+    """
+    Referenced SQL query does not exist in directory 'sql/'
+    """
+
+
+def load_query(filename: str):
+    """
+    Load SQL query from files as text
+    """
+
+    with open(filename, "r") as sql_query:
+        return sql_query.read()
+
+
+class QueryRegistry(Mapping):
+    """
+    Immutable registry of all SQL queries from directory 'sql/'.
+    Every query is keyed as 'folder/name'
+    """
+
+    def __init__(self, directory: str = SQL_DIRECTORY) -> None:
+        queries = {}
+
+        for folder in sorted(os.listdir(directory)):
+            folder_path = os.path.join(directory, folder)
+
+            if not os.path.isdir(folder_path):
+                continue
+
+            for filename in sorted(os.listdir(folder_path)):
+                name, extension = os.path.splitext(filename)
+
+                if extension == ".sql":
+                    queries[f"{folder}/{name}"] = load_query(
+                        os.path.join(folder_path, filename)
+                    )
+
+        self._queries = MappingProxyType(queries)
+
+    def __getitem__(self, key: str) -> str:
+        try:
+            return self._queries[key]
+        except KeyError:
+            raise MissingQueryError(f"SQL query '{key}' does not exist") from None
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._queries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._queries)
+
+    def __len__(self) -> int:
+        return len(self._queries)
+
+    def query(self, folder: str, query: str) -> str:
+        return self[f"{folder}/{query}"]
+
+    def check_references(self, references: Iterable[Tuple[str, str, str]]) -> None:
+        """
+        Raise 'MissingQueryError' listing every reference to unknown query
+        """
+
+        missing = [
+            f"'{folder}/{query}' ({location})"
+            for folder, query, location in references
+            if f"{folder}/{query}" not in self._queries
+        ]
+
+        if missing:
+            raise MissingQueryError(
+                "Referenced SQL queries do not exist: " + ", ".join(missing)
+            )
+
+
+def find_query_references(directory: str = MODELS_DIRECTORY) -> Iterator[Tuple]:
+    """
+    Find all 'self.execute("folder", "query", ...)' like calls in model modules
+    """
+
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(".py"):
+            continue
+
+        path = os.path.join(directory, filename)
+
+        with open(path, "r") as source:
+            tree = ast.parse(source.read(), filename=path)
+
+        for node in ast.walk(tree):
+            if (
+                isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Attribute)
+                and node.func.attr in QUERY_METHODS
+                and len(node.args) >= 2
+                and all(
+                    isinstance(argument, ast.Constant)
+                    and isinstance(argument.value, str)
+                    for argument in node.args[:2]
+                )
+            ):
+                folder, query = (argument.value for argument in node.args[:2])
+                yield folder, query, f"{filename}:{node.lineno}"
+
+
+QUERIES = QueryRegistry()
@@ -0,0 +1,88 @@
+import logging
+import threading
+from typing import Callable, Collection, List, NamedTuple, Optional
+
+LOG = logging.getLogger(__name__)
+
+# Tables which grant policies to users
+RBAC_TABLES = frozenset(
+    (
+        "user",
+        "group",
+        "role",
+        "policy",
+        "user_role",
+        "user_group",
+        "group_role",
+        "role_policy",
+    )
+)
+
+# Table name of change after which nothing cached can be trusted
+ANY_TABLE = "*"
+
+
+class RBACChange(NamedTuple):
+    """
+    Committed change of tables which grant policies to users, or of
+    organisation tables. 'user_id' is set when only rows of that user
+    are affected
+    """
+
+    table: str
+    user_id: Optional[int] = None
+
+    @property
+    def grants(self) -> bool:
+        """
+        Change may affect policies granted to users
+        """
+
+        return self.table in RBAC_TABLES or self.table == ANY_TABLE
+
+
+# Changes of more users are published as one change of the whole table
+MAX_USER_CHANGES = 100
+
+
+def user_changes(table: str, user_ids: Collection[int]) -> List[RBACChange]:
+    """
+    Changes of rows of given users, or single change of whole table when
+    there are too many users to invalidate them one by one
+    """
+
+    if len(user_ids) > MAX_USER_CHANGES:
+        return [RBACChange(table)]
+
+    return [RBACChange(table, user_id) for user_id in user_ids]
+
+
+_subscribers: List[Callable[[RBACChange], None]] = []
+_subscribers_lock = threading.Lock()
+
+
+def subscribe(callback: Callable[[RBACChange], None]) -> None:
+    with _subscribers_lock:
+        _subscribers.append(callback)
+
+
+def unsubscribe(callback: Callable[[RBACChange], None]) -> None:
+    with _subscribers_lock:
+        if callback in _subscribers:
+            _subscribers.remove(callback)
+
+
+def publish(change: RBACChange) -> None:
+    """
+    Deliver change to every subscriber. Failing subscriber does not stop
+    delivery to the others
+    """
+
+    with _subscribers_lock:
+        subscribers = list(_subscribers)
+
+    for callback in subscribers:
+        try:
+            callback(change)
+        except Exception:
+            LOG.exception(f"RBAC change subscriber failed on {change}")
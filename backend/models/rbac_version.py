@@ -0,0 +1,20 @@
+from typing import Tuple
+
+from .postgresql_handler import PostgreSQLHandler
+
+
+class RBACVersionModel(PostgreSQLHandler):
+    def select_versions(self, user_id: int) -> Tuple[int, int]:
+        """
+        Global and per-user versions of policy grants. Triggers on RBAC tables
+        bump them on every change
+        """
+
+        global_version, user_version = self.execute(
+            "rbac_version", "select_rbac_versions", (user_id,)
+        ).fetchone()
+
+        return global_version, user_version
+
+
+rbac_versions = RBACVersionModel()
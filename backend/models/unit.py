@@ -4,46 +4,41 @@ from typing import Dict, List, Optional, Tuple, Union
 from enums import TransactionResult
 from psycopg2 import Error
 
-from .postgresql_handler import PostgreSQLHandler, convert_row_to_dictionary
+from .postgresql_handler import PostgreSQLHandler
 
 LOG = logging.getLogger(__name__)
 
 
 class UnitModel(PostgreSQLHandler):
     def select_units(self) -> List[Dict]:
-        self.cursor.execute(self.get_query("unit", "select_units"))
-        units = self.cursor.fetchall()
-
-        return convert_row_to_dictionary(units)
+        return self.fetch_all("unit", "select_units")
 
     def select_department_units(self, department_id: int) -> List[Dict]:
-        self.cursor.execute(
-            self.get_query("unit", "select_department_units"), (department_id,)
-        )
-        units = self.cursor.fetchall()
-
-        return convert_row_to_dictionary(units)
+        return self.fetch_all("unit", "select_department_units", (department_id,))
 
     def select_single_unit(self, identifier: int) -> Optional[Dict]:
-        self.cursor.execute(self.get_query("unit", "select_unit_by_id"), (identifier,))
-        unit = self.cursor.fetchone()
+        return self.fetch_one("unit", "select_unit_by_id", (identifier,))
 
-        if unit is not None:
-            return dict(unit)
+    def select_unit_department(self, identifier: int) -> Optional[int]:
+        """
+        Department of unit, the row is locked against concurrent moves until
+        end of transaction
+        """
 
-        return None
+        return self.fetch_value("unit", "select_unit_department", (identifier,))
 
     def delete_unit(self, identifier: int) -> bool:
-        self.cursor.execute(self.get_query("unit", "delete_unit"), (identifier,))
-        self.connection.commit()
+        self.execute("unit", "delete_unit", (identifier,))
+        self.commit()
 
         return bool(self.cursor.rowcount)
 
     def insert_unit(self, unit: Dict) -> Union[int, TransactionResult]:
         if not self.unit_exists(unit["name"]):
             try:
-                self.cursor.execute(
-                    self.get_query("unit", "insert_unit"),
+                self.execute(
+                    "unit",
+                    "insert_unit",
                     (
                         unit["name"],
                         unit["description"],
@@ -54,18 +49,19 @@ class UnitModel(PostgreSQLHandler):
             except Error as error:
                 LOG.debug(error)
 
-                self.connection.rollback()
+                self.rollback()
                 return TransactionResult.ERROR
             else:
-                self.connection.commit()
+                self.commit()
                 return self.cursor.fetchone()[0]
 
         return TransactionResult.SUCCESS
 
     def update_unit(self, unit_id: int, unit: Dict) -> Optional[bool]:
         try:
-            self.cursor.execute(
-                self.get_query("unit", "update_unit"),
+            self.execute(
+                "unit",
+                "update_unit",
                 (
                     unit.get("name", None),
                     unit.get("description", None),
@@ -76,14 +72,13 @@ class UnitModel(PostgreSQLHandler):
             )
         except Error as error:
             LOG.debug(error)
-            self.connection.rollback()
+            self.rollback()
         else:
-            self.connection.commit()
+            self.commit()
             return bool(self.cursor.rowcount)
 
     def unit_exists(self, name: str) -> bool:
-        self.cursor.execute(self.get_query("unit", "unit_exists"), (name,))
-        return self.cursor.fetchall()[0][0]
+        return self.fetch_value("unit", "unit_exists", (name,))
 
 
 units = UnitModel()
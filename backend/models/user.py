@@ -1,24 +1,32 @@
+import csv
+import io
 import logging
-from typing import Dict, List, Optional, Tuple, Union
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 from enums import TransactionResult
 from psycopg2 import Error
 
-from .postgresql_handler import PostgreSQLHandler
+from .postgresql_handler import REGISTER_DATE_MAPPING, PostgreSQLHandler, RowMapping
+from .rbac_events import RBACChange, publish, user_changes
 
 LOG = logging.getLogger(__name__)
 
+PROFILE_MAPPING = RowMapping(
+    exclude=("password", "id"), converters=(("register_date", str),)
+)
+
 
 class UserModel(PostgreSQLHandler):
     def user_exist(self, email: str) -> bool:
-        self.cursor.execute(self.get_query("user", "user_exists"), (email,))
-        return self.cursor.fetchall()[0][0]
+        return self.fetch_value("user", "user_exists", (email,))
 
     def insert_user(self, user: Dict) -> Union[int, TransactionResult]:
         if not self.user_exist(user["email"]):
             try:
-                self.cursor.execute(
-                    self.get_query("user", "insert_user"),
+                self.execute(
+                    "user",
+                    "insert_user",
                     (
                         user["first_name"],
                         user["last_name"],
@@ -30,42 +38,100 @@ class UserModel(PostgreSQLHandler):
             except Error as error:
                 LOG.debug(error)
 
-                self.connection.rollback()
+                self.rollback()
                 return TransactionResult.ERROR
             else:
-                self.connection.commit()
+                self.commit()
                 return self.cursor.fetchone()[0]
 
         return TransactionResult.SUCCESS
 
-    def select_user(self, email: str) -> Dict:
-        self.cursor.execute(self.get_query("user", "select_user"), (email,))
-        user = dict(self.cursor.fetchone())
-        user.pop("password", None)
-        user.pop("id", None)
-
-        return user
-
-    def select_users(self) -> List[Dict]:
-        self.cursor.execute(self.get_query("user", "select_users"))
-        users = self.cursor.fetchall()
-
-        for index, user in enumerate(users):
-            users[index] = dict(user)
-            users[index]["register_date"] = str(users[index]["register_date"])
+    def select_user(self, email: str) -> Optional[Dict]:
+        return self.fetch_one("user", "select_user", (email,), PROFILE_MAPPING)
+
+    def select_users(self) -> Iterator[Dict]:
+        return self.stream("user", "select_users", mapping=REGISTER_DATE_MAPPING)
+
+    def select_users_page(
+        self,
+        after: int,
+        limit: int,
+        department_id: Optional[int] = None,
+        unit_id: Optional[int] = None,
+        position_id: Optional[int] = None,
+        registered_from: Optional[date] = None,
+        registered_to: Optional[date] = None,
+    ) -> List[Dict]:
+        """
+        Users with identifier greater than 'after' matching all given filters,
+        ordered by identifier. Password hashes are not selected
+        """
+
+        return self.fetch_all(
+            "user",
+            "select_users_page",
+            (
+                after,
+                department_id,
+                department_id,
+                unit_id,
+                unit_id,
+                position_id,
+                position_id,
+                registered_from,
+                registered_from,
+                registered_to,
+                registered_to,
+                limit,
+            ),
+            REGISTER_DATE_MAPPING,
+        )
 
-        return users
+    def stream_users(
+        self,
+        department_id: Optional[int] = None,
+        unit_id: Optional[int] = None,
+        position_id: Optional[int] = None,
+        registered_from: Optional[date] = None,
+        registered_to: Optional[date] = None,
+    ) -> Iterator[Dict]:
+        """
+        All users matching given filters, read through server-side cursor.
+        Same query as pages, NULL limit means no limit
+        """
+
+        return self.stream(
+            "user",
+            "select_users_page",
+            (
+                0,
+                department_id,
+                department_id,
+                unit_id,
+                unit_id,
+                position_id,
+                position_id,
+                registered_from,
+                registered_from,
+                registered_to,
+                registered_to,
+                None,
+            ),
+            REGISTER_DATE_MAPPING,
+        )
 
     def delete_user(self, email: str) -> bool:
-        self.cursor.execute(self.get_query("user", "delete_user"), (email,))
-        self.connection.commit()
+        self.execute("user", "delete_user", (email,))
+        self.after_commit(publish, RBACChange("user"))
+        self.commit()
 
         return bool(self.cursor.rowcount)
 
     def update_user(self, user: Dict) -> Optional[bool]:
         try:
-            self.cursor.execute(
-                self.get_query("user", "update_user"),
+            self.execute(
+                "user",
+                "update_user",
                 (
                     user.get("first_name", None),
                     user.get("last_name", None),
@@ -78,104 +144,192 @@ class UserModel(PostgreSQLHandler):
             )
         except Error as error:
             LOG.debug(error)
-            self.connection.rollback()
+            self.rollback()
         else:
-            self.connection.commit()
+            self.commit()
             return bool(self.cursor.rowcount)
 
-    def find_user_by_email(self, email: str) -> Optional[Tuple[int, str]]:
-        self.cursor.execute(self.get_query("user", "select_user"), (email,))
-        response = self.cursor.fetchone()
+    def import_users(
+        self, rows: List[Tuple], role_ids: List[int], group_ids: List[int]
+    ) -> Optional[List[Tuple[int, str, Optional[int]]]]:
+        """
+        Copy rows of (line, first_name, last_name, middle_name, email,
+        password hash) into staging table and merge them into users at once.
+        New users get all 'role_ids' and 'group_ids'. Returns (line, email,
+        id) of every row, id is None when email is already taken
+        """
 
-        if response is None:
-            return response
+        data = io.StringIO()
+        csv.writer(data).writerows(rows)
+        data.seek(0)
 
-        return response[0], response["password"]
+        try:
+            self.execute("user_import", "create_user_import")
+            self.copy_from("user_import", "copy_user_import", data)
+            merged = self.execute("user_import", "merge_user_import").fetchall()
+            user_ids = [user_id for _, _, user_id in merged if user_id is not None]
+
+            if user_ids and role_ids:
+                self.execute_values(
+                    "user_role",
+                    "insert_user_roles",
+                    [
+                        (user_id, role_id)
+                        for user_id in user_ids
+                        for role_id in role_ids
+                    ],
+                )
+                self.after_commit(publish, RBACChange("user_role"))
+
+            if user_ids and group_ids:
+                self.execute_values(
+                    "user_group",
+                    "insert_user_groups",
+                    [
+                        (user_id, group_id)
+                        for user_id in user_ids
+                        for group_id in group_ids
+                    ],
+                )
+                self.after_commit(publish, RBACChange("user_group"))
+        except Error as error:
+            LOG.debug(error)
+            self.rollback()
+        else:
+            self.commit()
+            return merged
+
+    def find_user_by_email(self, email: str) -> Optional[Tuple[int, str]]:
+        return self.execute("user", "select_user_credentials", (email,)).fetchone()
 
     def insert_user_role(self, user_id: int, role_id: int) -> Optional[int]:
         try:
-            self.cursor.execute(
-                self.get_query("user_role", "insert_user_role"),
+            self.execute(
+                "user_role",
+                "insert_user_role",
                 (user_id, role_id),
             )
         except Error as error:
             LOG.debug(error)
-            self.connection.rollback()
+            self.rollback()
         else:
-            self.connection.commit()
+            self.after_commit(publish, RBACChange("user_role", user_id))
+            self.commit()
             return self.cursor.fetchone()[0]
 
     def delete_user_role(self, user_id: int, role_id: int) -> Optional[bool]:
         try:
-            self.cursor.execute(
-                self.get_query("user_role", "delete_user_role"), (user_id, role_id)
-            )
+            self.execute("user_role", "delete_user_role", (user_id, role_id))
         except Error as error:
             LOG.debug(error)
-            self.connection.rollback()
+            self.rollback()
         else:
-            self.connection.commit()
+            self.after_commit(publish, RBACChange("user_role", user_id))
+            self.commit()
             return bool(self.cursor.rowcount)
 
-    def select_user_roles(self, user_id: int) -> List[Dict]:
-        self.cursor.execute(
-            self.get_query("user_role", "select_user_roles"), (user_id,)
-        )
-        roles = self.cursor.fetchall()
+    def insert_user_roles(
+        self, pairs: List[Tuple[int, int]]
+    ) -> Optional[List[Tuple[int, int]]]:
+        """
+        Add all (user_id, role_id) pairs in one transaction.
+        Returns pairs which did not exist before
+        """
+
+        return self.write_pairs("user_role", "insert_user_roles", pairs)
 
-        for index, role in enumerate(roles):
-            roles[index] = dict(role)
-            roles[index]["register_date"] = str(roles[index]["register_date"])
+    def delete_user_roles(
+        self, pairs: List[Tuple[int, int]]
+    ) -> Optional[List[Tuple[int, int]]]:
+        """
+        Remove all (user_id, role_id) pairs in one transaction.
+        Returns pairs which existed
+        """
 
-        return roles
+        return self.write_pairs("user_role", "delete_user_roles", pairs)
+
+    def select_user_roles(self, user_id: int) -> List[Dict]:
+        return self.fetch_all(
+            "user_role", "select_user_roles", (user_id,), REGISTER_DATE_MAPPING
+        )
 
     def insert_user_group(self, user_id: int, group_id: int) -> Optional[int]:
         try:
-            self.cursor.execute(
-                self.get_query("user_group", "insert_user_group"),
+            self.execute(
+                "user_group",
+                "insert_user_group",
                 (group_id, user_id),
             )
         except Error as error:
             LOG.debug(error)
-            self.connection.rollback()
+            self.rollback()
         else:
-            self.connection.commit()
+            self.after_commit(publish, RBACChange("user_group", user_id))
+            self.commit()
             return self.cursor.fetchone()[0]
 
     def delete_user_group(self, user_id: int, group_id: int) -> Optional[bool]:
         try:
-            self.cursor.execute(
-                self.get_query("user_group", "delete_user_group"), (user_id, group_id)
-            )
+            self.execute("user_group", "delete_user_group", (user_id, group_id))
         except Error as error:
             LOG.debug(error)
-            self.connection.rollback()
+            self.rollback()
         else:
-            self.connection.commit()
+            self.after_commit(publish, RBACChange("user_group", user_id))
+            self.commit()
             return bool(self.cursor.rowcount)
 
-    def select_user_groups(self, user_id: int) -> List[Dict]:
-        self.cursor.execute(
-            self.get_query("user_group", "select_user_groups"), (user_id,)
-        )
-        groups = self.cursor.fetchall()
+    def insert_user_groups(
+        self, pairs: List[Tuple[int, int]]
+    ) -> Optional[List[Tuple[int, int]]]:
+        """
+        Add all (user_id, group_id) pairs in one transaction.
+        Returns pairs which did not exist before
+        """
+
+        return self.write_pairs("user_group", "insert_user_groups", pairs)
+
+    def delete_user_groups(
+        self, pairs: List[Tuple[int, int]]
+    ) -> Optional[List[Tuple[int, int]]]:
+        """
+        Remove all (user_id, group_id) pairs in one transaction.
+        Returns pairs which existed
+        """
+
+        return self.write_pairs("user_group", "delete_user_groups", pairs)
+
+    def write_pairs(
+        self, folder: str, query: str, pairs: List[Tuple[int, int]]
+    ) -> Optional[List[Tuple[int, int]]]:
+        try:
+            written = self.execute_values(folder, query, pairs)
+        except Error as error:
+            LOG.debug(error)
+            self.rollback()
+        else:
+            for change in user_changes(folder, {user_id for user_id, _ in written}):
+                self.after_commit(publish, change)
 
-        for index, role in enumerate(groups):
-            groups[index] = dict(role)
-            groups[index]["register_date"] = str(groups[index]["register_date"])
+            self.commit()
+            return [tuple(pair) for pair in written]
 
-        return groups
+    def select_user_groups(self, user_id: int) -> List[Dict]:
+        return self.fetch_all(
+            "user_group", "select_user_groups", (user_id,), REGISTER_DATE_MAPPING
+        )
 
     def select_user_policies(self, user_id: int) -> List[Dict]:
-        self.cursor.execute(
-            self.get_query("user", "select_user_policies"), (user_id, user_id)
-        )
-        policies = self.cursor.fetchall()
+        return self.fetch_all("user", "select_user_policies", (user_id,))
+
+    def select_user_policy_departments(self, user_id: int) -> List[Tuple[str, int]]:
+        """
+        Pairs of policy title and department the policy is granted in
+        """
 
-        for index, policy in enumerate(policies):
-            policies[index] = dict(policy)
+        cursor = self.execute("user", "select_user_policy_departments", (user_id,))
 
-        return policies
+        return cursor.fetchall()
 
 
 users = UserModel()
@@ -0,0 +1,66 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence
+
+from config import CONFIG
+from werkzeug.security import generate_password_hash
+
+# Passwords sent to a worker process at once
+HASHES_PER_TASK = 16
+
+
+class PasswordHasher:
+    """
+    Hashes batches of passwords in a pool of worker processes, so that
+    bulk operations use every core and do not hold the GIL of request
+    threads. The pool is started on first use in each process, with
+    zero 'processes' passwords are hashed on the calling thread.
+
+    Workers are spawned, not forked: the pool is started from a request
+    thread of a multithreaded server worker, and forked children would
+    inherit its locks and database connections
+    """
+
+    def __init__(self, processes: int) -> None:
+        self.processes = processes
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def hash_passwords(self, passwords: Sequence[str]) -> List[str]:
+        if self.processes <= 0 or len(passwords) <= 1:
+            return [generate_password_hash(password) for password in passwords]
+
+        return list(
+            self._pool().map(
+                generate_password_hash, passwords, chunksize=HASHES_PER_TASK
+            )
+        )
+
+    def reset_after_fork(self) -> None:
+        """
+        Forget pool of parent process, child starts its own on first use
+        """
+
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                self._pid = os.getpid()
+
+            return self._executor
+
+
+password_hasher = PasswordHasher(CONFIG.PASSWORD_HASHING_PROCESSES)
+
+os.register_at_fork(after_in_child=password_hasher.reset_after_fork)
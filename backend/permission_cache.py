@@ -0,0 +1,364 @@
+import json
+import logging
+import threading
+import time
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from config import CONFIG
+from models.rbac_events import RBACChange, subscribe
+
+try:
+    from redis import Redis, RedisError
+except ImportError:
+    # Needed only by shared permission cache backend
+    Redis = None
+    RedisError = Exception
+
+LOG = logging.getLogger(__name__)
+
+Versions = Tuple[int, int]
+Policies = Dict[str, FrozenSet[int]]
+
+# Write entry only if generations did not change since policies were loaded
+COMPARE_AND_SET = """
+local generation = tonumber(redis.call('GET', KEYS[1]) or '0')
+local user_generation = tonumber(redis.call('GET', KEYS[2]) or '0')
+
+if generation ~= tonumber(ARGV[1]) or user_generation ~= tonumber(ARGV[2]) then
+    return 0
+end
+
+redis.call('SET', KEYS[3], ARGV[3], 'PX', ARGV[4])
+return 1
+"""
+
+
+class PermissionCache:
+    """
+    In-process cache of effective policies per user, as departments in
+    which every policy title is granted.
+    Entries expire after 'ttl' seconds and are dropped on every committed
+    change of user, group, role or policy grants. Entry loaded at older RBAC
+    versions is not served, so changes made by other processes are noticed
+    """
+
+    def __init__(self, ttl: float = 60.0, max_size: int = 10000) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+
+        self._entries: Dict[int, Tuple[Policies, float, Versions]] = {}
+        self._generation = 0
+        self._user_generations: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "expirations": 0,
+            "outdated": 0,
+            "invalidations": 0,
+            "stale_writes": 0,
+        }
+
+    def get(
+        self, user_id: int, versions: Optional[Versions] = None
+    ) -> Optional[Policies]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+
+            if entry is not None and entry[1] <= time.monotonic():
+                del self._entries[user_id]
+                self._counters["expirations"] += 1
+                entry = None
+
+            if entry is not None and versions is not None and entry[2] != versions:
+                del self._entries[user_id]
+                self._counters["outdated"] += 1
+                entry = None
+
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+
+            self._counters["hits"] += 1
+            return entry[0]
+
+    def generation(self, user_id: int) -> Tuple[int, int]:
+        """
+        Version of cached data, take it before loading policies from database
+        and pass it to 'put'
+        """
+
+        with self._lock:
+            return self._generation, self._user_generations.get(user_id, 0)
+
+    def put(
+        self,
+        user_id: int,
+        policies: Policies,
+        generation: Tuple[int, int],
+        versions: Optional[Versions] = None,
+    ) -> None:
+        """
+        Cache policies unless they were invalidated while being loaded
+        """
+
+        with self._lock:
+            if generation != (
+                self._generation,
+                self._user_generations.get(user_id, 0),
+            ):
+                self._counters["stale_writes"] += 1
+                return
+
+            if user_id not in self._entries and len(self._entries) >= self.max_size:
+                del self._entries[next(iter(self._entries))]
+
+            self._entries[user_id] = (policies, time.monotonic() + self.ttl, versions)
+
+    def invalidate(self, user_id: Optional[int] = None) -> None:
+        """
+        Drop policies of one user, or of all users if 'user_id' is None
+        """
+
+        with self._lock:
+            self._counters["invalidations"] += 1
+
+            if user_id is None:
+                self._generation += 1
+                self._entries.clear()
+            else:
+                # Identifiers from query string arrive as strings
+                user_id = int(user_id)
+                self._user_generations[user_id] = (
+                    self._user_generations.get(user_id, 0) + 1
+                )
+                self._entries.pop(user_id, None)
+
+    def handle_change(self, change: RBACChange) -> None:
+        if change.grants:
+            self.invalidate(change.user_id)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                **self._counters,
+                "size": len(self._entries),
+                "ttl": self.ttl,
+                "max_size": self.max_size,
+                "backend": "local",
+            }
+
+
+class SharedPermissionCache:
+    """
+    Permission cache kept in Redis or Redis-compatible server, shared by
+    all worker processes using it, so policies of user are loaded once per
+    host or cluster instead of once per worker.
+    Every entry stores generations it was loaded at. Generations are plain
+    counters bumped on invalidation, entry is written by atomic
+    compare-and-set script and served only while generations still match
+    """
+
+    def __init__(self, client, ttl: float = 60.0, prefix: str = "permissions") -> None:
+        self.ttl = ttl
+        self.prefix = prefix
+
+        self._client = client
+        self._compare_and_set = client.register_script(COMPARE_AND_SET)
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "outdated": 0,
+            "invalidations": 0,
+            "stale_writes": 0,
+            "errors": 0,
+        }
+
+    def get(
+        self, user_id: int, versions: Optional[Versions] = None
+    ) -> Optional[Policies]:
+        try:
+            entry, *generation = self._client.mget(
+                self._entry_key(user_id), *self._generation_keys(user_id)
+            )
+        except RedisError as error:
+            self._count("errors", error)
+            return None
+
+        if entry is None:
+            self._count("misses")
+            return None
+
+        entry = json.loads(entry)
+
+        if entry["generation"] != [int(value or 0) for value in generation] or (
+            versions is not None and entry["versions"] != list(versions)
+        ):
+            self._count("outdated")
+            self._count("misses")
+            return None
+
+        self._count("hits")
+        return {
+            title: frozenset(department_ids)
+            for title, department_ids in entry["policies"].items()
+        }
+
+    def generation(self, user_id: int) -> Tuple[int, int]:
+        """
+        Version of cached data, take it before loading policies from database
+        and pass it to 'put'
+        """
+
+        try:
+            generation, user_generation = self._client.mget(
+                *self._generation_keys(user_id)
+            )
+        except RedisError as error:
+            self._count("errors", error)
+            # Negative generation never matches, so 'put' is skipped
+            return -1, -1
+
+        return int(generation or 0), int(user_generation or 0)
+
+    def put(
+        self,
+        user_id: int,
+        policies: Policies,
+        generation: Tuple[int, int],
+        versions: Optional[Versions] = None,
+    ) -> None:
+        """
+        Cache policies unless they were invalidated while being loaded
+        """
+
+        entry = json.dumps(
+            {
+                "policies": {
+                    title: sorted(department_ids)
+                    for title, department_ids in policies.items()
+                },
+                "versions": versions and list(versions),
+                "generation": list(generation),
+            }
+        )
+
+        try:
+            written = self._compare_and_set(
+                keys=[*self._generation_keys(user_id), self._entry_key(user_id)],
+                args=[*generation, entry, int(self.ttl * 1000)],
+            )
+        except RedisError as error:
+            self._count("errors", error)
+            return
+
+        if not written:
+            self._count("stale_writes")
+
+    def invalidate(self, user_id: Optional[int] = None) -> None:
+        """
+        Drop policies of one user, or of all users if 'user_id' is None
+        """
+
+        if user_id is not None:
+            # Identifiers from query string arrive as strings
+            user_id = int(user_id)
+
+        try:
+            if user_id is None:
+                self._client.incr(self._key("generation"))
+            else:
+                pipeline = self._client.pipeline()
+                pipeline.incr(self._key("generation", user_id))
+                pipeline.delete(self._entry_key(user_id))
+                pipeline.execute()
+        except RedisError as error:
+            # Entries of outdated RBAC versions are still not served
+            self._count("errors", error)
+        else:
+            self._count("invalidations")
+
+    def handle_change(self, change: RBACChange) -> None:
+        if change.grants:
+            self.invalidate(change.user_id)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self._counters, "ttl": self.ttl, "backend": "shared"}
+
+    def _key(self, *parts) -> str:
+        return ":".join((self.prefix, *map(str, parts)))
+
+    def _entry_key(self, user_id: int) -> str:
+        return self._key("entry", user_id)
+
+    def _generation_keys(self, user_id: int) -> Tuple[str, str]:
+        return self._key("generation"), self._key("generation", user_id)
+
+    def _count(self, counter: str, error: Optional[Exception] = None) -> None:
+        if error is not None:
+            LOG.warning(f"Shared permission cache failed. Error: {error}")
+
+        with self._lock:
+            self._counters[counter] += 1
+
+
+class VersionCache:
+    """
+    Recently read RBAC versions per user. Short 'ttl' bounds how long
+    changes committed by other processes stay unnoticed, changes of this
+    process drop entries at once
+    """
+
+    def __init__(self, ttl: float = 1.0) -> None:
+        self.ttl = ttl
+
+        self._entries: Dict[int, Tuple[Versions, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[Versions]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+
+            if entry is None or entry[1] <= time.monotonic():
+                return None
+
+            return entry[0]
+
+    def put(self, user_id: int, versions: Versions) -> None:
+        with self._lock:
+            self._entries[user_id] = (versions, time.monotonic() + self.ttl)
+
+    def handle_change(self, change: RBACChange) -> None:
+        if not change.grants:
+            return
+
+        with self._lock:
+            if change.user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(int(change.user_id), None)
+
+
+def create_permission_cache():
+    """
+    Permission cache of backend chosen by 'PERMISSION_CACHE_BACKEND'
+    """
+
+    if CONFIG.PERMISSION_CACHE_BACKEND == "shared":
+        if Redis is None:
+            raise RuntimeError("Shared permission cache requires 'redis' package")
+
+        return SharedPermissionCache(
+            Redis.from_url(CONFIG.PERMISSION_CACHE_URL),
+            CONFIG.PERMISSION_CACHE_TTL,
+        )
+
+    return PermissionCache(CONFIG.PERMISSION_CACHE_TTL, CONFIG.PERMISSION_CACHE_SIZE)
+
+
+permission_cache = create_permission_cache()
+version_cache = VersionCache(CONFIG.RBAC_VERSION_TTL)
+subscribe(permission_cache.handle_change)
+subscribe(version_cache.handle_change)
@@ -1,16 +1,31 @@
 from functools import wraps
-from typing import Callable, List
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
-from enums import Permission
-from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from authentication import current_claims, current_identity
+from authorization_graph import authorization_graph
+from config import CONFIG
+from enums import PERMISSION_BITS, Permission
+from flask import g, request
 from http_exception import HTTPException
+from models.async_models import rbac_versions as async_versions_db
+from models.async_models import users as async_db
+from models.rbac_version import rbac_versions as versions_db
 from models.user import users as db
+from permission_cache import Policies, permission_cache, version_cache
 
 
-def permissions(permission_action: Permission) -> Callable:
+def permissions(
+    permission_action: Permission,
+    department_from: Optional[str] = None,
+    stored_department: Optional[Callable[[Dict], Optional[int]]] = None,
+) -> Callable:
     """
     Decorator wrapper definition
     permission_action - equivalent for policy title
+    department_from - URL parameter or JSON body field with department
+    identifier, policy has to be granted in that department
+    stored_department - function of URL parameters returning department of
+    stored resource, policy has to be granted in that department as well
     """
 
     def required_permissions(endpoint_handler: Callable) -> Callable:
@@ -20,14 +35,23 @@ def permissions(permission_action: Permission) -> Callable:
 
         @wraps(endpoint_handler)
         def wrapper(*args, **kwargs):
-            verify_jwt_in_request()
-            user_identity = get_jwt_identity()
-            policies = db.select_user_policies(user_identity["id"])
+            # Decided once per request, batch items share decisions of batch
+            decisions = g.setdefault("permission_decisions", {})
 
-            if not has_permissions(permission_action.value, policies):
-                raise HTTPException(
-                    "You have no permissions for execute such operation", 403
-                )
+            for department_id in checked_departments(
+                department_from, stored_department, kwargs
+            ):
+                decision_key = (permission_action, department_id)
+
+                if decision_key not in decisions:
+                    decisions[decision_key] = is_allowed(
+                        permission_action, department_id
+                    )
+
+                if not decisions[decision_key]:
+                    raise HTTPException(
+                        "You have no permissions for execute such operation", 403
+                    )
 
             return endpoint_handler(*args, **kwargs)
 
@@ -36,12 +60,290 @@ def permissions(permission_action: Permission) -> Callable:
     return required_permissions
 
 
-def has_permissions(permission_title: str, permission_list: List):
-    required_permissions = filter(
-        lambda a: a["title"] == permission_title, permission_list
+def is_allowed(permission_action: Permission, department_id: Optional[int]) -> bool:
+    """
+    Permission of authenticated user, from token claims while they are up to
+    date, else from authorization graph or effective policies
+    """
+
+    user_identity = current_identity()
+    versions = request_rbac_versions(user_identity["id"])
+    decision = claims_decision(
+        current_claims(), versions, permission_action, department_id
+    )
+
+    if decision is not None:
+        return decision
+
+    if CONFIG.AUTHORIZATION_GRAPH:
+        return authorization_graph.has_permission(
+            user_identity["id"], permission_action, versions, department_id
+        )
+
+    return has_permissions(
+        permission_action.value,
+        effective_policies(user_identity["id"], versions),
+        department_id,
     )
 
-    if not len(list(required_permissions)):
+
+async def is_allowed_async(
+    user_identity: Dict,
+    token_claims: Dict,
+    permission_action: Permission,
+    department_id: Optional[int],
+) -> bool:
+    """
+    Permission of user authenticated by coroutine endpoint. Token claims
+    decide while they are up to date, else effective policies are read
+    through async models
+    """
+
+    versions = await async_versions_db.select_versions(user_identity["id"])
+    decision = claims_decision(token_claims, versions, permission_action, department_id)
+
+    if decision is not None:
+        return decision
+
+    policies = {}
+
+    for row in await async_db.select_user_policy_departments(user_identity["id"]):
+        policies.setdefault(row["title"], set()).add(row["department_id"])
+
+    return has_permissions(permission_action.value, policies, department_id)
+
+
+def claims_decision(
+    token_claims: Dict,
+    versions: Tuple[int, int],
+    permission_action: Permission,
+    department_id: Optional[int],
+) -> Optional[bool]:
+    """
+    Permission from access token claims, None when claims are outdated or
+    have no per-department policies asked for
+    """
+
+    claims = token_claims.get("rbac")
+
+    if (
+        claims is None
+        or tuple(claims["version"]) != versions
+        or (department_id is not None and "departments" not in claims)
+    ):
+        return None
+
+    return bool(
+        claims_mask(claims, department_id) & PERMISSION_BITS[permission_action.value]
+    )
+
+
+def checked_departments(
+    department_from: Optional[str],
+    stored_department: Optional[Callable[[Dict], Optional[int]]],
+    view_arguments: Dict,
+) -> List[Optional[int]]:
+    """
+    Departments policy has to be granted in: department of stored resource
+    and department requested by URL or body, which differ when resource is
+    moved. None stands for any department
+    """
+
+    departments = []
+
+    if stored_department is not None:
+        if (department_id := stored_department(view_arguments)) is not None:
+            departments.append(department_id)
+
+    department_id = requested_department(department_from, view_arguments)
+
+    if department_id is not None and department_id not in departments:
+        departments.append(department_id)
+
+    return departments or [None]
+
+
+def requested_department(
+    department_from: Optional[str], view_arguments: Dict
+) -> Optional[int]:
+    """
+    Department identifier from URL parameters or JSON body of request
+    """
+
+    if department_from is None:
+        return None
+
+    if department_from in view_arguments:
+        department_id = view_arguments[department_from]
+    elif isinstance(body := request.get_json(silent=True), dict):
+        department_id = body.get(department_from)
+    else:
+        department_id = None
+
+    if department_id is None:
+        return None
+
+    try:
+        return int(department_id)
+    except (TypeError, ValueError):
+        raise HTTPException("Invalid department identifier", 422)
+
+
+def claims_mask(claims: Dict, department_id: Optional[int] = None) -> int:
+    """
+    Policies bitmask from access token claims, of single department if
+    'department_id' is given
+    """
+
+    if department_id is None:
+        return claims["policies"]
+
+    return claims["departments"].get(str(department_id), 0)
+
+
+def rbac_versions(user_id: int) -> Tuple[int, int]:
+    """
+    Global and per-user RBAC versions, read from database at most once per
+    version cache TTL
+    """
+
+    versions = version_cache.get(user_id)
+
+    if versions is None:
+        versions = versions_db.select_versions(user_id)
+        version_cache.put(user_id, versions)
+
+    return versions
+
+
+def request_rbac_versions(user_id: int) -> Tuple[int, int]:
+    """
+    RBAC versions of authenticated user, read once per request
+    """
+
+    if (versions := g.get("rbac_versions")) is None:
+        versions = g.rbac_versions = rbac_versions(user_id)
+
+    return versions
+
+
+def forget_request_permissions():
+    """
+    Drop RBAC versions and permission decisions memoized for current request,
+    so they are read again after request changed roles, groups or policies
+    """
+
+    g.pop("rbac_versions", None)
+    g.pop("permission_decisions", None)
+
+
+def effective_policies(
+    user_id: int, versions: Optional[Tuple[int, int]] = None
+) -> Policies:
+    """
+    Titles of all policies granted to user directly or through groups, with
+    departments they are granted in. Served from permission cache, database
+    is queried on cache miss only
+    """
+
+    policies = permission_cache.get(user_id, versions)
+
+    if policies is None:
+        generation = permission_cache.generation(user_id)
+        departments = {}
+
+        for title, department_id in db.select_user_policy_departments(user_id):
+            departments.setdefault(title, set()).add(department_id)
+
+        policies = {
+            title: frozenset(department_ids)
+            for title, department_ids in departments.items()
+        }
+        permission_cache.put(user_id, policies, generation, versions)
+
+    return policies
+
+
+def encode_policies(policy_titles: Iterable[str]) -> int:
+    """
+    Bitmask of 'Permission' policies, other policy titles are left out
+    """
+
+    mask = 0
+
+    for title in policy_titles:
+        mask |= PERMISSION_BITS.get(title, 0)
+
+    return mask
+
+
+def encode_department_policies(policies: Policies) -> Dict[int, int]:
+    """
+    Bitmasks of 'Permission' policies per department
+    """
+
+    masks = {}
+
+    for title, department_ids in policies.items():
+        for department_id in department_ids:
+            masks[department_id] = masks.get(department_id, 0) | PERMISSION_BITS.get(
+                title, 0
+            )
+
+    return masks
+
+
+def permission_masks(
+    user_id: int, versions: Tuple[int, int]
+) -> Tuple[int, Dict[int, int]]:
+    """
+    Bitmasks of policies granted to user in any department and in every
+    single department, from one lookup of user policies
+    """
+
+    if CONFIG.AUTHORIZATION_GRAPH:
+        return (
+            authorization_graph.permission_mask(user_id, versions),
+            authorization_graph.department_masks(user_id, versions),
+        )
+
+    policies = effective_policies(user_id, versions)
+
+    return encode_policies(policies), encode_department_policies(policies)
+
+
+def policy_claims(user_id: int) -> Dict:
+    """
+    Access token claims with policies of user and RBAC versions they are
+    valid for. Versions are read first, so concurrent change of grants makes
+    token outdated rather than wrong
+    """
+
+    versions = versions_db.select_versions(user_id)
+    version_cache.put(user_id, versions)
+    policies, departments = permission_masks(user_id, versions)
+
+    return {
+        "rbac": {
+            "policies": policies,
+            "departments": {
+                str(department_id): mask
+                for department_id, mask in departments.items()
+                if mask
+            },
+            "version": list(versions),
+        }
+    }
+
+
+def has_permissions(
+    permission_title: str, policies: Policies, department_id: Optional[int] = None
+) -> bool:
+    """
+    Check policy is granted in 'department_id', or in any department
+    """
+
+    if not (department_ids := policies.get(permission_title)):
         return False
 
-    return True
+    return department_id is None or department_id in department_ids
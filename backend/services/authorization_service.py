@@ -0,0 +1,101 @@
+from http import HTTPStatus
+from typing import Any, Dict, Optional, Tuple
+
+from enums import PERMISSION_BITS, Permission
+from http_exception import HTTPException
+from permissions import permission_masks, rbac_versions
+from services.request_validators import (
+    check_body_content,
+    check_empty_request_body,
+    is_identifier,
+)
+
+MAX_CHECKS = 1000
+
+Check = Tuple[int, Permission, Optional[int]]
+
+
+def check_permissions(body: Dict, user_identity: Dict) -> Dict:
+    """
+    Answer list of '(user_id, permission, department_id)' checks, loading
+    policies once per distinct user. Checks of other users require
+    'Manage users' permission
+    """
+
+    check_empty_request_body(body)
+    check_body_content(body, fields=["checks"])
+
+    if not isinstance(body["checks"], list) or len(body["checks"]) > MAX_CHECKS:
+        raise HTTPException(
+            f"Checks must be a list of at most {MAX_CHECKS} items",
+            HTTPStatus.BAD_REQUEST,
+        )
+
+    checks = [parse_check(check) for check in body["checks"]]
+    masks: Dict[int, Tuple[int, Dict[int, int]]] = {}
+
+    def user_masks(user_id: int) -> Tuple[int, Dict[int, int]]:
+        if user_id not in masks:
+            masks[user_id] = permission_masks(user_id, rbac_versions(user_id))
+
+        return masks[user_id]
+
+    caller_id = user_identity["id"]
+
+    if any(user_id != caller_id for user_id, _, _ in checks) and not allowed(
+        user_masks(caller_id), Permission.MANAGE_USERS
+    ):
+        raise HTTPException(
+            "You have no permissions for execute such operation",
+            HTTPStatus.FORBIDDEN,
+        )
+
+    return {
+        "results": [
+            {
+                "user_id": user_id,
+                "permission": permission.value,
+                "department_id": department_id,
+                "allowed": allowed(user_masks(user_id), permission, department_id),
+            }
+            for user_id, permission, department_id in checks
+        ]
+    }
+
+
+def parse_check(check: Any) -> Check:
+    if not isinstance(check, dict):
+        raise HTTPException(
+            "Incorrect body content for execute this operation", HTTPStatus.BAD_REQUEST
+        )
+
+    check_body_content(check, fields=["user_id", "permission"])
+    department_id = check.get("department_id")
+
+    if not is_identifier(check["user_id"]) or not (
+        department_id is None or is_identifier(department_id)
+    ):
+        raise HTTPException(
+            "Invalid user or department identifier", HTTPStatus.UNPROCESSABLE_ENTITY
+        )
+
+    try:
+        permission = Permission(check["permission"])
+    except ValueError:
+        raise HTTPException(
+            f"Unknown permission {check['permission']!r}",
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+        )
+
+    return check["user_id"], permission, department_id
+
+
+def allowed(
+    masks: Tuple[int, Dict[int, int]],
+    permission: Permission,
+    department_id: Optional[int] = None,
+) -> bool:
+    policies, departments = masks
+    mask = policies if department_id is None else departments.get(department_id, 0)
+
+    return bool(mask & PERMISSION_BITS[permission.value])
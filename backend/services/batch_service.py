@@ -0,0 +1,176 @@
+import logging
+from http import HTTPStatus
+from typing import Any, Dict, List, Tuple
+
+from flask import current_app, request
+from http_exception import HTTPException
+from models.postgresql_handler import PostgreSQLHandler
+from permissions import forget_request_permissions
+from services.request_validators import check_body_content, check_empty_request_body
+from werkzeug.test import EnvironBuilder
+
+LOG = logging.getLogger(__name__)
+
+MAX_BATCH_ITEMS = 100
+BATCH_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE")
+BATCH_PATH_PREFIX = "/api/v2/"
+BATCH_PATH = "/api/v2/batch"
+
+# Environ key which marks requests dispatched by batch
+BATCH_ITEM_ENVIRON = "batch.item"
+
+
+def is_batch_item() -> bool:
+    """
+    Current request is item of batch, it shares authentication, database
+    connection and unit of work of the batch request
+    """
+
+    return BATCH_ITEM_ENVIRON in request.environ
+
+
+def run_batch(body: Dict) -> Dict:
+    """
+    Dispatch items of batch to v2 endpoints in order, on authentication
+    and database connection of batch request. Atomic batch commits all
+    items at once and stops at first failed item, otherwise every item
+    commits on its own
+    """
+
+    check_empty_request_body(body)
+    check_body_content(body, fields=["items"])
+
+    items = [parse_item(item) for item in batch_items(body["items"])]
+    atomic = body.get("atomic", False)
+
+    if not isinstance(atomic, bool):
+        raise HTTPException("Field 'atomic' must be boolean", HTTPStatus.BAD_REQUEST)
+
+    if not atomic:
+        # Close unit of work of batch request, so items get their own ones
+        PostgreSQLHandler.finish()
+
+    results = []
+    failed = False
+
+    try:
+        for method, path, item_body in items:
+            if failed:
+                results.append(
+                    {
+                        "status": HTTPStatus.FAILED_DEPENDENCY,
+                        "body": {"message": "Not executed, earlier item failed"},
+                    }
+                )
+                continue
+
+            PostgreSQLHandler.begin()
+            status, response_body = dispatch(method, path, item_body)
+            PostgreSQLHandler.finish(commit=status < HTTPStatus.BAD_REQUEST)
+
+            if method != "GET":
+                # Items share application context with batch request, so
+                # permissions memoized in it may be outdated by this item
+                forget_request_permissions()
+
+            results.append({"status": status, "body": response_body})
+            failed = atomic and status >= HTTPStatus.BAD_REQUEST
+    finally:
+        if not atomic:
+            PostgreSQLHandler.begin()
+
+    response = {"atomic": atomic, "results": results}
+
+    if atomic:
+        response["committed"] = not failed
+
+    return response
+
+
+def batch_items(items: Any) -> List:
+    if not isinstance(items, list) or not 0 < len(items) <= MAX_BATCH_ITEMS:
+        raise HTTPException(
+            f"Items must be a list of 1 to {MAX_BATCH_ITEMS} requests",
+            HTTPStatus.BAD_REQUEST,
+        )
+
+    return items
+
+
+def parse_item(item: Any) -> Tuple[str, str, Any]:
+    """
+    Method, path with query string and JSON body of batch item
+    """
+
+    if not isinstance(item, dict):
+        raise HTTPException("Batch item must be an object", HTTPStatus.BAD_REQUEST)
+
+    method = item.get("method")
+    path = item.get("path")
+
+    if method not in BATCH_METHODS:
+        raise HTTPException(
+            f"Batch item method must be one of: {', '.join(BATCH_METHODS)}",
+            HTTPStatus.BAD_REQUEST,
+        )
+
+    if (
+        not isinstance(path, str)
+        or not path.startswith(BATCH_PATH_PREFIX)
+        or path.split("?")[0].rstrip("/") == BATCH_PATH
+    ):
+        raise HTTPException(
+            f"Batch item path must start with '{BATCH_PATH_PREFIX}' "
+            "and can not be the batch endpoint",
+            HTTPStatus.BAD_REQUEST,
+        )
+
+    return method, path, item.get("body")
+
+
+def dispatch(method: str, path: str, body: Any) -> Tuple[int, Any]:
+    """
+    Run endpoint of item in nested request context, without request hooks.
+    Item sees identity of the batch request on 'g' of the shared application
+    context and joins its unit of work, which belongs to the thread.
+    Returns status code and decoded body of its response
+    """
+
+    request_options = {
+        "method": method,
+        "environ_overrides": {BATCH_ITEM_ENVIRON: True},
+    }
+
+    if body is not None:
+        request_options["json"] = body
+
+    builder = EnvironBuilder(path, **request_options)
+
+    try:
+        environ = builder.get_environ()
+    finally:
+        builder.close()
+
+    with current_app.request_context(environ):
+        if (routing_error := request.routing_exception) is not None:
+            return routing_error.code, {"message": routing_error.description}
+
+        PostgreSQLHandler.use_endpoint_timeout(request.endpoint)
+
+        try:
+            response = current_app.make_response(current_app.dispatch_request())
+        except Exception as error:
+            try:
+                response = current_app.make_response(
+                    current_app.handle_user_exception(error)
+                )
+            except Exception:
+                LOG.exception(f"Batch item {method} {path} failed")
+                return HTTPStatus.INTERNAL_SERVER_ERROR, {
+                    "message": "Internal server error"
+                }
+
+        if response.is_json:
+            return response.status_code, response.get_json()
+
+        return response.status_code, response.get_data(as_text=True)
@@ -1,8 +1,9 @@
 from http import HTTPStatus
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from enums import TransactionResult
 from http_exception import HTTPException
+from models.async_models import departments as async_db
 from models.department import departments as db
 from services.request_validators import check_body_content, check_empty_request_body
 
@@ -13,9 +14,21 @@ def select_departments() -> List:
     return departments
 
 
+async def select_departments_async() -> List:
+    return await async_db.select_departments()
+
+
 def select_single_department(department_id: int):
-    department = db.select_department_by_id(department_id)
+    return existing_department(db.select_department_by_id(department_id), department_id)
+
+
+async def select_single_department_async(department_id: int):
+    return existing_department(
+        await async_db.select_department_by_id(department_id), department_id
+    )
+
 
+def existing_department(department: Optional[Dict], department_id: int) -> Dict:
     if department is None:
         raise HTTPException(
             f"Department with '{department_id}' identifier does not exist",
@@ -1,8 +1,9 @@
 from http import HTTPStatus
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
 from enums import TransactionResult
 from http_exception import HTTPException
+from models.async_models import groups as async_db
 from models.group import groups as db
 from services.request_validators import check_body_content, check_empty_request_body
 
@@ -13,15 +14,25 @@ def select_groups() -> List:
     return groups
 
 
-def select_users_in_group(group_id: int) -> List:
+async def select_groups_async() -> List:
+    return await async_db.select_groups()
+
+
+def select_users_in_group(group_id: int) -> Iterator[Dict]:
     users = db.select_users_in_group(group_id)
 
     return users
 
 
 def select_single_group(group_id: int):
-    group = db.select_group_by_id(group_id)
+    return existing_group(db.select_group_by_id(group_id), group_id)
+
+
+async def select_single_group_async(group_id: int):
+    return existing_group(await async_db.select_group_by_id(group_id), group_id)
 
+
+def existing_group(group: Optional[Dict], group_id: int) -> Dict:
     if group is None:
         raise HTTPException(
             f"Group with '{group_id}' identifier does not exist",
@@ -84,6 +95,10 @@ def select_group_roles(group_id: int) -> List:
     return roles
 
 
+async def select_group_roles_async(group_id: int) -> List:
+    return await async_db.select_group_roles(group_id)
+
+
 def insert_group_role(body: Dict):
     check_empty_request_body(body)
     check_body_content(body, fields=["group_id", "role_id"])
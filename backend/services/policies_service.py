@@ -1,10 +1,18 @@
 from http import HTTPStatus
-from typing import Dict, List
+from typing import Dict, List, Mapping, Optional
 
-from enums import TransactionResult
+from authorization_graph import authorization_graph
+from config import CONFIG
+from enums import PERMISSION_BITS, Permission, TransactionResult
 from http_exception import HTTPException
+from models.async_models import policies as async_db
 from models.policy import policies as db
-from services.request_validators import check_body_content, check_empty_request_body
+from services.request_validators import (
+    check_body_content,
+    check_empty_request_body,
+    identifier_argument,
+    page_size_argument,
+)
 
 
 def select_policies() -> List:
@@ -13,9 +21,19 @@ def select_policies() -> List:
     return policies
 
 
+async def select_policies_async() -> List:
+    return await async_db.select_policies()
+
+
 def select_single_policy(policy_id: int):
-    policy = db.select_policy_by_id(policy_id)
+    return existing_policy(db.select_policy_by_id(policy_id), policy_id)
+
 
+async def select_single_policy_async(policy_id: int):
+    return existing_policy(await async_db.select_policy_by_id(policy_id), policy_id)
+
+
+def existing_policy(policy: Optional[Dict], policy_id: int) -> Dict:
     if policy is None:
         raise HTTPException(
             f"Policy with '{policy_id}' identifier does not exist",
@@ -25,6 +43,64 @@ def select_single_policy(policy_id: int):
     return policy
 
 
+def select_users_with_policy(policy_id: int, arguments: Mapping) -> Dict:
+    """
+    Page of users holding policy. Pass 'next' of response as 'after' query
+    parameter to get next page, it is null on last page
+    """
+
+    department_id = identifier_argument(arguments, "department_id")
+    after = identifier_argument(arguments, "after") or 0
+    limit = page_size_argument(arguments)
+
+    if department_id is None and (permission := graph_permission(policy_id)):
+        return select_users_with_permission(permission, after, limit)
+
+    users = db.select_users_with_policy(policy_id, department_id, after, limit)
+
+    return {
+        "users": users,
+        "next": users[-1]["id"] if len(users) == limit else None,
+    }
+
+
+def graph_permission(policy_id: int) -> Optional[Permission]:
+    """
+    Permission of policy when authorization graph keeps bitset of its users
+    """
+
+    if not CONFIG.AUTHORIZATION_GRAPH:
+        return None
+
+    policy = db.select_policy_by_id(policy_id)
+
+    if policy is None or policy["title"] not in PERMISSION_BITS:
+        return None
+
+    return Permission(policy["title"])
+
+
+def select_users_with_permission(
+    permission: Permission, after: int, limit: int
+) -> Dict:
+    """
+    Page of policy holders taken from user bitset of authorization graph
+    """
+
+    user_ids = authorization_graph.users_with(permission, after=after, limit=limit)
+    users = db.select_users_by_ids(user_ids) if user_ids else []
+
+    for user in users:
+        user["granted_in_departments"] = authorization_graph.granted_departments(
+            user["id"], permission
+        )
+
+    return {
+        "users": users,
+        "next": user_ids[-1] if len(user_ids) == limit else None,
+    }
+
+
 def delete_policy(policy_id: int) -> Dict:
     response = db.delete_policy(policy_id)
 
@@ -1,8 +1,9 @@
 from http import HTTPStatus
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from enums import TransactionResult
 from http_exception import HTTPException
+from models.async_models import positions as async_db
 from models.position import positions as db
 from services.request_validators import check_body_content, check_empty_request_body
 
@@ -13,9 +14,21 @@ def select_positions() -> List:
     return positions
 
 
+async def select_positions_async() -> List:
+    return await async_db.select_positions()
+
+
 def select_single_position(position_id: int):
-    position = db.select_position_by_id(position_id)
+    return existing_position(db.select_position_by_id(position_id), position_id)
+
+
+async def select_single_position_async(position_id: int):
+    return existing_position(
+        await async_db.select_position_by_id(position_id), position_id
+    )
+
 
+def existing_position(position: Optional[Dict], position_id: int) -> Dict:
     if position is None:
         raise HTTPException(
             f"Position with '{position_id}' identifier does not exist",
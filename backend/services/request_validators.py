@@ -1,9 +1,13 @@
+from datetime import date
 from http import HTTPStatus
-from typing import Dict, List
+from typing import Any, Dict, List, Mapping, Optional
 
 from http_exception import HTTPException
 from validators import validate_content_type
 
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
 
 def content_type_validation(content_type: str) -> None:
     if not validate_content_type(content_type):
@@ -28,3 +32,101 @@ def check_body_content(body: Dict, *, fields: List) -> None:
         raise HTTPException(
             "Incorrect body content for execute this operation", HTTPStatus.BAD_REQUEST
         )
+
+
+def is_identifier(value: Any) -> bool:
+    """
+    Value is positive integer, as identifiers of stored rows are
+    """
+
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+def identifier_argument(arguments: Mapping, name: str) -> Optional[int]:
+    """
+    Non-negative integer query parameter, None when it is absent
+    """
+
+    if (value := arguments.get(name)) is None:
+        return None
+
+    try:
+        number = int(value)
+    except ValueError:
+        number = None
+
+    if number is None or number < 0:
+        raise HTTPException(
+            f"Invalid query parameter '{name}'", HTTPStatus.UNPROCESSABLE_ENTITY
+        )
+
+    return number
+
+
+def page_size_argument(arguments: Mapping, name: str = "limit") -> int:
+    """
+    Page size query parameter, default page size when it is absent or zero
+    """
+
+    page_size = identifier_argument(arguments, name) or PAGE_SIZE
+
+    if page_size > MAX_PAGE_SIZE:
+        raise HTTPException(
+            f"Page size can not exceed {MAX_PAGE_SIZE}",
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+        )
+
+    return page_size
+
+
+def identifier_list_argument(arguments: Mapping, name: str) -> List[int]:
+    """
+    Comma separated non-negative integers query parameter, empty list when
+    it is absent
+    """
+
+    if not (value := arguments.get(name)):
+        return []
+
+    try:
+        numbers = [int(item) for item in value.split(",")]
+    except ValueError:
+        numbers = [-1]
+
+    if any(number < 0 for number in numbers):
+        raise HTTPException(
+            f"Invalid query parameter '{name}'", HTTPStatus.UNPROCESSABLE_ENTITY
+        )
+
+    return numbers
+
+
+def date_argument(arguments: Mapping, name: str) -> Optional[date]:
+    """
+    ISO formatted date query parameter, None when it is absent
+    """
+
+    if (value := arguments.get(name)) is None:
+        return None
+
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(
+            f"Invalid query parameter '{name}'", HTTPStatus.UNPROCESSABLE_ENTITY
+        )
+
+
+def flag_argument(arguments: Mapping, name: str) -> bool:
+    """
+    Boolean query parameter, false when it is absent
+    """
+
+    value = arguments.get(name, "false").lower()
+
+    if value not in ("true", "false", "1", "0"):
+        raise HTTPException(
+            f"Invalid query parameter '{name}'", HTTPStatus.UNPROCESSABLE_ENTITY
+        )
+
+    return value in ("true", "1")
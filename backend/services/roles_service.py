@@ -1,8 +1,9 @@
 from http import HTTPStatus
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional
 
 from enums import TransactionResult
 from http_exception import HTTPException
+from models.async_models import roles as async_db
 from models.role import roles as db
 from services.request_validators import check_body_content, check_empty_request_body
 
@@ -13,15 +14,25 @@ def select_roles() -> List:
     return roles
 
 
-def select_users_with_role(role_id: int) -> List:
+async def select_roles_async() -> List:
+    return await async_db.select_roles()
+
+
+def select_users_with_role(role_id: int) -> Iterator[Dict]:
     users = db.select_users_with_role(role_id)
 
     return users
 
 
 def select_single_role(role_id: int):
-    role = db.select_role_by_id(role_id)
+    return existing_role(db.select_role_by_id(role_id), role_id)
+
+
+async def select_single_role_async(role_id: int):
+    return existing_role(await async_db.select_role_by_id(role_id), role_id)
 
+
+def existing_role(role: Optional[Dict], role_id: int) -> Dict:
     if role is None:
         raise HTTPException(
             f"Role with '{role_id}' identifier does not exist",
@@ -84,6 +95,10 @@ def select_role_policies(role_id: int) -> List:
     return policies
 
 
+async def select_role_policies_async(role_id: int) -> List:
+    return await async_db.select_role_policies(role_id)
+
+
 def insert_role_policy(body: Dict):
     check_empty_request_body(body)
     check_body_content(body, fields=["role_id", "policy_id", "department_id"])
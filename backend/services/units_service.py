@@ -1,8 +1,9 @@
 from http import HTTPStatus
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from enums import TransactionResult
 from http_exception import HTTPException
+from models.async_models import units as async_db
 from models.unit import units as db
 from services.request_validators import check_body_content, check_empty_request_body
 
@@ -11,10 +12,18 @@ def select_units() -> List:
     return db.select_units()
 
 
+async def select_units_async() -> List:
+    return await async_db.select_units()
+
+
 def select_department_units(department_id: int) -> List:
     return db.select_department_units(department_id)
 
 
+async def select_department_units_async(department_id: int) -> List:
+    return await async_db.select_department_units(department_id)
+
+
 def select_single_unit(unit_id: int):
     unit = db.select_single_unit(unit_id)
 
@@ -27,6 +36,14 @@ def select_single_unit(unit_id: int):
     return unit
 
 
+def unit_department(view_arguments: Dict) -> Optional[int]:
+    """
+    Stored department of unit from URL, for department scoped permissions
+    """
+
+    return db.select_unit_department(view_arguments["unit_id"])
+
+
 def delete_unit(unit_id: int) -> Dict:
     response = db.delete_unit(unit_id)
 
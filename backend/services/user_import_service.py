@@ -0,0 +1,208 @@
+import csv
+import io
+import json
+from http import HTTPStatus
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+from enums import Permission
+from http_exception import HTTPException
+from models.user import users as db
+from password_hashing import password_hasher
+from permissions import permission_masks, rbac_versions
+from services.authorization_service import allowed
+from services.request_validators import identifier_list_argument
+from validators import validate_password
+
+MAX_IMPORT_ROWS = 10000
+
+# Maximal lengths of imported fields, as in "user" table
+IMPORT_FIELDS = {
+    "first_name": 100,
+    "last_name": 200,
+    "middle_name": 200,
+    "email": 200,
+    "password": None,
+}
+REQUIRED_FIELDS = ("first_name", "last_name", "email", "password")
+
+PASSWORD_ERROR = (
+    "Password must be at least 8 characters long and contain: upper and lower "
+    "case characters, numbers and symbols"
+)
+
+
+def import_users(
+    data: str, content_type: str, arguments: Mapping, user_identity: Dict
+) -> Dict:
+    """
+    Register users from CSV or NDJSON document in one transaction.
+    Invalid rows and rows with already taken email are reported by line
+    and skipped, the others are imported and optionally get roles and
+    groups from 'role_ids' and 'group_ids' query parameters
+    """
+
+    role_ids = identifier_list_argument(arguments, "role_ids")
+    group_ids = identifier_list_argument(arguments, "group_ids")
+
+    if role_ids or group_ids:
+        caller_id = user_identity["id"]
+        masks = permission_masks(caller_id, rbac_versions(caller_id))
+
+        if not allowed(masks, Permission.MANAGE_USERS):
+            raise HTTPException(
+                "You have no permissions for execute such operation",
+                HTTPStatus.FORBIDDEN,
+            )
+
+    rows = parse_import(data, content_type)
+    valid_rows, errors = validate_import(rows)
+    hashes = password_hasher.hash_passwords([row["password"] for _, row in valid_rows])
+
+    merged = db.import_users(
+        [
+            (
+                line,
+                row["first_name"],
+                row["last_name"],
+                row.get("middle_name"),
+                row["email"],
+                password_hash,
+            )
+            for (line, row), password_hash in zip(valid_rows, hashes)
+        ],
+        role_ids,
+        group_ids,
+    )
+
+    if merged is None:
+        raise HTTPException(
+            "Invalid data for importing users. Check role and group identifiers",
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+        )
+
+    imported = []
+
+    for line, email, user_id in merged:
+        if user_id is None:
+            errors.append({"line": line, "email": email, "error": "User already exist"})
+        else:
+            imported.append({"line": line, "email": email, "id": user_id})
+
+    errors.sort(key=lambda error: error["line"])
+
+    return {
+        "imported": len(imported),
+        "failed": len(errors),
+        "users": imported,
+        "errors": errors,
+    }
+
+
+def parse_import(data: str, content_type: str) -> List[Tuple[int, Dict]]:
+    """
+    Pairs of line number and row of import document
+    """
+
+    if content_type.startswith("text/csv"):
+        rows = csv_rows(data)
+    elif content_type.startswith("application/x-ndjson"):
+        rows = ndjson_rows(data)
+    else:
+        raise HTTPException(
+            "Unsupported media type, expected 'text/csv' or 'application/x-ndjson'",
+            HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+        )
+
+    parsed = []
+
+    for line, row in rows:
+        parsed.append((line, row))
+
+        if len(parsed) > MAX_IMPORT_ROWS:
+            raise HTTPException(
+                f"Import can not contain more than {MAX_IMPORT_ROWS} users",
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+            )
+
+    if not parsed:
+        raise HTTPException("Empty body content", HTTPStatus.BAD_REQUEST)
+
+    return parsed
+
+
+def csv_rows(data: str) -> Iterator[Tuple[int, Dict]]:
+    reader = csv.DictReader(io.StringIO(data))
+
+    if reader.fieldnames is None or any(
+        field not in reader.fieldnames for field in REQUIRED_FIELDS
+    ):
+        raise HTTPException(
+            f"CSV header must contain: {', '.join(REQUIRED_FIELDS)}",
+            HTTPStatus.BAD_REQUEST,
+        )
+
+    for row in reader:
+        yield reader.line_num, row
+
+
+def ndjson_rows(data: str) -> Iterator[Tuple[int, Optional[Dict]]]:
+    for line, text in enumerate(data.splitlines(), start=1):
+        if not text.strip():
+            continue
+
+        try:
+            row = json.loads(text)
+        except ValueError:
+            row = None
+
+        yield line, row if isinstance(row, dict) else None
+
+
+def validate_import(
+    rows: List[Tuple[int, Optional[Dict]]],
+) -> Tuple[List[Tuple[int, Dict]], List[Dict]]:
+    """
+    Split rows into valid ones and errors. Repeated email is an error of
+    every row but the first one
+    """
+
+    valid_rows = []
+    errors = []
+    emails = set()
+
+    for line, row in rows:
+        email = row.get("email") if row is not None else None
+
+        if (error := row_error(row)) is None and email in emails:
+            error = "Email is repeated in import"
+
+        if error is not None:
+            errors.append({"line": line, "email": email, "error": error})
+            continue
+
+        emails.add(email)
+        valid_rows.append((line, row))
+
+    return valid_rows, errors
+
+
+def row_error(row: Optional[Dict]) -> Optional[str]:
+    if row is None:
+        return "Row is not a JSON object"
+
+    if any(not row.get(field) for field in REQUIRED_FIELDS):
+        return f"Row must contain: {', '.join(REQUIRED_FIELDS)}"
+
+    for field, max_length in IMPORT_FIELDS.items():
+        value = row.get(field)
+
+        if value is not None and not isinstance(value, str):
+            return f"Field '{field}' must be a string"
+
+        if max_length is not None and value is not None and len(value) > max_length:
+            return f"Field '{field}' can not be longer than {max_length} characters"
+
+    if validate_password(row["password"]) is None:
+        return PASSWORD_ERROR
+
+    return None
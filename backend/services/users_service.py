@@ -1,14 +1,29 @@
+import base64
+import json
 from http import HTTPStatus
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Mapping, NamedTuple, Optional, Tuple
 
 from enums import TransactionResult
 from flask_jwt_extended import create_access_token
 from http_exception import HTTPException
+from models.async_models import users as async_db
 from models.user import users as db
-from services.request_validators import check_body_content, check_empty_request_body
+from permissions import policy_claims
+from services.request_validators import (
+    check_body_content,
+    check_empty_request_body,
+    date_argument,
+    flag_argument,
+    identifier_argument,
+    is_identifier,
+    page_size_argument,
+)
+from streaming import csv_chunks, gzip_chunks, ndjson_chunks
 from validators import validate_password
 from werkzeug.security import check_password_hash, generate_password_hash
 
+MAX_BULK_PAIRS = 10000
+
 
 def user_login(body: Dict) -> Dict:
     if not body.get("email", False) or not body.get("password", False):
@@ -32,7 +47,9 @@ def user_login(body: Dict) -> Dict:
         "email": email,
     }
 
-    access_token = create_access_token(identity=identity)
+    access_token = create_access_token(
+        identity=identity, additional_claims=policy_claims(user[0])
+    )
 
     return {
         "token": access_token,
@@ -76,8 +93,6 @@ def user_profile(user_identity: Dict) -> Dict:
     if not user:
         raise HTTPException("Such user does not exist", HTTPStatus.CONFLICT)
 
-    user["register_date"] = str(user["register_date"])
-
     return user
 
 
@@ -167,18 +182,144 @@ def update_user_position(body: Dict) -> Dict:
     return update_user_single_field(body)
 
 
-def select_users() -> Dict:
+def select_users() -> Iterator[Dict]:
     response = db.select_users()
 
     return response
 
 
+def select_users_page(arguments: Mapping) -> Dict:
+    """
+    Page of users matching query filters. Pass 'next' of response as
+    'cursor' query parameter to get next page, it is null on last page
+    """
+
+    limit = page_size_argument(arguments)
+
+    users = db.select_users_page(
+        decode_cursor(arguments.get("cursor")), limit, **user_filters(arguments)
+    )
+
+    return {
+        "users": users,
+        "next": encode_cursor(users[-1]["id"]) if len(users) == limit else None,
+    }
+
+
+def user_filters(arguments: Mapping) -> Dict:
+    return {
+        "department_id": identifier_argument(arguments, "department_id"),
+        "unit_id": identifier_argument(arguments, "unit_id"),
+        "position_id": identifier_argument(arguments, "position_id"),
+        "registered_from": date_argument(arguments, "registered_from"),
+        "registered_to": date_argument(arguments, "registered_to"),
+    }
+
+
+EXPORT_COLUMNS = (
+    "id",
+    "first_name",
+    "last_name",
+    "middle_name",
+    "email",
+    "register_date",
+    "near_manager_id",
+    "department_id",
+    "unit_id",
+    "position_id",
+)
+
+EXPORT_FORMATS = {
+    "ndjson": (ndjson_chunks, "application/x-ndjson"),
+    "csv": (csv_chunks, "text/csv"),
+}
+
+
+class UsersExport(NamedTuple):
+    chunks: Iterator
+    mimetype: str
+    filename: str
+
+
+def export_users(arguments: Mapping) -> UsersExport:
+    """
+    Lazily serialized export of users matching query filters. Arguments are
+    validated here, before the first row is read
+    """
+
+    export_format = arguments.get("format", "ndjson")
+
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(
+            f"Export format must be one of: {', '.join(EXPORT_FORMATS)}",
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+        )
+
+    columns = export_columns(arguments.get("columns"))
+    filters = user_filters(arguments)
+    serialize, mimetype = EXPORT_FORMATS[export_format]
+    chunks = serialize(db.stream_users(**filters), columns)
+    filename = f"users.{export_format}"
+
+    if flag_argument(arguments, "gzip"):
+        return UsersExport(gzip_chunks(chunks), "application/gzip", f"{filename}.gz")
+
+    return UsersExport(chunks, mimetype, filename)
+
+
+def export_columns(value: Optional[str]) -> Tuple[str, ...]:
+    if not value:
+        return EXPORT_COLUMNS
+
+    columns = tuple(column.strip() for column in value.split(","))
+
+    if unknown := [column for column in columns if column not in EXPORT_COLUMNS]:
+        raise HTTPException(
+            f"Unknown export columns: {', '.join(unknown)}",
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+        )
+
+    return columns
+
+
+def encode_cursor(user_id: int) -> str:
+    """
+    Opaque page cursor pointing after given user
+    """
+
+    data = json.dumps({"after": user_id}, separators=(",", ":")).encode()
+
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    if not cursor:
+        return 0
+
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        after = json.loads(data)["after"]
+    except (ValueError, TypeError, KeyError):
+        after = None
+
+    if not isinstance(after, int) or isinstance(after, bool) or after < 0:
+        raise HTTPException(
+            "Invalid query parameter 'cursor'", HTTPStatus.UNPROCESSABLE_ENTITY
+        )
+
+    return after
+
+
 def select_user_roles(user_id: int) -> List:
     roles = db.select_user_roles(user_id)
 
     return roles
 
 
+async def select_user_roles_async(user_id: int) -> List:
+    return await async_db.select_user_roles(user_id)
+
+
 def insert_user_role(body: Dict):
     check_empty_request_body(body)
     check_body_content(body, fields=["user_id", "role_id"])
@@ -219,6 +360,10 @@ def select_user_groups(user_id: int) -> List:
     return roles
 
 
+async def select_user_groups_async(user_id: int) -> List:
+    return await async_db.select_user_groups(user_id)
+
+
 def insert_user_group(body: Dict):
     check_empty_request_body(body)
     check_body_content(body, fields=["user_id", "group_id"])
@@ -253,3 +398,107 @@ def delete_user_group(user_id: Optional[int], group_id: Optional[int]) -> Dict:
         )
 
     return {}
+
+
+def insert_user_roles(body: Dict) -> Dict:
+    pairs = bulk_pairs(body, "role")
+
+    if (created := db.insert_user_roles(pairs)) is None:
+        raise HTTPException(
+            "Invalid data for adding user roles", HTTPStatus.UNPROCESSABLE_ENTITY
+        )
+
+    return pairs_report(pairs, created, "role", "created", "existing")
+
+
+def delete_user_roles(body: Dict) -> Dict:
+    pairs = bulk_pairs(body, "role")
+
+    if (deleted := db.delete_user_roles(pairs)) is None:
+        raise HTTPException(
+            "Invalid data for deleting user roles", HTTPStatus.UNPROCESSABLE_ENTITY
+        )
+
+    return pairs_report(pairs, deleted, "role", "deleted", "missing")
+
+
+def insert_user_groups(body: Dict) -> Dict:
+    pairs = bulk_pairs(body, "group")
+
+    if (created := db.insert_user_groups(pairs)) is None:
+        raise HTTPException(
+            "Invalid data for adding users to groups", HTTPStatus.UNPROCESSABLE_ENTITY
+        )
+
+    return pairs_report(pairs, created, "group", "created", "existing")
+
+
+def delete_user_groups(body: Dict) -> Dict:
+    pairs = bulk_pairs(body, "group")
+
+    if (deleted := db.delete_user_groups(pairs)) is None:
+        raise HTTPException(
+            "Invalid data for deleting users from groups",
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+        )
+
+    return pairs_report(pairs, deleted, "group", "deleted", "missing")
+
+
+def bulk_pairs(body: Dict, item: str) -> List[Tuple[int, int]]:
+    """
+    Distinct (user_id, <item>_id) pairs of bulk request body. Body holds
+    either one 'user_id' with list '<item>_ids', or one '<item>_id' with
+    list 'user_ids'
+    """
+
+    check_empty_request_body(body)
+
+    if "user_id" in body and f"{item}_ids" in body:
+        single, many, single_user = body["user_id"], body[f"{item}_ids"], True
+    elif f"{item}_id" in body and "user_ids" in body:
+        single, many, single_user = body[f"{item}_id"], body["user_ids"], False
+    else:
+        raise HTTPException(
+            f"Body must contain 'user_id' with '{item}_ids' list "
+            f"or '{item}_id' with 'user_ids' list",
+            HTTPStatus.BAD_REQUEST,
+        )
+
+    if (
+        not isinstance(many, list)
+        or not 0 < len(many) <= MAX_BULK_PAIRS
+        or not all(is_identifier(identifier) for identifier in [single, *many])
+    ):
+        raise HTTPException(
+            f"Identifiers must be integers, lists can hold 1 to {MAX_BULK_PAIRS} of them",
+            HTTPStatus.BAD_REQUEST,
+        )
+
+    pairs = [
+        (single, identifier) if single_user else (identifier, single)
+        for identifier in many
+    ]
+
+    return list(dict.fromkeys(pairs))
+
+
+def pairs_report(
+    pairs: List[Tuple[int, int]],
+    written: List[Tuple[int, int]],
+    item: str,
+    written_key: str,
+    skipped_key: str,
+) -> Dict:
+    """
+    Requested pairs split into written and skipped ones, in request order
+    """
+
+    written = set(written)
+    report = {written_key: [], skipped_key: []}
+
+    for user_id, item_id in pairs:
+        key = written_key if (user_id, item_id) in written else skipped_key
+        report[key].append({"user_id": user_id, f"{item}_id": item_id})
+
+    return report
@@ -0,0 +1,2 @@
+SELECT group_id, role_id
+FROM group_role;
@@ -0,0 +1,4 @@
+SELECT role_policy.role_id, policy.title, role_policy.department_id
+FROM role_policy
+INNER JOIN policy
+    ON (policy.id=role_policy.policy_id);
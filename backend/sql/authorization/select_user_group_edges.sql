@@ -0,0 +1,3 @@
+SELECT user_id, group_id
+FROM user_group
+WHERE %s::BIGINT[] IS NULL OR user_id=ANY(%s::BIGINT[]);
@@ -0,0 +1,3 @@
+SELECT user_id, role_id
+FROM user_role
+WHERE %s::BIGINT[] IS NULL OR user_id=ANY(%s::BIGINT[]);
@@ -0,0 +1,76 @@
+CREATE OR REPLACE FUNCTION notify_table_cache_event() RETURNS TRIGGER AS $table_cache_event$
+    BEGIN
+        PERFORM pg_notify('cache_events', json_build_object('table', TG_TABLE_NAME)::TEXT);
+        RETURN NULL;
+    END;
+$table_cache_event$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION notify_user_cache_event() RETURNS TRIGGER AS $user_cache_event$
+    -- TG_ARGV[0] is name of column with user identifier.
+    -- Identical notifications of one transaction are delivered once
+    BEGIN
+        IF (TG_OP IN ('UPDATE', 'DELETE')) THEN
+            PERFORM pg_notify(
+                'cache_events',
+                json_build_object(
+                    'table', TG_TABLE_NAME,
+                    'user_id', to_jsonb(OLD) -> TG_ARGV[0]
+                )::TEXT
+            );
+        END IF;
+        IF (TG_OP IN ('UPDATE', 'INSERT')) THEN
+            PERFORM pg_notify(
+                'cache_events',
+                json_build_object(
+                    'table', TG_TABLE_NAME,
+                    'user_id', to_jsonb(NEW) -> TG_ARGV[0]
+                )::TEXT
+            );
+        END IF;
+        RETURN NULL;
+    END;
+$user_cache_event$ LANGUAGE plpgsql;
+
+CREATE TRIGGER user_cache_event
+AFTER UPDATE OR DELETE ON "user"
+    FOR EACH ROW EXECUTE PROCEDURE notify_user_cache_event('id');
+
+CREATE TRIGGER user_role_cache_event
+AFTER INSERT OR UPDATE OR DELETE ON user_role
+    FOR EACH ROW EXECUTE PROCEDURE notify_user_cache_event('user_id');
+
+CREATE TRIGGER user_group_cache_event
+AFTER INSERT OR UPDATE OR DELETE ON user_group
+    FOR EACH ROW EXECUTE PROCEDURE notify_user_cache_event('user_id');
+
+CREATE TRIGGER group_role_cache_event
+AFTER INSERT OR UPDATE OR DELETE ON group_role
+    FOR EACH STATEMENT EXECUTE PROCEDURE notify_table_cache_event();
+
+CREATE TRIGGER role_policy_cache_event
+AFTER INSERT OR UPDATE OR DELETE ON role_policy
+    FOR EACH STATEMENT EXECUTE PROCEDURE notify_table_cache_event();
+
+CREATE TRIGGER policy_cache_event
+AFTER UPDATE OR DELETE ON policy
+    FOR EACH STATEMENT EXECUTE PROCEDURE notify_table_cache_event();
+
+CREATE TRIGGER role_cache_event
+AFTER UPDATE OR DELETE ON role
+    FOR EACH STATEMENT EXECUTE PROCEDURE notify_table_cache_event();
+
+CREATE TRIGGER group_cache_event
+AFTER UPDATE OR DELETE ON "group"
+    FOR EACH STATEMENT EXECUTE PROCEDURE notify_table_cache_event();
+
+CREATE TRIGGER department_cache_event
+AFTER INSERT OR UPDATE OR DELETE ON department
+    FOR EACH STATEMENT EXECUTE PROCEDURE notify_table_cache_event();
+
+CREATE TRIGGER unit_cache_event
+AFTER INSERT OR UPDATE OR DELETE ON unit
+    FOR EACH STATEMENT EXECUTE PROCEDURE notify_table_cache_event();
+
+CREATE TRIGGER position_cache_event
+AFTER INSERT OR UPDATE OR DELETE ON position
+    FOR EACH STATEMENT EXECUTE PROCEDURE notify_table_cache_event();
@@ -0,0 +1 @@
+LISTEN cache_events;
@@ -0,0 +1,10 @@
+SELECT
+    "user".id,
+    "user".first_name,
+    "user".last_name,
+    "user".middle_name,
+    "user".email,
+    "user".department_id
+FROM "user"
+WHERE "user".id=ANY(%s)
+ORDER BY "user".id;
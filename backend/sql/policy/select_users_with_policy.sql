@@ -0,0 +1,27 @@
+WITH page AS (
+    SELECT DISTINCT user_id
+    FROM user_effective_policy
+    WHERE policy_id=%s
+        AND (%s::BIGINT IS NULL OR department_id=%s::BIGINT)
+        AND user_id>%s
+    ORDER BY user_id
+    LIMIT %s
+)
+SELECT
+    "user".id,
+    "user".first_name,
+    "user".last_name,
+    "user".middle_name,
+    "user".email,
+    "user".department_id,
+    ARRAY(
+        SELECT user_effective_policy.department_id
+        FROM user_effective_policy
+        WHERE user_effective_policy.user_id=page.user_id
+            AND user_effective_policy.policy_id=%s
+        ORDER BY user_effective_policy.department_id
+    ) AS granted_in_departments
+FROM page
+INNER JOIN "user"
+    ON ("user".id=page.user_id)
+ORDER BY "user".id;
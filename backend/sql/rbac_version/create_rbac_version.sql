@@ -0,0 +1,6 @@
+CREATE TABLE IF NOT EXISTS rbac_version(
+    user_id BIGINT PRIMARY KEY NOT NULL,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO rbac_version (user_id, version) VALUES (0, 0) ON CONFLICT DO NOTHING;
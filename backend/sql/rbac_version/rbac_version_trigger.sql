@@ -0,0 +1,40 @@
+CREATE OR REPLACE FUNCTION bump_global_rbac_version() RETURNS TRIGGER AS $global_rbac_version$
+    BEGIN
+        UPDATE rbac_version SET version = version + 1 WHERE user_id = 0;
+        RETURN NULL;
+    END;
+$global_rbac_version$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION bump_user_rbac_version() RETURNS TRIGGER AS $user_rbac_version$
+    BEGIN
+        IF (TG_OP IN ('UPDATE', 'DELETE')) THEN
+            INSERT INTO rbac_version (user_id, version) VALUES (OLD.user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET version = rbac_version.version + 1;
+        END IF;
+        IF (TG_OP IN ('UPDATE', 'INSERT')) THEN
+            INSERT INTO rbac_version (user_id, version) VALUES (NEW.user_id, 1)
+            ON CONFLICT (user_id) DO UPDATE SET version = rbac_version.version + 1;
+        END IF;
+        RETURN NULL;
+    END;
+$user_rbac_version$ LANGUAGE plpgsql;
+
+CREATE TRIGGER user_role_rbac_version
+AFTER INSERT OR UPDATE OR DELETE ON user_role
+    FOR EACH ROW EXECUTE PROCEDURE bump_user_rbac_version();
+
+CREATE TRIGGER user_group_rbac_version
+AFTER INSERT OR UPDATE OR DELETE ON user_group
+    FOR EACH ROW EXECUTE PROCEDURE bump_user_rbac_version();
+
+CREATE TRIGGER group_role_rbac_version
+AFTER INSERT OR UPDATE OR DELETE ON group_role
+    FOR EACH STATEMENT EXECUTE PROCEDURE bump_global_rbac_version();
+
+CREATE TRIGGER role_policy_rbac_version
+AFTER INSERT OR UPDATE OR DELETE ON role_policy
+    FOR EACH STATEMENT EXECUTE PROCEDURE bump_global_rbac_version();
+
+CREATE TRIGGER policy_rbac_version
+AFTER UPDATE OR DELETE ON policy
+    FOR EACH STATEMENT EXECUTE PROCEDURE bump_global_rbac_version();
@@ -0,0 +1,2 @@
+SELECT user_id, version
+FROM rbac_version;
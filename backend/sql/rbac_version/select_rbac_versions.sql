@@ -0,0 +1,3 @@
+SELECT
+    COALESCE((SELECT version FROM rbac_version WHERE user_id=0), 0) AS global_version,
+    COALESCE((SELECT version FROM rbac_version WHERE user_id=%s), 0) AS user_version;
@@ -0,0 +1 @@
+CREATE INDEX role_policy_index ON role_policy (role_id, policy_id, department_id);
\ No newline at end of file
@@ -0,0 +1 @@
+SELECT department_id FROM unit WHERE id=%s FOR SHARE;
\ No newline at end of file
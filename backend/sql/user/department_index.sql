@@ -0,0 +1 @@
+CREATE INDEX user_department_index ON "user" (department_id, id);
\ No newline at end of file
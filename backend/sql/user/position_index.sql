@@ -0,0 +1 @@
+CREATE INDEX user_position_index ON "user" (position_id, id);
\ No newline at end of file
@@ -0,0 +1 @@
+CREATE INDEX user_register_date_index ON "user" (register_date, id);
\ No newline at end of file
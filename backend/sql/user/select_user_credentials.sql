@@ -0,0 +1,3 @@
+SELECT id, password
+FROM "user"
+WHERE email=%s;
@@ -0,0 +1,5 @@
+SELECT policy.title, user_effective_policy.department_id
+FROM user_effective_policy
+INNER JOIN policy
+    ON (policy.id=user_effective_policy.policy_id)
+WHERE user_effective_policy.user_id=%s;
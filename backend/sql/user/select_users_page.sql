@@ -0,0 +1,20 @@
+SELECT
+    id,
+    first_name,
+    last_name,
+    middle_name,
+    email,
+    register_date,
+    near_manager_id,
+    department_id,
+    unit_id,
+    position_id
+FROM "user"
+WHERE id>%s
+    AND (%s::BIGINT IS NULL OR department_id=%s::BIGINT)
+    AND (%s::BIGINT IS NULL OR unit_id=%s::BIGINT)
+    AND (%s::BIGINT IS NULL OR position_id=%s::BIGINT)
+    AND (%s::DATE IS NULL OR register_date>=%s::DATE)
+    AND (%s::DATE IS NULL OR register_date<=%s::DATE)
+ORDER BY id
+LIMIT %s;
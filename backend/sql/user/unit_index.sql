@@ -0,0 +1 @@
+CREATE INDEX user_unit_index ON "user" (unit_id, id);
\ No newline at end of file
@@ -0,0 +1 @@
+SELECT backfill_user_effective_policy();
@@ -0,0 +1,29 @@
+WITH expected AS (
+    SELECT user_role.user_id, role_policy.policy_id, role_policy.department_id
+    FROM user_role
+    INNER JOIN role_policy
+        ON (role_policy.role_id=user_role.role_id)
+    UNION
+    SELECT user_group.user_id, role_policy.policy_id, role_policy.department_id
+    FROM user_group
+    INNER JOIN group_role
+        ON (group_role.group_id=user_group.group_id)
+    INNER JOIN role_policy
+        ON (role_policy.role_id=group_role.role_id)
+)
+(
+    SELECT 'missing' AS problem, user_id, policy_id, department_id
+    FROM expected
+    EXCEPT
+    SELECT 'missing', user_id, policy_id, department_id
+    FROM user_effective_policy
+)
+UNION ALL
+(
+    SELECT 'unexpected', user_id, policy_id, department_id
+    FROM user_effective_policy
+    EXCEPT
+    SELECT 'unexpected', user_id, policy_id, department_id
+    FROM expected
+)
+ORDER BY user_id, policy_id, department_id;
@@ -0,0 +1,6 @@
+CREATE TABLE IF NOT EXISTS user_effective_policy(
+    user_id BIGINT NOT NULL REFERENCES "user"(id) ON DELETE CASCADE,
+    policy_id BIGINT NOT NULL REFERENCES policy(id) ON DELETE CASCADE,
+    department_id BIGINT NOT NULL REFERENCES department(id) ON DELETE CASCADE,
+    PRIMARY KEY (user_id, policy_id, department_id)
+);
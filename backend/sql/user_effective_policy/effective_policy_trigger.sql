@@ -0,0 +1,134 @@
+CREATE OR REPLACE FUNCTION refresh_user_effective_policy(user_ids BIGINT[]) RETURNS VOID AS $refresh_effective_policy$
+    BEGIN
+        -- Serialize concurrent refreshes of the same users, locks are taken
+        -- in sorted order so that overlapping refreshes can not deadlock
+        PERFORM pg_advisory_xact_lock(locked.user_id)
+        FROM (SELECT DISTINCT unnest(user_ids) AS user_id ORDER BY 1) AS locked;
+
+        DELETE FROM user_effective_policy WHERE user_id=ANY(user_ids);
+
+        INSERT INTO user_effective_policy (user_id, policy_id, department_id)
+        SELECT user_role.user_id, role_policy.policy_id, role_policy.department_id
+        FROM user_role
+        INNER JOIN role_policy
+            ON (role_policy.role_id=user_role.role_id)
+        WHERE user_role.user_id=ANY(user_ids)
+        UNION
+        SELECT user_group.user_id, role_policy.policy_id, role_policy.department_id
+        FROM user_group
+        INNER JOIN group_role
+            ON (group_role.group_id=user_group.group_id)
+        INNER JOIN role_policy
+            ON (role_policy.role_id=group_role.role_id)
+        WHERE user_group.user_id=ANY(user_ids);
+    END;
+$refresh_effective_policy$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION backfill_user_effective_policy() RETURNS BIGINT AS $backfill_effective_policy$
+    BEGIN
+        PERFORM refresh_user_effective_policy(ARRAY(SELECT id FROM "user"));
+        RETURN (SELECT COUNT(*) FROM user_effective_policy);
+    END;
+$backfill_effective_policy$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION users_of_groups(group_ids BIGINT[]) RETURNS BIGINT[] AS $users_of_groups$
+    SELECT ARRAY(
+        SELECT DISTINCT user_id FROM user_group WHERE group_id=ANY(group_ids)
+    );
+$users_of_groups$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION users_of_roles(role_ids BIGINT[]) RETURNS BIGINT[] AS $users_of_roles$
+    SELECT ARRAY(
+        SELECT user_id FROM user_role WHERE role_id=ANY(role_ids)
+        UNION
+        SELECT user_group.user_id
+        FROM group_role
+        INNER JOIN user_group
+            ON (user_group.group_id=group_role.group_id)
+        WHERE group_role.role_id=ANY(role_ids)
+    );
+$users_of_roles$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION user_link_effective_policy() RETURNS TRIGGER AS $user_link_effective_policy$
+    BEGIN
+        IF (TG_OP IN ('UPDATE', 'DELETE')) THEN
+            PERFORM refresh_user_effective_policy(ARRAY(SELECT DISTINCT user_id FROM old_rows));
+        END IF;
+        IF (TG_OP IN ('UPDATE', 'INSERT')) THEN
+            PERFORM refresh_user_effective_policy(ARRAY(SELECT DISTINCT user_id FROM new_rows));
+        END IF;
+        RETURN NULL;
+    END;
+$user_link_effective_policy$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION group_role_effective_policy() RETURNS TRIGGER AS $group_role_effective_policy$
+    BEGIN
+        IF (TG_OP IN ('UPDATE', 'DELETE')) THEN
+            PERFORM refresh_user_effective_policy(
+                users_of_groups(ARRAY(SELECT group_id FROM old_rows))
+            );
+        END IF;
+        IF (TG_OP IN ('UPDATE', 'INSERT')) THEN
+            PERFORM refresh_user_effective_policy(
+                users_of_groups(ARRAY(SELECT group_id FROM new_rows))
+            );
+        END IF;
+        RETURN NULL;
+    END;
+$group_role_effective_policy$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION role_policy_effective_policy() RETURNS TRIGGER AS $role_policy_effective_policy$
+    BEGIN
+        IF (TG_OP IN ('UPDATE', 'DELETE')) THEN
+            PERFORM refresh_user_effective_policy(
+                users_of_roles(ARRAY(SELECT role_id FROM old_rows))
+            );
+        END IF;
+        IF (TG_OP IN ('UPDATE', 'INSERT')) THEN
+            PERFORM refresh_user_effective_policy(
+                users_of_roles(ARRAY(SELECT role_id FROM new_rows))
+            );
+        END IF;
+        RETURN NULL;
+    END;
+$role_policy_effective_policy$ LANGUAGE plpgsql;
+
+CREATE TRIGGER user_role_effective_policy_insert
+AFTER INSERT ON user_role REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE user_link_effective_policy();
+CREATE TRIGGER user_role_effective_policy_update
+AFTER UPDATE ON user_role REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE user_link_effective_policy();
+CREATE TRIGGER user_role_effective_policy_delete
+AFTER DELETE ON user_role REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE user_link_effective_policy();
+
+CREATE TRIGGER user_group_effective_policy_insert
+AFTER INSERT ON user_group REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE user_link_effective_policy();
+CREATE TRIGGER user_group_effective_policy_update
+AFTER UPDATE ON user_group REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE user_link_effective_policy();
+CREATE TRIGGER user_group_effective_policy_delete
+AFTER DELETE ON user_group REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE user_link_effective_policy();
+
+CREATE TRIGGER group_role_effective_policy_insert
+AFTER INSERT ON group_role REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE group_role_effective_policy();
+CREATE TRIGGER group_role_effective_policy_update
+AFTER UPDATE ON group_role REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE group_role_effective_policy();
+CREATE TRIGGER group_role_effective_policy_delete
+AFTER DELETE ON group_role REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE group_role_effective_policy();
+
+CREATE TRIGGER role_policy_effective_policy_insert
+AFTER INSERT ON role_policy REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE role_policy_effective_policy();
+CREATE TRIGGER role_policy_effective_policy_update
+AFTER UPDATE ON role_policy REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE role_policy_effective_policy();
+CREATE TRIGGER role_policy_effective_policy_delete
+AFTER DELETE ON role_policy REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE role_policy_effective_policy();
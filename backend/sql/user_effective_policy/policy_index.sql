@@ -0,0 +1 @@
+CREATE INDEX user_effective_policy_policy_index ON user_effective_policy (policy_id, user_id);
@@ -0,0 +1,5 @@
+DELETE FROM user_group
+USING user_group AS kept
+WHERE kept.user_id=user_group.user_id
+    AND kept.group_id=user_group.group_id
+    AND kept.id<user_group.id;
\ No newline at end of file
@@ -0,0 +1,5 @@
+DELETE FROM user_group
+USING (VALUES %s) AS pairs(user_id, group_id)
+WHERE user_group.user_id=pairs.user_id
+    AND user_group.group_id=pairs.group_id
+RETURNING user_group.user_id, user_group.group_id;
@@ -0,0 +1,5 @@
+INSERT INTO user_group(user_id, group_id)
+SELECT pairs.user_id, pairs.group_id
+FROM (VALUES %s) AS pairs(user_id, group_id)
+ON CONFLICT (user_id, group_id) DO NOTHING
+RETURNING user_id, group_id;
\ No newline at end of file
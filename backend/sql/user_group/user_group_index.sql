@@ -0,0 +1 @@
+CREATE UNIQUE INDEX user_group_index ON user_group (user_id, group_id);
\ No newline at end of file
@@ -0,0 +1,8 @@
+COPY user_import(
+    line,
+    first_name,
+    last_name,
+    middle_name,
+    email,
+    password
+) FROM STDIN WITH (FORMAT csv);
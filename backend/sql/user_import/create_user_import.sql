@@ -0,0 +1,8 @@
+CREATE TEMPORARY TABLE user_import(
+    line INTEGER PRIMARY KEY NOT NULL,
+    first_name VARCHAR(100) NOT NULL,
+    last_name VARCHAR(200) NOT NULL,
+    middle_name VARCHAR(200),
+    email VARCHAR(200) NOT NULL,
+    password VARCHAR(256) NOT NULL
+) ON COMMIT DROP;
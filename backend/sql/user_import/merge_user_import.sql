@@ -0,0 +1,34 @@
+WITH inserted AS (
+    INSERT INTO "user"(
+        first_name,
+        last_name,
+        middle_name,
+        email,
+        password,
+        register_date,
+        near_manager_id,
+        department_id,
+        unit_id,
+        position_id
+    )
+    SELECT
+        first_name,
+        last_name,
+        middle_name,
+        email,
+        password,
+        NOW(),
+        null,
+        null,
+        null,
+        null
+    FROM user_import
+    ORDER BY line
+    ON CONFLICT (email) DO NOTHING
+    RETURNING id, email
+)
+SELECT user_import.line, user_import.email, inserted.id
+FROM user_import
+LEFT JOIN inserted
+    ON (inserted.email=user_import.email)
+ORDER BY user_import.line;
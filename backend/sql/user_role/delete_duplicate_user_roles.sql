@@ -0,0 +1,5 @@
+DELETE FROM user_role
+USING user_role AS kept
+WHERE kept.user_id=user_role.user_id
+    AND kept.role_id=user_role.role_id
+    AND kept.id<user_role.id;
\ No newline at end of file
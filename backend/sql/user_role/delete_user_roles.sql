@@ -0,0 +1,5 @@
+DELETE FROM user_role
+USING (VALUES %s) AS pairs(user_id, role_id)
+WHERE user_role.user_id=pairs.user_id
+    AND user_role.role_id=pairs.role_id
+RETURNING user_role.user_id, user_role.role_id;
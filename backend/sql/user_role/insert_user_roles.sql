@@ -0,0 +1,5 @@
+INSERT INTO user_role(user_id, role_id)
+SELECT pairs.user_id, pairs.role_id
+FROM (VALUES %s) AS pairs(user_id, role_id)
+ON CONFLICT (user_id, role_id) DO NOTHING
+RETURNING user_id, role_id;
\ No newline at end of file
@@ -0,0 +1 @@
+CREATE UNIQUE INDEX user_role_index ON user_role (user_id, role_id);
\ No newline at end of file
@@ -0,0 +1,115 @@
+import csv
+import io
+import json
+import zlib
+from http import HTTPStatus
+from typing import Dict, Iterable, Iterator, Sequence
+
+from flask import Response, stream_with_context
+
+ROWS_PER_CHUNK = 500
+
+
+def json_array_chunks(rows: Iterable[Dict]) -> Iterator[str]:
+    """
+    Serialize rows as JSON array piece by piece, 'ROWS_PER_CHUNK' rows per chunk
+    """
+
+    chunk = ["["]
+    separator = ""
+
+    for index, row in enumerate(rows, start=1):
+        chunk.append(separator)
+        chunk.append(json.dumps(row, default=str))
+        separator = ","
+
+        if index % ROWS_PER_CHUNK == 0:
+            yield "".join(chunk)
+            chunk = []
+
+    chunk.append("]")
+    yield "".join(chunk)
+
+
+def stream_json_array(rows: Iterable[Dict], status: int = HTTPStatus.OK) -> Response:
+    """
+    Chunked JSON response which keeps request context (and its database
+    connection) alive until the last row is sent
+    """
+
+    return Response(
+        stream_with_context(json_array_chunks(rows)),
+        status=status,
+        mimetype="application/json",
+    )
+
+
+def ndjson_chunks(rows: Iterable[Dict], columns: Sequence[str]) -> Iterator[str]:
+    """
+    Serialize 'columns' of rows as newline delimited JSON, one object per line
+    """
+
+    chunk = []
+
+    for index, row in enumerate(rows, start=1):
+        chunk.append(
+            json.dumps({column: row[column] for column in columns}, default=str)
+        )
+        chunk.append("\n")
+
+        if index % ROWS_PER_CHUNK == 0:
+            yield "".join(chunk)
+            chunk = []
+
+    if chunk:
+        yield "".join(chunk)
+
+
+def csv_chunks(rows: Iterable[Dict], columns: Sequence[str]) -> Iterator[str]:
+    """
+    Serialize 'columns' of rows as CSV with header line
+    """
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+
+    for index, row in enumerate(rows, start=1):
+        writer.writerow([row[column] for column in columns])
+
+        if index % ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+
+def gzip_chunks(chunks: Iterable[str]) -> Iterator[bytes]:
+    """
+    Compress text chunks into single gzip member as they come
+    """
+
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+
+    for chunk in chunks:
+        if data := compressor.compress(chunk.encode()):
+            yield data
+
+    yield compressor.flush()
+
+
+def stream_file(
+    chunks: Iterable, mimetype: str, filename: str, status: int = HTTPStatus.OK
+) -> Response:
+    """
+    Chunked attachment response, request context is kept like in
+    'stream_json_array'
+    """
+
+    return Response(
+        stream_with_context(chunks),
+        status=status,
+        mimetype=mimetype,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,117 @@
+import os
+import sys
+from typing import Tuple
+
+import psycopg2
+import pytest
+from flask import Flask
+
+# Backend modules import each other by top-level names
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from enums import Permission  # noqa: E402
+from models.postgresql_handler import (  # noqa: E402
+    PostgreSQLHandler,
+    load_database_connection_settings,
+    split_connection_settings,
+)
+
+
+@pytest.fixture
+def app():
+    return Flask(__name__)
+
+
+@pytest.fixture(scope="session")
+def connection_settings():
+    """
+    'psycopg2.connect' arguments of database from 'db_connection_setting.json'.
+    Tests using database are skipped when it can not be reached
+    """
+
+    settings, _ = split_connection_settings(load_database_connection_settings())
+
+    try:
+        psycopg2.connect(**settings).close()
+    except psycopg2.OperationalError as error:
+        pytest.skip(f"PostgreSQL is not available: {error}")
+
+    return settings
+
+
+class Rows:
+    """
+    Test rows written through unit of work cursor
+    """
+
+    def __init__(self, cursor) -> None:
+        self.cursor = cursor
+
+    def insert(self, table: str, **values) -> int:
+        columns = ", ".join(f'"{column}"' for column in values)
+        placeholders = ", ".join(["%s"] * len(values))
+        self.cursor.execute(
+            f'INSERT INTO "{table}" ({columns}) VALUES ({placeholders}) RETURNING id',
+            tuple(values.values()),
+        )
+
+        return self.cursor.fetchone()[0]
+
+    def user(self, email: str, **values) -> int:
+        # Reference columns default to sequences, not NULL
+        defaults = {
+            "first_name": "First",
+            "last_name": "Last",
+            "middle_name": "Middle",
+            "password": "hash",
+            "near_manager_id": None,
+            "department_id": None,
+            "unit_id": None,
+            "position_id": None,
+        }
+
+        return self.insert("user", email=email, **{**defaults, **values})
+
+    def department(self, name: str) -> int:
+        return self.insert("department", name=name, description=None, head_id=None)
+
+    def policy_id(self, permission: Permission) -> int:
+        return self.value("SELECT id FROM policy WHERE title=%s;", (permission.value,))
+
+    def role(self, name: str, *grants: Tuple[Permission, int]) -> int:
+        """
+        Role granting every '(permission, department_id)' pair
+        """
+
+        role_id = self.insert("role", name=name, description=None)
+
+        for permission, department_id in grants:
+            self.insert(
+                "role_policy",
+                role_id=role_id,
+                policy_id=self.policy_id(permission),
+                department_id=department_id,
+            )
+
+        return role_id
+
+    def value(self, query: str, parameters=None):
+        self.cursor.execute(query, parameters)
+
+        return self.cursor.fetchone()[0]
+
+
+@pytest.fixture
+def database(connection_settings):
+    """
+    Unit of work on test database, rolled back after test, so tests may
+    write freely
+    """
+
+    PostgreSQLHandler.begin()
+
+    try:
+        yield Rows(PostgreSQLHandler().cursor)
+    finally:
+        PostgreSQLHandler.finish(commit=False)
+        PostgreSQLHandler.release_connection()
@@ -0,0 +1,144 @@
+import asyncio
+import json
+from datetime import timedelta
+
+import pytest
+from app import application as flask_application
+from asgi import application
+from async_routes import async_routes
+from enums import Permission
+from flask_jwt_extended import create_access_token
+from models.async_handler import AsyncPostgreSQLHandler
+from permissions import policy_claims
+
+ADMIN_ID = 1
+
+
+def http_scope(method, path, token):
+    headers = [(b"host", b"testserver")]
+
+    if token is not None:
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+
+
+def asgi_request(path, token=None, method="GET"):
+    """
+    Status and JSON body ASGI application answers request with
+    """
+
+    async def exchange():
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        try:
+            await application(http_scope(method, path, token), receive, send)
+        finally:
+            await AsyncPostgreSQLHandler.close_pool()
+
+        return messages
+
+    start, *bodies = asyncio.run(exchange())
+    body = b"".join(message.get("body", b"") for message in bodies)
+
+    return start["status"], json.loads(body)
+
+
+def wsgi_request(path, token):
+    with flask_application.test_client() as client:
+        response = client.get(path, headers={"Authorization": f"Bearer {token}"})
+
+    return response.status_code, response.get_json()
+
+
+@pytest.fixture
+def token(connection_settings):
+    def issue(user_id, **options):
+        with flask_application.app_context():
+            return create_access_token(
+                identity={"id": user_id, "email": f"{user_id}@test.io"},
+                additional_claims=policy_claims(user_id),
+                **options,
+            )
+
+    return issue
+
+
+def test_routes_match_get_paths_only():
+    endpoint, arguments = async_routes.match("/api/v2/departments/3")
+
+    assert endpoint.permission == Permission.MANAGE_DEPARTMENTS
+    assert endpoint.department_from == "department_id"
+    assert arguments == {"department_id": 3}
+    assert async_routes.match("/api/v2/departments/x") is None
+    assert async_routes.match("/api/v2/batch") is None
+    assert len(async_routes) == 16
+
+
+@pytest.mark.parametrize(
+    "path",
+    ["/api/v2/departments/", "/api/v2/departments/1", "/api/v2/roles/policies/1"],
+)
+def test_async_endpoint_answers_like_flask(token, path):
+    admin_token = token(ADMIN_ID)
+
+    assert asgi_request(path, admin_token) == wsgi_request(path, admin_token)
+
+
+def test_missing_role_is_not_found(token):
+    status, body = asgi_request("/api/v2/roles/999999", token(ADMIN_ID))
+
+    # flask-restx appends its "did you mean" hint to 404 messages
+    flask_status, flask_body = wsgi_request("/api/v2/roles/999999", token(ADMIN_ID))
+
+    assert status == flask_status == 404
+    assert flask_body["message"].startswith(body["message"])
+
+
+def test_missing_token_is_unauthorized():
+    assert asgi_request("/api/v2/departments/") == (
+        401,
+        {"msg": "Missing Authorization Header"},
+    )
+
+
+def test_expired_token_is_unauthorized(token):
+    expired = token(ADMIN_ID, expires_delta=timedelta(seconds=-1))
+
+    assert asgi_request("/api/v2/departments/", expired) == (
+        401,
+        {"msg": "Token has expired"},
+    )
+
+
+def test_user_without_policies_is_forbidden(token):
+    status, body = asgi_request("/api/v2/departments/1", token(999999))
+
+    assert status == 403
+    assert body == wsgi_request("/api/v2/departments/1", token(999999))[1]
+
+
+def test_other_requests_are_served_by_flask(token):
+    status, body = asgi_request("/database-pool", token(ADMIN_ID))
+
+    assert status == 200
+    assert {"size", "in_use", "max_size"} <= set(body)
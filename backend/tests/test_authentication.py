@@ -0,0 +1,145 @@
+import time
+from datetime import timedelta
+
+import authentication
+import pytest
+from authentication import (
+    VerifiedTokens,
+    auth_required,
+    authenticate,
+    current_claims,
+    current_identity,
+    header_token,
+)
+from flask import jsonify, request
+from flask_jwt_extended import (
+    JWTManager,
+    create_access_token,
+    create_refresh_token,
+)
+from flask_jwt_extended.exceptions import InvalidHeaderError, NoAuthorizationError
+
+CONFIG = {"JWT_HEADER_NAME": "Authorization", "JWT_HEADER_TYPE": "Bearer"}
+
+
+def test_verified_tokens_are_least_recently_used():
+    tokens = VerifiedTokens(max_size=2)
+    tokens.put("a", {}, {"sub": 1})
+    tokens.put("b", {}, {"sub": 2})
+    tokens.get("a")
+    tokens.put("c", {}, {"sub": 3})
+
+    assert tokens.get("b") is None
+    assert tokens.get("a") == ({}, {"sub": 1})
+    assert tokens.stats() == {"hits": 2, "misses": 1, "size": 2, "max_size": 2}
+
+
+def test_expired_token_is_verified_again():
+    tokens = VerifiedTokens()
+    tokens.put("a", {}, {"exp": time.time() - 1})
+
+    assert tokens.get("a") is None
+    assert tokens.stats()["size"] == 0
+
+
+@pytest.mark.parametrize(
+    "header, error, message",
+    [
+        ("", NoAuthorizationError, "Missing Authorization Header"),
+        ("  ", NoAuthorizationError, "Missing Authorization Header"),
+        ("Token abc", NoAuthorizationError, "Missing 'Bearer' type"),
+        ("Bearer", InvalidHeaderError, "Bad Authorization header"),
+        ("Bearer a b", InvalidHeaderError, "Bad Authorization header"),
+    ],
+)
+def test_invalid_header(header, error, message):
+    with pytest.raises(error, match=message):
+        header_token(header, CONFIG)
+
+
+def test_header_without_type():
+    assert header_token(" abc ", {**CONFIG, "JWT_HEADER_TYPE": ""}) == "abc"
+    assert header_token("Bearer abc", CONFIG) == "abc"
+
+
+@pytest.fixture
+def client(app, monkeypatch):
+    """
+    Application authenticating requests like the real one, '/identity'
+    answers identity and claims of its access token
+    """
+
+    monkeypatch.setattr(authentication, "verified_tokens", VerifiedTokens())
+    app.config["JWT_SECRET_KEY"] = "test-secret"
+    JWTManager(app)
+    app.before_request(authenticate)
+
+    @app.route("/identity", methods=["GET", "OPTIONS"])
+    @auth_required()
+    def identity():
+        if request.method == "OPTIONS":
+            return jsonify({})
+
+        return jsonify(
+            {"identity": current_identity(), "policies": current_claims()["policies"]}
+        )
+
+    return app.test_client()
+
+
+@pytest.fixture
+def tokens(app):
+    def issue(refresh=False, **options):
+        with app.app_context():
+            if refresh:
+                return create_refresh_token(identity={"id": 7})
+
+            return create_access_token(
+                identity={"id": 7}, additional_claims={"policies": 5}, **options
+            )
+
+    return issue
+
+
+def get(client, token=None, method="get"):
+    headers = {} if token is None else {"Authorization": f"Bearer {token}"}
+    response = getattr(client, method)("/identity", headers=headers)
+
+    return response.status_code, response.get_json()
+
+
+def test_valid_token_is_verified_once(client, tokens):
+    token = tokens()
+
+    assert get(client, token) == (200, {"identity": {"id": 7}, "policies": 5})
+    assert get(client, token) == (200, {"identity": {"id": 7}, "policies": 5})
+    assert authentication.verified_tokens.stats()["hits"] == 1
+
+
+def test_missing_token(client):
+    assert get(client) == (401, {"msg": "Missing Authorization Header"})
+
+
+def test_expired_token(client, tokens):
+    token = tokens(expires_delta=timedelta(seconds=-1))
+
+    assert get(client, token) == (401, {"msg": "Token has expired"})
+
+
+def test_refresh_token_is_rejected(client, tokens):
+    status, body = get(client, tokens(refresh=True))
+
+    assert (status, body) == (422, {"msg": "Only non-refresh tokens are allowed"})
+    assert authentication.verified_tokens.stats()["size"] == 0
+
+
+def test_tampered_token_is_rejected(client, tokens):
+    header, payload, signature = tokens().split(".")
+    status, body = get(client, ".".join((header, payload, signature[::-1])))
+
+    assert status == 422
+    assert authentication.verified_tokens.stats()["size"] == 0
+
+
+def test_options_request_needs_no_token(client):
+    assert client.options("/identity").status_code == 200
@@ -0,0 +1,124 @@
+import pytest
+from authorization_graph import AuthorizationGraph, bit_positions
+from enums import Permission
+from models.rbac_version import rbac_versions
+
+USERS = Permission.MANAGE_USERS
+UNITS = Permission.MANAGE_UNITS
+
+
+def test_bit_positions():
+    assert list(bit_positions(0)) == []
+    assert list(bit_positions(0b1011)) == [0, 1, 3]
+    assert list(bit_positions(1 << 200 | 1 << 64)) == [64, 200]
+
+
+@pytest.fixture
+def organisation(database):
+    """
+    Three users: 'both' holds both permissions in first department through
+    role, 'member' holds 'Manage users' in second department through group,
+    'units' holds 'Manage units' in first department
+    """
+
+    first = database.department("Graph first")
+    second = database.department("Graph second")
+    both_role = database.role("graph-both", (USERS, first), (UNITS, first))
+    member_role = database.role("graph-member", (USERS, second))
+    units_role = database.role("graph-units", (UNITS, first))
+    group_id = database.insert("group", name="graph-group", description=None)
+    database.insert("group_role", group_id=group_id, role_id=member_role)
+
+    users = {}
+
+    for name in ("both", "member", "units"):
+        users[name] = database.user(f"graph-{name}@test.io")
+
+    database.insert("user_role", user_id=users["both"], role_id=both_role)
+    database.insert("user_group", user_id=users["member"], group_id=group_id)
+    database.insert("user_role", user_id=users["units"], role_id=units_role)
+
+    return {
+        **users,
+        "first": first,
+        "second": second,
+        "units_role": units_role,
+        "member_role": member_role,
+    }
+
+
+@pytest.fixture
+def graph(organisation):
+    return AuthorizationGraph()
+
+
+def test_users_holding_permissions(graph, organisation):
+    after = organisation["both"] - 1
+
+    assert graph.users_with(USERS, after=after) == [
+        organisation["both"],
+        organisation["member"],
+    ]
+    assert graph.users_with(UNITS, after=after) == [
+        organisation["both"],
+        organisation["units"],
+    ]
+    assert graph.users_with(USERS, UNITS, after=after) == [organisation["both"]]
+
+
+def test_users_are_paged_by_identifier(graph, organisation):
+    first_page = graph.users_with(USERS, after=organisation["both"] - 1, limit=1)
+    second_page = graph.users_with(USERS, after=first_page[-1], limit=1)
+
+    assert first_page == [organisation["both"]]
+    assert second_page == [organisation["member"]]
+    assert graph.users_with(USERS, after=second_page[-1]) == []
+
+
+def test_count_matches_effective_policies(database, graph):
+    for permission in Permission:
+        expected = database.value(
+            "SELECT count(DISTINCT user_id) FROM user_effective_policy "
+            "WHERE policy_id=%s;",
+            (database.policy_id(permission),),
+        )
+
+        assert graph.count_users_with(permission) == expected
+
+
+def test_department_masks(graph, organisation):
+    versions = rbac_versions.select_versions(organisation["member"])
+
+    assert graph.has_permission(organisation["member"], USERS, versions)
+    assert graph.granted_departments(organisation["both"], USERS) == [
+        organisation["first"]
+    ]
+    assert graph.granted_departments(organisation["member"], USERS) == [
+        organisation["second"]
+    ]
+    assert not graph.has_permission(
+        organisation["member"], USERS, versions, organisation["first"]
+    )
+
+
+def test_granted_role_is_noticed_on_refresh(database, graph, organisation):
+    after = organisation["both"] - 1
+    graph.users_with(USERS)
+    database.insert(
+        "user_role", user_id=organisation["units"], role_id=organisation["member_role"]
+    )
+
+    assert organisation["units"] in graph.users_with(USERS, after=after)
+    assert graph.stats()["user_reloads"] == 1
+    assert graph.stats()["full_loads"] == 1
+
+
+def test_revoked_policy_is_noticed_on_refresh(database, graph, organisation):
+    after = organisation["both"] - 1
+    graph.users_with(UNITS)
+    database.cursor.execute(
+        "DELETE FROM role_policy WHERE role_id=%s;", (organisation["units_role"],)
+    )
+
+    assert graph.users_with(UNITS, after=after) == [organisation["both"]]
+    assert graph.stats()["layer_reloads"] == 2
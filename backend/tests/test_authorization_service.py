@@ -0,0 +1,136 @@
+import permissions
+import pytest
+from authorization_graph import authorization_graph
+from enums import Permission
+from http_exception import HTTPException
+from permission_cache import PermissionCache, VersionCache
+from services import authorization_service as service
+
+USERS = Permission.MANAGE_USERS
+UNITS = Permission.MANAGE_UNITS
+
+
+@pytest.fixture
+def staff(database, monkeypatch):
+    """
+    'manager' holds 'Manage users' in first department, 'clerk' holds
+    'Manage units' in second one
+    """
+
+    monkeypatch.setattr(permissions, "permission_cache", PermissionCache())
+    monkeypatch.setattr(permissions, "version_cache", VersionCache())
+
+    first = database.department("Check first")
+    second = database.department("Check second")
+    manager = database.user("check-manager@test.io")
+    clerk = database.user("check-clerk@test.io")
+    database.insert(
+        "user_role",
+        user_id=manager,
+        role_id=database.role("check-manager", (USERS, first)),
+    )
+    database.insert(
+        "user_role",
+        user_id=clerk,
+        role_id=database.role("check-clerk", (UNITS, second)),
+    )
+
+    yield {"manager": manager, "clerk": clerk, "first": first, "second": second}
+
+    authorization_graph.invalidate()
+
+
+def check(user_id, permission, department_id=None):
+    return {
+        "user_id": user_id,
+        "permission": permission.value,
+        "department_id": department_id,
+    }
+
+
+def answers(response):
+    return [result["allowed"] for result in response["results"]]
+
+
+def test_user_checks_own_permissions(staff):
+    clerk = staff["clerk"]
+    response = service.check_permissions(
+        {
+            "checks": [
+                check(clerk, UNITS),
+                check(clerk, UNITS, staff["second"]),
+                check(clerk, UNITS, staff["first"]),
+                check(clerk, USERS),
+            ]
+        },
+        {"id": clerk},
+    )
+
+    assert answers(response) == [True, True, False, False]
+    assert response["results"][1] == check(clerk, UNITS, staff["second"]) | {
+        "allowed": True
+    }
+
+
+def test_checks_of_others_need_manage_users(staff):
+    with pytest.raises(HTTPException) as error:
+        service.check_permissions(
+            {"checks": [check(staff["manager"], USERS)]}, {"id": staff["clerk"]}
+        )
+
+    assert error.value.status_code == 403
+
+
+def test_policies_are_loaded_once_per_user(staff, monkeypatch):
+    loaded = []
+    permission_masks = service.permission_masks
+
+    def counted(user_id, versions):
+        loaded.append(user_id)
+
+        return permission_masks(user_id, versions)
+
+    monkeypatch.setattr(service, "permission_masks", counted)
+    manager, clerk = staff["manager"], staff["clerk"]
+
+    response = service.check_permissions(
+        {
+            "checks": [
+                check(clerk, UNITS, staff["second"]),
+                check(manager, USERS, staff["first"]),
+                check(clerk, USERS),
+                check(manager, UNITS),
+            ]
+        },
+        {"id": manager},
+    )
+
+    assert answers(response) == [True, True, False, False]
+    assert sorted(loaded) == sorted([manager, clerk])
+
+
+@pytest.mark.parametrize(
+    "body, status",
+    [
+        ({}, 400),
+        ({"checks": {}}, 400),
+        ({"checks": [1]}, 400),
+        ({"checks": [{"user_id": 1}]}, 400),
+        ({"checks": [{"user_id": "1", "permission": "Manage users"}]}, 422),
+        ({"checks": [{"user_id": 1, "permission": "Manage everything"}]}, 422),
+        (
+            {
+                "checks": [
+                    {"user_id": 1, "permission": "Manage users", "department_id": 0}
+                ]
+            },
+            422,
+        ),
+        ({"checks": [check(1, USERS)] * (service.MAX_CHECKS + 1)}, 400),
+    ],
+)
+def test_invalid_checks(body, status):
+    with pytest.raises(HTTPException) as error:
+        service.check_permissions(body, {"id": 1})
+
+    assert error.value.status_code == status
@@ -0,0 +1,154 @@
+import threading
+
+import pytest
+from flask import g
+from models.postgresql_handler import PostgreSQLHandler
+from psycopg2.extensions import TRANSACTION_STATUS_INTRANS
+from services import batch_service
+
+
+class Connection:
+    """
+    Database connection counting transactions finished on it
+    """
+
+    closed = False
+
+    def __init__(self) -> None:
+        self.commits = 0
+        self.rollbacks = 0
+
+    def commit(self) -> None:
+        self.commits += 1
+
+    def rollback(self) -> None:
+        self.rollbacks += 1
+
+    def get_transaction_status(self) -> int:
+        return TRANSACTION_STATUS_INTRANS
+
+
+class Endpoints:
+    """
+    Batch item endpoints writing through model the way services do:
+    '/ok' writes, '/fail' fails its statement and '/invalid' rejects
+    request before writing anything
+    """
+
+    def __init__(self) -> None:
+        self.model = PostgreSQLHandler()
+        self.dispatched = []
+        self.committed = []
+
+    def dispatch(self, method, path, body):
+        self.dispatched.append(path)
+
+        if path.endswith("/ok"):
+            self.model.after_commit(self.committed.append, path)
+            self.model.commit()
+            return 201, {}
+
+        if path.endswith("/fail"):
+            self.model.rollback()
+            return 422, {"message": "Invalid data"}
+
+        return 400, {"message": "Incorrect body content"}
+
+
+@pytest.fixture
+def connection(monkeypatch):
+    checked_out = Connection()
+    monkeypatch.setattr(PostgreSQLHandler, "_local", threading.local())
+    PostgreSQLHandler._local.connection = checked_out
+
+    return checked_out
+
+
+@pytest.fixture
+def endpoints(app, monkeypatch):
+    items = Endpoints()
+    monkeypatch.setattr(batch_service, "dispatch", items.dispatch)
+
+    with app.app_context():
+        yield items
+
+
+def batch_request(atomic, *paths, method="POST"):
+    """
+    Run batch inside unit of work of batch request, as request hooks do
+    """
+
+    body = {
+        "atomic": atomic,
+        "items": [{"method": method, "path": f"/api/v2{path}"} for path in paths],
+    }
+
+    PostgreSQLHandler.begin()
+
+    try:
+        response = batch_service.run_batch(body)
+    except Exception:
+        PostgreSQLHandler.finish(commit=False)
+        raise
+
+    assert PostgreSQLHandler._local.depth == 1
+    PostgreSQLHandler.finish()
+
+    return response
+
+
+def statuses(response):
+    return [result["status"] for result in response["results"]]
+
+
+def test_atomic_batch_commits_once(connection, endpoints):
+    response = batch_request(True, "/ok", "/ok")
+
+    assert response["committed"] is True
+    assert statuses(response) == [201, 201]
+    assert connection.commits == 1
+    assert endpoints.committed == ["/api/v2/ok", "/api/v2/ok"]
+
+
+def test_atomic_batch_rolls_back_on_failed_statement(connection, endpoints):
+    response = batch_request(True, "/ok", "/fail", "/ok")
+
+    assert response["committed"] is False
+    assert statuses(response) == [201, 422, 424]
+    assert endpoints.dispatched == ["/api/v2/ok", "/api/v2/fail"]
+    assert connection.commits == 0
+    assert connection.rollbacks >= 1
+    assert endpoints.committed == []
+
+
+def test_atomic_batch_rolls_back_on_rejected_item(connection, endpoints):
+    response = batch_request(True, "/ok", "/invalid")
+
+    assert response["committed"] is False
+    assert statuses(response) == [201, 400]
+    assert connection.commits == 0
+    assert connection.rollbacks == 1
+    assert endpoints.committed == []
+
+
+def test_batch_items_commit_on_their_own(connection, endpoints):
+    response = batch_request(False, "/ok", "/fail", "/invalid", "/ok")
+
+    assert "committed" not in response
+    assert statuses(response) == [201, 422, 400, 201]
+    assert connection.commits == 2
+    assert endpoints.committed == ["/api/v2/ok", "/api/v2/ok"]
+
+
+def test_writing_item_forgets_memoized_permissions(connection, endpoints):
+    g.rbac_versions = (1, 1)
+    g.permission_decisions = {("Manage roles", None): True}
+
+    batch_request(False, "/ok", method="GET")
+
+    assert "permission_decisions" in g
+
+    batch_request(False, "/ok")
+
+    assert "rbac_versions" not in g
+    assert "permission_decisions" not in g
@@ -0,0 +1,143 @@
+import queue
+import time
+
+import psycopg2
+import pytest
+from models.change_listener import ChangeListener, change_listener
+from models.postgresql_handler import PostgreSQLHandler
+from models.rbac_events import ANY_TABLE, RBACChange, subscribe, unsubscribe
+
+EVENT_TIMEOUT = 5.0
+
+
+def stop(listener, timeout=10.0):
+    """
+    Stop listener and wait until it closes its connection
+    """
+
+    listener.stop()
+    deadline = time.monotonic() + timeout
+
+    while listener.stats()["listening"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def events(connection_settings, monkeypatch):
+    """
+    Changes published by fresh listener, which polls often so it stops fast
+    """
+
+    # Listener started by application requests would publish the same events
+    stop(change_listener)
+    monkeypatch.setattr(change_listener, "_pid", None)
+    monkeypatch.setitem(
+        PostgreSQLHandler.settings(),
+        "events",
+        {"listen": True, "poll_interval": 0.05, "reconnect_delay": 0.05},
+    )
+
+    published = queue.Queue()
+    subscribe(published.put)
+    listener = ChangeListener()
+    listener.ensure_started()
+
+    assert published.get(timeout=EVENT_TIMEOUT) == RBACChange(ANY_TABLE)
+
+    yield listener, published
+
+    stop(listener)
+    unsubscribe(published.put)
+
+
+@pytest.fixture
+def session(connection_settings):
+    """
+    Connection of another process committing changes
+    """
+
+    other = psycopg2.connect(**connection_settings)
+
+    yield other
+
+    other.close()
+
+
+def next_change(published):
+    return published.get(timeout=EVENT_TIMEOUT)
+
+
+def test_committed_change_is_published(events, session):
+    _, published = events
+
+    with session, session.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO department (name, head_id) VALUES ('Listener test', NULL) "
+            "RETURNING id;"
+        )
+        department_id = cursor.fetchone()[0]
+
+    assert next_change(published) == RBACChange("department")
+
+    with session, session.cursor() as cursor:
+        cursor.execute("DELETE FROM department WHERE id=%s;", (department_id,))
+
+    assert next_change(published) == RBACChange("department")
+
+
+def test_user_change_carries_user_id(events, session):
+    _, published = events
+
+    with session, session.cursor() as cursor:
+        cursor.execute(
+            'INSERT INTO "user" (first_name, last_name, email, near_manager_id, '
+            "department_id, unit_id, position_id) "
+            "VALUES ('Listener', 'Test', 'listener@test.io', NULL, NULL, NULL, NULL) "
+            "RETURNING id;"
+        )
+        user_id = cursor.fetchone()[0]
+        cursor.execute(
+            "INSERT INTO user_role (user_id, role_id) "
+            "VALUES (%s, (SELECT min(id) FROM role));",
+            (user_id,),
+        )
+
+    assert next_change(published) == RBACChange("user_role", user_id)
+
+    with session, session.cursor() as cursor:
+        cursor.execute("DELETE FROM user_role WHERE user_id=%s;", (user_id,))
+        cursor.execute('DELETE FROM "user" WHERE id=%s;', (user_id,))
+
+    assert {next_change(published), next_change(published)} == {
+        RBACChange("user_role", user_id),
+        RBACChange("user", user_id),
+    }
+
+
+def test_rolled_back_change_is_not_published(events, session):
+    _, published = events
+
+    with session.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO department (name, head_id) VALUES ('Listener test', NULL);"
+        )
+
+    session.rollback()
+
+    with session, session.cursor() as cursor:
+        cursor.execute("""SELECT pg_notify('cache_events', '{"table": "unit"}');""")
+
+    assert next_change(published) == RBACChange("unit")
+
+
+def test_malformed_event_is_counted(events, session):
+    listener, published = events
+
+    with session, session.cursor() as cursor:
+        cursor.execute("SELECT pg_notify('cache_events', 'not json');")
+        cursor.execute("""SELECT pg_notify('cache_events', '{"user_id": 1}');""")
+        cursor.execute("""SELECT pg_notify('cache_events', '{"table": "role"}');""")
+
+    assert next_change(published) == RBACChange("role")
+    assert listener.stats()["malformed"] == 2
+    assert listener.stats()["events"] == 1
@@ -0,0 +1,109 @@
+import threading
+
+import psycopg2
+import pytest
+from models.postgresql_handler import ConnectionPool, PoolTimeoutError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+
+@pytest.fixture
+def pool(connection_settings):
+    connection_pool = ConnectionPool(
+        connection_settings, min_size=1, max_size=2, timeout=0.2
+    )
+    connection_pool.open()
+
+    yield connection_pool
+
+    connection_pool.close()
+
+
+def test_open_fills_min_size(pool):
+    stats = pool.stats()
+
+    assert stats["size"] == stats["idle"] == 1
+    assert stats["connections_created"] == 1
+
+
+def test_exhausted_pool_times_out(pool):
+    first, second = pool.getconn(), pool.getconn()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.getconn()
+
+    stats = pool.stats()
+    assert stats["timeouts"] == 1
+    assert stats["in_use"] == 2
+
+    pool.putconn(first)
+    pool.putconn(second)
+
+    assert pool.stats()["in_use"] == 0
+
+
+def test_waiting_caller_gets_returned_connection(pool):
+    held = [pool.getconn(), pool.getconn()]
+    received = []
+    waiter = threading.Thread(target=lambda: received.append(pool.getconn(2.0)))
+    waiter.start()
+
+    threading.Timer(0.1, pool.putconn, (held[0],)).start()
+    waiter.join(3.0)
+
+    assert received == [held[0]]
+    assert pool.stats()["wait_time_max"] >= 0.1
+
+    pool.putconn(received[0])
+    pool.putconn(held[1])
+
+
+def test_connection_is_returned_idle(pool):
+    checked_out = pool.getconn()
+
+    with checked_out.cursor() as cursor:
+        cursor.execute("SELECT 1;")
+
+    pool.putconn(checked_out)
+
+    assert checked_out.get_transaction_status() == TRANSACTION_STATUS_IDLE
+    assert pool.getconn() is checked_out
+    pool.putconn(checked_out)
+
+
+def test_discarded_connection_is_closed(pool):
+    checked_out = pool.getconn()
+    pool.putconn(checked_out, discard=True)
+
+    stats = pool.stats()
+    assert checked_out.closed
+    assert stats["size"] == 0
+    assert stats["connections_closed"] == 1
+
+
+def test_terminated_connection_is_replaced(connection_settings):
+    pool = ConnectionPool(connection_settings, max_size=1, ping_interval=0)
+    checked_out = pool.getconn()
+
+    with checked_out.cursor() as cursor:
+        cursor.execute("SELECT pg_backend_pid();")
+        backend = cursor.fetchone()[0]
+
+    pool.putconn(checked_out)
+
+    other = psycopg2.connect(**connection_settings)
+
+    with other, other.cursor() as cursor:
+        cursor.execute("SELECT pg_terminate_backend(%s);", (backend,))
+
+    other.close()
+
+    replacement = pool.getconn()
+
+    with replacement.cursor() as cursor:
+        cursor.execute("SELECT 1;")
+
+    assert replacement is not checked_out
+    assert pool.stats()["failed_pings"] == 1
+
+    pool.putconn(replacement)
+    pool.close()
@@ -0,0 +1,148 @@
+import pytest
+from enums import Permission
+from models.effective_policy import effective_policies
+
+USERS = Permission.MANAGE_USERS
+UNITS = Permission.MANAGE_UNITS
+
+
+def effective(database, user_id):
+    database.cursor.execute(
+        "SELECT policy.title, user_effective_policy.department_id "
+        "FROM user_effective_policy "
+        "INNER JOIN policy ON (policy.id=user_effective_policy.policy_id) "
+        "WHERE user_id=%s;",
+        (user_id,),
+    )
+
+    return set(database.cursor.fetchall())
+
+
+@pytest.fixture
+def department(database):
+    return database.department("Effective policy test")
+
+
+def test_user_role_grants_role_policies(database, department):
+    user_id = database.user("effective@test.io")
+    role_id = database.role("effective-role", (USERS, department), (UNITS, department))
+    user_role_id = database.insert("user_role", user_id=user_id, role_id=role_id)
+
+    assert effective(database, user_id) == {
+        (USERS.value, department),
+        (UNITS.value, department),
+    }
+
+    database.cursor.execute("DELETE FROM user_role WHERE id=%s;", (user_role_id,))
+
+    assert effective(database, user_id) == set()
+
+
+def test_group_grants_follow_group_roles(database, department):
+    user_id = database.user("effective@test.io")
+    group_id = database.insert("group", name="effective-group", description=None)
+    database.insert("user_group", user_id=user_id, group_id=group_id)
+    role_id = database.role("effective-role", (USERS, department))
+
+    assert effective(database, user_id) == set()
+
+    group_role_id = database.insert("group_role", group_id=group_id, role_id=role_id)
+
+    assert effective(database, user_id) == {(USERS.value, department)}
+
+    database.cursor.execute("DELETE FROM group_role WHERE id=%s;", (group_role_id,))
+
+    assert effective(database, user_id) == set()
+
+
+def test_policy_moved_to_other_department(database, department):
+    other_department = database.department("Effective policy other")
+    user_id = database.user("effective@test.io")
+    role_id = database.role("effective-role", (USERS, department))
+    database.insert("user_role", user_id=user_id, role_id=role_id)
+
+    database.cursor.execute(
+        "UPDATE role_policy SET department_id=%s WHERE role_id=%s;",
+        (other_department, role_id),
+    )
+
+    assert effective(database, user_id) == {(USERS.value, other_department)}
+
+
+def test_policy_granted_twice_survives_one_revocation(database, department):
+    user_id = database.user("effective@test.io")
+    direct_role = database.role("effective-direct", (USERS, department))
+    group_role = database.role("effective-group-role", (USERS, department))
+    group_id = database.insert("group", name="effective-group", description=None)
+    database.insert("group_role", group_id=group_id, role_id=group_role)
+    database.insert("user_group", user_id=user_id, group_id=group_id)
+    user_role_id = database.insert("user_role", user_id=user_id, role_id=direct_role)
+
+    database.cursor.execute("DELETE FROM user_role WHERE id=%s;", (user_role_id,))
+
+    assert effective(database, user_id) == {(USERS.value, department)}
+
+
+def test_multi_row_statement_refreshes_every_user(database, department):
+    user_ids = [database.user(f"effective-{index}@test.io") for index in range(3)]
+    role_id = database.role("effective-role", (UNITS, department))
+
+    database.cursor.execute(
+        "INSERT INTO user_role (user_id, role_id) SELECT unnest(%s::bigint[]), %s;",
+        (user_ids, role_id),
+    )
+
+    for user_id in user_ids:
+        assert effective(database, user_id) == {(UNITS.value, department)}
+
+    database.cursor.execute("DELETE FROM role_policy WHERE role_id=%s;", (role_id,))
+
+    assert all(effective(database, user_id) == set() for user_id in user_ids)
+
+
+def test_rbac_versions_are_bumped(database, department):
+    user_id = database.user("effective@test.io")
+    role_id = database.role("effective-role", (USERS, department))
+
+    def version(version_user_id):
+        return database.value(
+            "SELECT COALESCE(max(version), 0) FROM rbac_version WHERE user_id=%s;",
+            (version_user_id,),
+        )
+
+    global_version = version(0)
+    database.insert("user_role", user_id=user_id, role_id=role_id)
+
+    assert version(user_id) == 1
+    assert version(0) == global_version
+
+    database.cursor.execute("DELETE FROM role_policy WHERE role_id=%s;", (role_id,))
+
+    assert version(user_id) == 1
+    assert version(0) == global_version + 1
+
+
+def test_inconsistency_is_found_and_repaired(database, department):
+    user_id = database.user("effective@test.io")
+    role_id = database.role("effective-role", (USERS, department))
+    database.insert("user_role", user_id=user_id, role_id=role_id)
+
+    assert effective_policies.select_inconsistencies() == []
+
+    database.cursor.execute(
+        "DELETE FROM user_effective_policy WHERE user_id=%s;", (user_id,)
+    )
+
+    assert effective_policies.select_inconsistencies() == [
+        {
+            "problem": "missing",
+            "user_id": user_id,
+            "policy_id": database.policy_id(USERS),
+            "department_id": department,
+        }
+    ]
+    assert effective_policies.backfill() == database.value(
+        "SELECT count(*) FROM user_effective_policy;"
+    )
+    assert effective_policies.select_inconsistencies() == []
+    assert effective(database, user_id) == {(USERS.value, department)}
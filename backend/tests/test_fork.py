@@ -0,0 +1,72 @@
+import json
+import os
+
+from models.department import departments
+from models.postgresql_handler import PostgreSQLHandler
+
+
+def run_in_child(function):
+    """
+    Result of 'function' called in forked process, passed back as JSON
+    """
+
+    read_end, write_end = os.pipe()
+    child = os.fork()
+
+    if child == 0:
+        os.close(read_end)
+        status = 1
+
+        try:
+            with os.fdopen(write_end, "w") as result:
+                json.dump(function(), result)
+            status = 0
+        finally:
+            os._exit(status)
+
+    os.close(write_end)
+
+    with os.fdopen(read_end) as result:
+        output = result.read()
+
+    _, status = os.waitpid(child, 0)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+
+    return json.loads(output)
+
+
+def test_child_opens_its_own_connections(database):
+    parent_pool = PostgreSQLHandler.pool()
+    parent_backend = database.cursor.connection.get_backend_pid()
+
+    def child():
+        inherited_pool = PostgreSQLHandler._pool
+        department = departments.select_department_by_id(1)
+        backend = PostgreSQLHandler().connection.get_backend_pid()
+        PostgreSQLHandler.release_connection()
+
+        return {
+            "inherited_pool": inherited_pool is not None,
+            "new_pool": PostgreSQLHandler.pool() is not parent_pool,
+            "department": department["id"],
+            "backend": backend,
+        }
+
+    result = run_in_child(child)
+
+    assert result["inherited_pool"] is False
+    assert result["new_pool"] is True
+    assert result["department"] == 1
+    assert result["backend"] != parent_backend
+
+
+def test_parent_session_survives_child_exit(database):
+    database.cursor.execute("SET LOCAL application_name = 'fork-test';")
+    backend = database.cursor.connection.get_backend_pid()
+
+    assert run_in_child(lambda: PostgreSQLHandler._local.__dict__ == {}) is True
+
+    assert database.cursor.connection.get_backend_pid() == backend
+    assert database.value("SHOW application_name;") == "fork-test"
+    assert departments.select_department_by_id(1)["id"] == 1
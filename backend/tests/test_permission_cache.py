@@ -0,0 +1,132 @@
+import permissions
+import pytest
+from enums import Permission
+from models.rbac_events import RBACChange
+from models.rbac_version import rbac_versions
+from permission_cache import PermissionCache, VersionCache
+
+POLICIES = {"Manage users": frozenset({1})}
+
+
+def cached(cache, user_id, policies=POLICIES, versions=None):
+    cache.put(user_id, policies, cache.generation(user_id), versions)
+
+
+def test_entry_is_served_until_it_expires():
+    cache = PermissionCache(ttl=60.0)
+    cached(cache, 1)
+
+    assert cache.get(1) == POLICIES
+
+    cache.ttl = 0.0
+    cached(cache, 1)
+
+    assert cache.get(1) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_entry_of_other_versions_is_dropped():
+    cache = PermissionCache()
+    cached(cache, 1, versions=(3, 7))
+
+    assert cache.get(1, (3, 7)) == POLICIES
+    assert cache.get(1, (4, 7)) is None
+    assert cache.get(1, (3, 7)) is None
+    assert cache.stats()["outdated"] == 1
+
+
+def test_policies_loaded_before_invalidation_are_not_cached():
+    cache = PermissionCache()
+    generation = cache.generation(1)
+    cache.invalidate("1")
+    cache.put(1, POLICIES, generation)
+
+    other_generation = cache.generation(2)
+    cache.invalidate()
+    cache.put(2, POLICIES, other_generation)
+
+    assert cache.get(1) is None
+    assert cache.get(2) is None
+    assert cache.stats()["stale_writes"] == 2
+
+
+def test_invalidation_of_user_keeps_other_users():
+    cache = PermissionCache()
+    cached(cache, 1)
+    cached(cache, 2)
+
+    cache.handle_change(RBACChange("user_role", 1))
+    cache.handle_change(RBACChange("department"))
+
+    assert cache.get(1) is None
+    assert cache.get(2) == POLICIES
+
+
+def test_oldest_entry_is_evicted():
+    cache = PermissionCache(max_size=2)
+
+    for user_id in (1, 2, 3):
+        cached(cache, user_id)
+
+    assert cache.get(1) is None
+    assert cache.get(3) == POLICIES
+    assert cache.stats()["size"] == 2
+
+
+def test_version_cache():
+    cache = VersionCache(ttl=60.0)
+    cache.put(1, (1, 2))
+    cache.put(2, (1, 5))
+    cache.handle_change(RBACChange("user_group", 1))
+
+    assert cache.get(1) is None
+    assert cache.get(2) == (1, 5)
+
+    cache.handle_change(RBACChange("*"))
+
+    assert cache.get(2) is None
+
+
+@pytest.fixture
+def permission_cache(monkeypatch):
+    cache = PermissionCache()
+    monkeypatch.setattr(permissions, "permission_cache", cache)
+
+    return cache
+
+
+def test_effective_policies_are_loaded_once(database, permission_cache):
+    department_id = database.department("Cache test")
+    user_id = database.user("cache@test.io")
+    role_id = database.role("cache-test", (Permission.MANAGE_USERS, department_id))
+    database.insert("user_role", user_id=user_id, role_id=role_id)
+    versions = rbac_versions.select_versions(user_id)
+
+    policies = permissions.effective_policies(user_id, versions)
+
+    assert policies == {"Manage users": frozenset({department_id})}
+    assert permissions.effective_policies(user_id, versions) is policies
+    assert permission_cache.stats()["misses"] == 1
+    assert permission_cache.stats()["hits"] == 1
+
+
+def test_grant_of_other_process_is_noticed(database, permission_cache):
+    department_id = database.department("Cache test")
+    user_id = database.user("cache@test.io")
+    role_id = database.role("cache-test", (Permission.MANAGE_USERS, department_id))
+    database.insert("user_role", user_id=user_id, role_id=role_id)
+    permissions.effective_policies(user_id, rbac_versions.select_versions(user_id))
+
+    # Triggers bump global version, as if another worker changed the role
+    database.insert(
+        "role_policy",
+        role_id=role_id,
+        policy_id=database.policy_id(Permission.MANAGE_UNITS),
+        department_id=department_id,
+    )
+    policies = permissions.effective_policies(
+        user_id, rbac_versions.select_versions(user_id)
+    )
+
+    assert set(policies) == {"Manage users", "Manage units"}
+    assert permission_cache.stats()["outdated"] == 1
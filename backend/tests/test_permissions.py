@@ -0,0 +1,113 @@
+import permissions
+import pytest
+from enums import Permission
+from http_exception import HTTPException
+
+
+class Granted(set):
+    """
+    Departments authenticated user is granted policies in, with departments
+    permission was asked for
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.asked = []
+
+    def is_allowed(self, permission_action, department_id) -> bool:
+        self.asked.append(department_id)
+        return department_id in self
+
+
+@pytest.fixture
+def granted(monkeypatch):
+    departments = Granted()
+    monkeypatch.setattr(permissions, "is_allowed", departments.is_allowed)
+
+    return departments
+
+
+@pytest.fixture
+def unit_endpoint():
+    """
+    Endpoint of stored unit, which belongs to department 1
+    """
+
+    stored = {7: 1}
+
+    @permissions.permissions(
+        Permission.MANAGE_UNITS,
+        department_from="department_id",
+        stored_department=lambda view_arguments: stored.get(view_arguments["unit_id"]),
+    )
+    def endpoint(unit_id):
+        return {"id": unit_id}
+
+    return endpoint
+
+
+def test_stored_department_is_checked(app, granted, unit_endpoint):
+    granted.add(2)
+
+    with app.test_request_context("/units/7"):
+        with pytest.raises(HTTPException) as error:
+            unit_endpoint(unit_id=7)
+
+    assert error.value.status_code == 403
+    assert granted.asked == [1]
+
+
+def test_own_department_is_allowed(app, granted, unit_endpoint):
+    granted.add(1)
+
+    with app.test_request_context("/units/7"):
+        assert unit_endpoint(unit_id=7) == {"id": 7}
+
+
+def test_move_needs_target_department(app, granted, unit_endpoint):
+    granted.add(1)
+
+    with app.test_request_context("/units/7", json={"department_id": 2}):
+        with pytest.raises(HTTPException) as error:
+            unit_endpoint(unit_id=7)
+
+    assert error.value.status_code == 403
+    assert granted.asked == [1, 2]
+
+    granted.add(2)
+
+    with app.test_request_context("/units/7", json={"department_id": 2}):
+        assert unit_endpoint(unit_id=7) == {"id": 7}
+
+
+def test_missing_unit_checks_any_department(app, granted, unit_endpoint):
+    granted.add(None)
+
+    with app.test_request_context("/units/8"):
+        assert unit_endpoint(unit_id=8) == {"id": 8}
+
+    assert granted.asked == [None]
+
+
+def test_decisions_are_memoized_per_request(app, granted, unit_endpoint):
+    granted.add(1)
+
+    with app.test_request_context("/units/7"):
+        unit_endpoint(unit_id=7)
+        unit_endpoint(unit_id=7)
+
+    assert granted.asked == [1]
+
+
+def test_checked_departments():
+    def stored(view_arguments):
+        return 1
+
+    assert permissions.checked_departments(None, None, {}) == [None]
+    assert permissions.checked_departments(None, stored, {}) == [1]
+    assert permissions.checked_departments(
+        "department_id", stored, {"department_id": "1"}
+    ) == [1]
+    assert permissions.checked_departments(
+        "department_id", stored, {"department_id": "3"}
+    ) == [1, 3]
@@ -0,0 +1,115 @@
+import permissions
+import pytest
+from authorization_graph import authorization_graph
+from config import CONFIG
+from enums import PERMISSION_BITS, Permission
+from flask import g
+from models.rbac_events import RBACChange
+from models.rbac_version import rbac_versions
+from permission_cache import PermissionCache, VersionCache
+
+USERS_BIT = PERMISSION_BITS[Permission.MANAGE_USERS.value]
+UNITS_BIT = PERMISSION_BITS[Permission.MANAGE_UNITS.value]
+
+
+@pytest.fixture(params=[True, False], ids=["graph", "effective-policies"])
+def grants(request, database, monkeypatch):
+    """
+    User granted 'Manage users' in one department through role and
+    'Manage units' in another one through group
+    """
+
+    monkeypatch.setattr(CONFIG, "AUTHORIZATION_GRAPH", request.param)
+    monkeypatch.setattr(permissions, "permission_cache", PermissionCache())
+    monkeypatch.setattr(permissions, "version_cache", VersionCache())
+
+    users_department = database.department("Claims users")
+    units_department = database.department("Claims units")
+    user_id = database.user("claims@test.io")
+    user_role = database.role(
+        "claims-users", (Permission.MANAGE_USERS, users_department)
+    )
+    group_role = database.role(
+        "claims-units", (Permission.MANAGE_UNITS, units_department)
+    )
+    group_id = database.insert("group", name="claims-group", description=None)
+    database.insert("group_role", group_id=group_id, role_id=group_role)
+    database.insert("user_group", user_id=user_id, group_id=group_id)
+    user_role_id = database.insert("user_role", user_id=user_id, role_id=user_role)
+
+    yield user_id, users_department, units_department, user_role_id
+
+    # Graph compiled from rolled back rows must not outlive the test
+    authorization_graph.invalidate()
+
+
+def test_claims_hold_masks_and_versions(grants):
+    user_id, users_department, units_department, _ = grants
+
+    claims = permissions.policy_claims(user_id)["rbac"]
+
+    assert claims == {
+        "policies": USERS_BIT | UNITS_BIT,
+        "departments": {
+            str(users_department): USERS_BIT,
+            str(units_department): UNITS_BIT,
+        },
+        "version": list(rbac_versions.select_versions(user_id)),
+    }
+
+
+def test_up_to_date_claims_decide(grants):
+    user_id, users_department, units_department, _ = grants
+    claims = permissions.policy_claims(user_id)
+    versions = rbac_versions.select_versions(user_id)
+
+    def decision(permission, department_id=None):
+        return permissions.claims_decision(claims, versions, permission, department_id)
+
+    assert decision(Permission.MANAGE_USERS) is True
+    assert decision(Permission.MANAGE_USERS, users_department) is True
+    assert decision(Permission.MANAGE_USERS, units_department) is False
+    assert decision(Permission.MANAGE_UNITS, units_department) is True
+    assert decision(Permission.MANAGE_ROLES) is False
+
+
+def test_revoked_grant_outdates_claims(app, database, grants):
+    user_id, users_department, _, user_role_id = grants
+    claims = permissions.policy_claims(user_id)
+
+    database.cursor.execute("DELETE FROM user_role WHERE id=%s;", (user_role_id,))
+    # As published after commit of the change
+    permissions.version_cache.handle_change(RBACChange("user_role", user_id))
+    versions = rbac_versions.select_versions(user_id)
+
+    assert list(versions) != claims["rbac"]["version"]
+    assert (
+        permissions.claims_decision(
+            claims, versions, Permission.MANAGE_USERS, users_department
+        )
+        is None
+    )
+
+    with app.app_context():
+        g.identity, g.token_claims = {"id": user_id}, claims
+
+        assert not permissions.is_allowed(Permission.MANAGE_USERS, users_department)
+        assert permissions.is_allowed(Permission.MANAGE_UNITS, None)
+
+
+def test_claims_without_departments_decide_any_department_only(grants):
+    user_id, users_department, _, _ = grants
+    claims = permissions.policy_claims(user_id)
+    del claims["rbac"]["departments"]
+    versions = rbac_versions.select_versions(user_id)
+
+    assert (
+        permissions.claims_decision(claims, versions, Permission.MANAGE_USERS, None)
+        is True
+    )
+    assert (
+        permissions.claims_decision(
+            claims, versions, Permission.MANAGE_USERS, users_department
+        )
+        is None
+    )
@@ -0,0 +1,117 @@
+import pytest
+from authorization_graph import authorization_graph
+from config import CONFIG
+from enums import Permission
+from http_exception import HTTPException
+from services import policies_service
+
+USERS = Permission.MANAGE_USERS
+
+
+@pytest.fixture
+def holders(database):
+    """
+    Users holding 'Manage users': first in both departments through role,
+    second in second department through group, third in first department.
+    Fourth user holds other policy only
+    """
+
+    first = database.department("Holders first")
+    second = database.department("Holders second")
+    both_role = database.role("holders-both", (USERS, first), (USERS, second))
+    second_role = database.role("holders-second", (USERS, second))
+    first_role = database.role("holders-first", (USERS, first))
+    other_role = database.role("holders-other", (Permission.MANAGE_UNITS, first))
+    group_id = database.insert("group", name="holders-group", description=None)
+    database.insert("group_role", group_id=group_id, role_id=second_role)
+
+    user_ids = [database.user(f"holder-{index}@test.io") for index in range(4)]
+    database.insert("user_role", user_id=user_ids[0], role_id=both_role)
+    database.insert("user_group", user_id=user_ids[1], group_id=group_id)
+    database.insert("user_role", user_id=user_ids[2], role_id=first_role)
+    database.insert("user_role", user_id=user_ids[3], role_id=other_role)
+
+    yield {
+        "users": user_ids,
+        "first": first,
+        "second": second,
+        "policy_id": database.policy_id(USERS),
+    }
+
+    authorization_graph.invalidate()
+
+
+@pytest.fixture(params=[True, False], ids=["graph", "sql"])
+def graph_enabled(request, monkeypatch):
+    monkeypatch.setattr(CONFIG, "AUTHORIZATION_GRAPH", request.param)
+
+    return request.param
+
+
+def pages(policy_id, **arguments):
+    """
+    All pages of policy holders, following 'next' of every page
+    """
+
+    arguments = {name: str(value) for name, value in arguments.items()}
+    result = []
+
+    while True:
+        page = policies_service.select_users_with_policy(policy_id, arguments)
+        result.append(page)
+
+        if page["next"] is None:
+            return result
+
+        arguments["after"] = str(page["next"])
+
+
+def test_holders_are_paged(graph_enabled, holders):
+    users = holders["users"]
+    result = pages(holders["policy_id"], after=users[0] - 1, limit=2)
+
+    assert [[user["id"] for user in page["users"]] for page in result] == [
+        users[:2],
+        users[2:3],
+    ]
+    assert [user["granted_in_departments"] for user in result[0]["users"]] == [
+        [holders["first"], holders["second"]],
+        [holders["second"]],
+    ]
+    assert result[0]["users"][0]["email"] == "holder-0@test.io"
+
+
+def test_holders_in_department(graph_enabled, holders):
+    users = holders["users"]
+    (page,) = pages(
+        holders["policy_id"],
+        department_id=holders["first"],
+        after=users[0] - 1,
+        limit=10,
+    )
+
+    assert [user["id"] for user in page["users"]] == [users[0], users[2]]
+
+
+def test_graph_and_sql_pages_are_equal(holders, monkeypatch):
+    def all_holders(graph):
+        monkeypatch.setattr(CONFIG, "AUTHORIZATION_GRAPH", graph)
+
+        return [
+            user
+            for page in pages(holders["policy_id"], limit=3)
+            for user in page["users"]
+        ]
+
+    assert all_holders(True) == all_holders(False)
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [{"after": "-1"}, {"after": "x"}, {"department_id": "1.5"}, {"limit": "x"}],
+)
+def test_invalid_arguments(arguments):
+    with pytest.raises(HTTPException) as error:
+        policies_service.select_users_with_policy(1, arguments)
+
+    assert error.value.status_code == 422
@@ -0,0 +1,84 @@
+import pytest
+from models.department import departments
+from models.postgresql_handler import PostgreSQLHandler, PreparedStatement
+
+
+def test_placeholders_become_numbered_parameters():
+    statement = PreparedStatement(
+        "user", "select_user", "SELECT * FROM x WHERE a=%s AND b=%s LIMIT %s;"
+    )
+
+    assert statement.name == "user__select_user"
+    assert statement.parameters_count == 3
+    assert statement.numbered_text == "SELECT * FROM x WHERE a=$1 AND b=$2 LIMIT $3;"
+    assert statement.execute_sql == "EXECUTE user__select_user(%s, %s, %s)"
+    assert statement.read_only
+
+
+def test_statement_without_parameters():
+    statement = PreparedStatement("role", "select_roles", "SELECT * FROM role;")
+
+    assert statement.parameters_count == 0
+    assert statement.execute_sql == "EXECUTE role__select_roles"
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "CREATE TABLE IF NOT EXISTS x(id int);",
+        "SELECT * FROM x WHERE name LIKE 'a%%';",
+        "CALL refresh();",
+    ],
+)
+def test_statement_executed_as_plain_text(text):
+    assert not PreparedStatement("x", "y", text).preparable
+
+
+def prepared_in_session(cursor):
+    cursor.execute("SELECT name FROM pg_prepared_statements;")
+
+    return {name for name, in cursor.fetchall()}
+
+
+def test_statement_is_prepared_once_per_connection(database):
+    name = PreparedStatement("department", "select_department_by_id", "").name
+
+    for department_id in (1, 2, 1):
+        departments.select_department_by_id(department_id)
+
+    assert name in prepared_in_session(database.cursor)
+    assert name in PostgreSQLHandler().connection.prepared_statements
+
+    database.cursor.execute("SELECT count(*) FROM pg_prepared_statements;")
+    prepared_count = database.cursor.fetchone()[0]
+    departments.select_department_by_id(3)
+    database.cursor.execute("SELECT count(*) FROM pg_prepared_statements;")
+
+    assert database.cursor.fetchone()[0] == prepared_count
+
+
+def test_new_connection_prepares_again(database):
+    departments.select_departments()
+    PostgreSQLHandler.finish(commit=False)
+    PostgreSQLHandler.release_connection()
+    PostgreSQLHandler.pool().close()
+
+    PostgreSQLHandler.begin()
+    fresh = PostgreSQLHandler().connection
+
+    assert fresh.prepared_statements == set()
+    assert departments.select_departments() == departments.select_departments()
+    assert "department__select_departments" in prepared_in_session(
+        PostgreSQLHandler().cursor
+    )
+
+
+def test_prepared_statement_returns_same_rows_as_text(database):
+    statement = PostgreSQLHandler.prepared_statement("department", "select_departments")
+
+    database.cursor.execute(statement.text)
+    columns = [column.name for column in database.cursor.description]
+    expected = [dict(zip(columns, row)) for row in database.cursor.fetchall()]
+
+    assert statement.preparable
+    assert departments.select_departments() == expected
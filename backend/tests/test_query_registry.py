@@ -0,0 +1,72 @@
+import pytest
+from models.query_registry import (
+    QUERIES,
+    MissingQueryError,
+    QueryRegistry,
+    find_query_references,
+)
+
+MODEL_SOURCE = """
+class Model:
+    def select(self, folder):
+        self.fetch_all("user", "select_users")
+        self.execute("user", "missing_query", (1,))
+        self.fetch_one(folder, "dynamic")
+        self.cursor.execute("SELECT 1;")
+"""
+
+
+@pytest.fixture
+def registry(tmp_path):
+    (tmp_path / "user").mkdir()
+    (tmp_path / "user" / "select_users.sql").write_text("SELECT * FROM user;")
+    (tmp_path / "user" / "notes.txt").write_text("not a query")
+    (tmp_path / "README.md").write_text("not a folder")
+
+    return QueryRegistry(str(tmp_path))
+
+
+def test_queries_are_keyed_by_folder_and_name(registry):
+    assert list(registry) == ["user/select_users"]
+    assert registry.query("user", "select_users") == "SELECT * FROM user;"
+
+
+def test_registry_is_immutable(registry):
+    with pytest.raises(TypeError):
+        registry._queries["user/drop"] = "DROP TABLE user;"
+
+    assert len(registry) == 1
+
+
+def test_unknown_query_raises(registry):
+    with pytest.raises(MissingQueryError, match="user/select_user'"):
+        registry.query("user", "select_user")
+
+    assert "user/select_user" not in registry
+
+
+def test_only_literal_query_references_are_found(tmp_path):
+    (tmp_path / "model.py").write_text(MODEL_SOURCE)
+
+    assert list(find_query_references(str(tmp_path))) == [
+        ("user", "select_users", "model.py:4"),
+        ("user", "missing_query", "model.py:5"),
+    ]
+
+
+def test_missing_references_are_listed(registry, tmp_path):
+    (tmp_path / "model.py").write_text(MODEL_SOURCE)
+
+    with pytest.raises(MissingQueryError) as error:
+        registry.check_references(find_query_references(str(tmp_path)))
+
+    assert str(error.value) == (
+        "Referenced SQL queries do not exist: 'user/missing_query' (model.py:5)"
+    )
+
+
+def test_every_model_query_exists():
+    references = list(find_query_references())
+
+    assert references
+    QUERIES.check_references(references)
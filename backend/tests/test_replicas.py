@@ -0,0 +1,130 @@
+import psycopg2
+import pytest
+from models.department import departments
+from models.postgresql_handler import (
+    ConnectionPool,
+    PostgreSQLHandler,
+    ReplicaSet,
+    is_read_only,
+)
+
+
+@pytest.mark.parametrize(
+    "text, read_only",
+    [
+        ("SELECT * FROM role;", True),
+        ("  -- comment\nWITH r AS (SELECT 1) SELECT * FROM r;", True),
+        ("VALUES (1), (2);", True),
+        ("SELECT * FROM role FOR UPDATE;", False),
+        ("SELECT * FROM role FOR NO KEY UPDATE;", False),
+        ("SELECT * FROM role FOR KEY SHARE;", False),
+        ("WITH d AS (DELETE FROM role RETURNING id) SELECT * FROM d;", False),
+        ("INSERT INTO role(title) VALUES (%s);", False),
+        ("-- SELECT\nUPDATE role SET title=%s;", False),
+        ("CALL refresh();", False),
+    ],
+)
+def test_read_only_statements(text, read_only):
+    assert is_read_only(text) is read_only
+
+
+@pytest.fixture
+def replica_pools(connection_settings):
+    """
+    Read-only pools on the primary, which reports no replication lag
+    """
+
+    pools = [
+        ConnectionPool(connection_settings, min_size=0, max_size=1, read_only=True)
+        for _ in range(2)
+    ]
+
+    yield pools
+
+    for pool in pools:
+        pool.close()
+
+
+def test_replicas_are_taken_in_turn(replica_pools):
+    replicas = ReplicaSet(replica_pools)
+    taken = []
+
+    for _ in range(4):
+        pool, replica_connection = replicas.getconn()
+        taken.append(pool)
+        pool.putconn(replica_connection)
+
+    assert taken == replica_pools * 2
+    assert [stats["lag"] for stats in replicas.stats()] == [0.0, 0.0]
+
+
+def test_lagging_replicas_are_skipped(replica_pools):
+    replicas = ReplicaSet(replica_pools, max_lag=-1.0)
+
+    assert replicas.getconn() is None
+    assert [stats["available"] for stats in replicas.stats()] == [False, False]
+    assert [stats["in_use"] for stats in replicas.stats()] == [0, 0]
+
+
+def test_unreachable_replica_is_skipped(connection_settings, replica_pools):
+    unreachable = ConnectionPool(
+        {**connection_settings, "port": 1, "connect_timeout": 1}, min_size=0
+    )
+    replicas = ReplicaSet([unreachable, replica_pools[0]], lag_check_interval=60)
+
+    pool, replica_connection = replicas.getconn()
+    pool.putconn(replica_connection)
+
+    assert pool is replica_pools[0]
+    assert replicas.stats()[0]["available"] is False
+
+
+@pytest.fixture
+def replica(database, replica_pools, monkeypatch):
+    """
+    Unit of work of primary with one read-only replica
+    """
+
+    PostgreSQLHandler.release_replica()
+    monkeypatch.setattr(PostgreSQLHandler, "_replicas", ReplicaSet(replica_pools[:1]))
+
+    yield replica_pools[0]
+
+    PostgreSQLHandler.release_replica()
+
+
+def read_only_session(cursor):
+    cursor.execute("SHOW transaction_read_only;")
+
+    return cursor.fetchone()[0] == "on"
+
+
+def test_reads_go_to_replica(database, replica):
+    assert departments.select_departments() is not None
+    assert PostgreSQLHandler._local.replica_pool is replica
+    assert read_only_session(PostgreSQLHandler().replica_cursor)
+    assert not read_only_session(database.cursor)
+
+
+def test_reads_after_write_go_to_primary(replica):
+    department_id = departments.insert_department(
+        {"name": "Replica test", "description": None, "head_id": 1}
+    )
+
+    assert PostgreSQLHandler().replica_connection is None
+    assert departments.select_department_by_id(department_id)["name"] == "Replica test"
+
+
+def test_broken_replica_falls_back_to_primary(connection_settings, replica):
+    expected = departments.select_department_by_id(1)
+    backend = PostgreSQLHandler().replica_connection.get_backend_pid()
+    other = psycopg2.connect(**connection_settings)
+
+    with other, other.cursor() as cursor:
+        cursor.execute("SELECT pg_terminate_backend(%s);", (backend,))
+
+    other.close()
+
+    assert departments.select_department_by_id(1) == expected
+    assert PostgreSQLHandler._local.replica_connection is None
+    assert replica.stats()["size"] == 0
@@ -0,0 +1,83 @@
+from datetime import date
+
+import pytest
+from models.postgresql_handler import (
+    REGISTER_DATE_MAPPING,
+    RowMapping,
+    compile_row_mapper,
+)
+from models.user import users
+from psycopg2.extras import RealDictCursor
+
+ROW_QUERY = (
+    "SELECT 1 AS id, 'Ann' AS name, %s::date AS register_date, "
+    "'hash' AS password, 2 AS id;"
+)
+
+
+@pytest.fixture
+def described(database):
+    """
+    Description and row of query with duplicated 'id' column
+    """
+
+    def execute(register_date):
+        database.cursor.execute(ROW_QUERY, (register_date,))
+
+        return database.cursor.description, database.cursor.fetchone()
+
+    return execute
+
+
+def test_duplicated_column_keeps_last_value(described):
+    description, row = described(None)
+
+    assert compile_row_mapper(description)(row) == {
+        "id": 2,
+        "name": "Ann",
+        "register_date": None,
+        "password": "hash",
+    }
+
+
+def test_excluded_columns_and_converters(described):
+    mapping = RowMapping(exclude=("password",), converters=(("register_date", str),))
+    description, row = described(date(2021, 3, 4))
+
+    assert compile_row_mapper(description, mapping)(row) == {
+        "id": 2,
+        "name": "Ann",
+        "register_date": "2021-03-04",
+    }
+
+
+def test_single_remaining_column(described):
+    mapping = RowMapping(exclude=("id", "register_date", "password"))
+    description, row = described(None)
+
+    assert compile_row_mapper(description, mapping)(row) == {"name": "Ann"}
+
+
+def test_converter_of_excluded_column_is_ignored(described):
+    mapping = RowMapping(
+        exclude=("register_date",), converters=REGISTER_DATE_MAPPING.converters
+    )
+    description, row = described(date(2021, 3, 4))
+
+    assert "register_date" not in compile_row_mapper(description, mapping)(row)
+
+
+def test_model_row_matches_dict_cursor(database):
+    position_id = database.insert("position", title="Row mapper test", level=1)
+    database.user(
+        "row-mapper@test.io", register_date=date(2021, 5, 6), position_id=position_id
+    )
+
+    with database.cursor.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+        cursor.execute(users.get_query("user", "select_user"), ("row-mapper@test.io",))
+        expected = dict(cursor.fetchone())
+
+    del expected["password"], expected["id"]
+    expected["register_date"] = "2021-05-06"
+
+    assert users.select_user("row-mapper@test.io") == expected
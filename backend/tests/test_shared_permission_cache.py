@@ -0,0 +1,120 @@
+import time
+import uuid
+
+import permission_cache
+import pytest
+from config import CONFIG
+from models.rbac_events import RBACChange
+from permission_cache import (
+    PermissionCache,
+    SharedPermissionCache,
+    create_permission_cache,
+)
+from redis import Redis, RedisError
+
+POLICIES = {"Manage users": frozenset({1, 2}), "Manage units": frozenset({3})}
+
+
+@pytest.fixture
+def client():
+    """
+    Client of Redis server from 'PERMISSION_CACHE_URL', skipped when it
+    can not be reached
+    """
+
+    redis_client = Redis.from_url(CONFIG.PERMISSION_CACHE_URL, socket_timeout=1)
+
+    try:
+        redis_client.ping()
+    except RedisError as error:
+        pytest.skip(f"Redis is not available: {error}")
+
+    return redis_client
+
+
+@pytest.fixture
+def shared(client):
+    """
+    Two caches of different workers sharing one Redis server
+    """
+
+    prefix = f"permissions-test-{uuid.uuid4().hex}"
+
+    yield (
+        SharedPermissionCache(client, prefix=prefix),
+        SharedPermissionCache(client, prefix=prefix),
+    )
+
+    client.delete(*client.keys(f"{prefix}:*") or [prefix])
+
+
+def test_entry_is_shared_between_workers(shared):
+    first, second = shared
+    first.put(1, POLICIES, first.generation(1), (4, 2))
+
+    assert second.get(1, (4, 2)) == POLICIES
+    assert second.get(1, (5, 2)) is None
+    assert second.stats()["outdated"] == 1
+
+
+def test_invalidation_is_shared_between_workers(shared):
+    first, second = shared
+    first.put(1, POLICIES, first.generation(1))
+    first.put(2, POLICIES, first.generation(2))
+
+    second.handle_change(RBACChange("user_group", 1))
+
+    assert first.get(1) is None
+    assert first.get(2) == POLICIES
+
+    second.invalidate()
+
+    assert first.get(2) is None
+
+
+def test_policies_loaded_before_invalidation_are_not_written(shared):
+    first, second = shared
+    generation = first.generation(1)
+    second.invalidate(1)
+
+    first.put(1, POLICIES, generation)
+
+    assert first.get(1) is None
+    assert first.stats()["stale_writes"] == 1
+
+
+def test_entries_expire(shared):
+    first, _ = shared
+    first.ttl = 0.001
+    first.put(1, POLICIES, first.generation(1))
+    time.sleep(0.05)
+
+    assert first.get(1) is None
+
+
+def test_unreachable_server_only_counts_errors():
+    cache = SharedPermissionCache(
+        Redis(port=1, socket_connect_timeout=0.1), prefix="unreachable"
+    )
+    generation = cache.generation(1)
+    cache.put(1, POLICIES, generation)
+    cache.invalidate(1)
+
+    assert generation == (-1, -1)
+    assert cache.get(1) is None
+    assert cache.stats()["errors"] == 4
+
+
+def test_backend_is_chosen_by_configuration(monkeypatch):
+    monkeypatch.setattr(CONFIG, "PERMISSION_CACHE_BACKEND", "local")
+
+    assert isinstance(create_permission_cache(), PermissionCache)
+
+    monkeypatch.setattr(CONFIG, "PERMISSION_CACHE_BACKEND", "shared")
+
+    assert isinstance(create_permission_cache(), SharedPermissionCache)
+
+    monkeypatch.setattr(permission_cache, "Redis", None)
+
+    with pytest.raises(RuntimeError):
+        create_permission_cache()
@@ -0,0 +1,80 @@
+import pytest
+from models.department import departments
+from models.postgresql_handler import PostgreSQLHandler, StatementTimeoutError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+
+@pytest.fixture
+def timeouts(monkeypatch):
+    PostgreSQLHandler.settings()
+    monkeypatch.setattr(
+        PostgreSQLHandler,
+        "_statement_timeouts",
+        {
+            "read": 10.0,
+            "write": 20.0,
+            "stream": 60.0,
+            "procedure": 60.0,
+            "queries": {"user/select_users": 30.0},
+            "endpoints": {"users_users": 0.5},
+        },
+    )
+
+    yield
+
+    PostgreSQLHandler._local.statement_timeout = None
+
+
+def test_query_timeout_overrides_class(timeouts):
+    assert PostgreSQLHandler.statement_timeout("user/select_users", "stream") == 30.0
+    assert PostgreSQLHandler.statement_timeout("user/select_user", "read") == 10.0
+    assert PostgreSQLHandler.statement_timeout("user/insert_user", "write") == 20.0
+
+
+def test_endpoint_timeout_overrides_query(timeouts):
+    PostgreSQLHandler.use_endpoint_timeout("users_users")
+
+    assert PostgreSQLHandler.statement_timeout("user/select_users", "stream") == 0.5
+
+    PostgreSQLHandler.use_endpoint_timeout("users_user")
+
+    assert PostgreSQLHandler.statement_timeout("user/select_users", "stream") == 30.0
+
+
+def session_timeout(cursor):
+    cursor.execute("SHOW statement_timeout;")
+
+    return cursor.fetchone()[0]
+
+
+def test_timeout_is_set_once_per_session(database):
+    handler = PostgreSQLHandler()
+
+    with handler.cancellable(database.cursor, 0.25):
+        pass
+
+    assert session_timeout(database.cursor) == "250ms"
+    assert database.cursor.connection.statement_timeout == 0.25
+
+
+def test_slow_statement_is_cancelled(database):
+    handler = PostgreSQLHandler()
+
+    with pytest.raises(StatementTimeoutError, match="0.05 seconds"):
+        with handler.cancellable(database.cursor, 0.05):
+            database.cursor.execute("SELECT pg_sleep(1);")
+
+    connection = database.cursor.connection
+
+    assert connection.get_transaction_status() == TRANSACTION_STATUS_IDLE
+    assert connection.statement_timeout is None
+    assert PostgreSQLHandler._local.failed is True
+
+
+def test_connection_is_usable_after_cancel(database):
+    with pytest.raises(StatementTimeoutError):
+        with PostgreSQLHandler().cancellable(database.cursor, 0.05):
+            database.cursor.execute("SELECT pg_sleep(1);")
+
+    assert departments.select_department_by_id(1)["id"] == 1
+    assert session_timeout(database.cursor) == "10s"
@@ -0,0 +1,91 @@
+import json
+from datetime import date
+
+import pytest
+import streaming
+from models.postgresql_handler import PostgreSQLHandler
+from models.user import users
+
+
+@pytest.fixture
+def streamed_users(database, monkeypatch):
+    """
+    Five registered test users, streams read them two rows per round trip
+    """
+
+    monkeypatch.setattr(PostgreSQLHandler, "_itersize", 2)
+    department_id = database.insert(
+        "department", name="Streaming test", description=None, head_id=None
+    )
+    user_ids = [
+        database.user(
+            f"stream-{index}@test.io",
+            register_date=date(2021, 1, index),
+            department_id=department_id,
+        )
+        for index in range(1, 6)
+    ]
+
+    return department_id, user_ids
+
+
+def open_cursors(database):
+    return database.value("SELECT count(*) FROM pg_cursors WHERE is_holdable IS FALSE;")
+
+
+def test_stream_yields_every_row(database, streamed_users):
+    _, streamed_users = streamed_users
+    rows = list(users.select_users())
+
+    assert len(rows) == database.value('SELECT count(*) FROM "user";')
+    assert [row["id"] for row in rows if row["id"] in streamed_users] == (
+        streamed_users
+    )
+    assert {row["register_date"] for row in rows if row["id"] in streamed_users} == {
+        f"2021-01-0{index}" for index in range(1, 6)
+    }
+    assert open_cursors(database) == 0
+
+
+def test_stream_matches_page_query(streamed_users):
+    department_id, streamed_users = streamed_users
+    filters = {"department_id": department_id, "registered_from": date(2021, 1, 2)}
+    streamed = list(users.stream_users(**filters))
+
+    assert [row["id"] for row in streamed] == streamed_users[1:]
+    assert streamed == users.select_users_page(0, 100, **filters)
+
+
+def test_closed_stream_releases_cursor(database, streamed_users):
+    department_id, streamed_users = streamed_users
+    rows = users.stream_users(department_id=department_id)
+
+    assert next(rows)["id"] == streamed_users[0]
+    assert open_cursors(database) == 1
+
+    rows.close()
+
+    assert open_cursors(database) == 0
+    assert (
+        database.value('SELECT count(*) FROM "user" WHERE id=%s;', (streamed_users[0],))
+        == 1
+    )
+
+
+def test_empty_stream(database):
+    rows = users.stream_users(registered_from=date(2999, 1, 1))
+
+    assert list(rows) == []
+    assert "".join(streaming.json_array_chunks(rows)) == "[]"
+
+
+def test_json_array_is_split_into_chunks(monkeypatch):
+    monkeypatch.setattr(streaming, "ROWS_PER_CHUNK", 2)
+    rows = [{"id": index, "register_date": date(2021, 1, index)} for index in (1, 2, 3)]
+
+    chunks = list(streaming.json_array_chunks(iter(rows)))
+
+    assert len(chunks) == 2
+    assert json.loads("".join(chunks)) == [
+        {"id": index, "register_date": f"2021-01-0{index}"} for index in (1, 2, 3)
+    ]
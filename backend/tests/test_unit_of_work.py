@@ -0,0 +1,104 @@
+import psycopg2
+import pytest
+from enums import TransactionResult
+from models.department import departments
+from models.postgresql_handler import PostgreSQLHandler, transaction
+
+PREFIX = "unit-of-work-test-"
+
+
+@pytest.fixture
+def committed(connection_settings):
+    """
+    Names of test departments visible to another session
+    """
+
+    observer = psycopg2.connect(**connection_settings)
+    observer.autocommit = True
+
+    def names():
+        with observer.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM department WHERE name LIKE %s ORDER BY id;",
+                (PREFIX + "%",),
+            )
+
+            return [name for name, in cursor.fetchall()]
+
+    yield names
+
+    PostgreSQLHandler.release_connection()
+
+    with observer.cursor() as cursor:
+        cursor.execute("DELETE FROM department WHERE name LIKE %s;", (PREFIX + "%",))
+
+    observer.close()
+
+
+def insert(name, head_id=None):
+    return departments.insert_department(
+        {"name": PREFIX + name, "description": None, "head_id": head_id}
+    )
+
+
+def test_model_commits_outside_unit_of_work(committed):
+    insert("alone")
+
+    assert committed() == [PREFIX + "alone"]
+
+
+def test_outermost_unit_commits_deferred_writes(committed):
+    called = []
+
+    PostgreSQLHandler.begin()
+    insert("first")
+    departments.after_commit(called.append, "first")
+
+    PostgreSQLHandler.begin()
+    insert("second")
+    PostgreSQLHandler.finish()
+
+    assert committed() == []
+    assert called == []
+
+    PostgreSQLHandler.finish()
+
+    assert committed() == [PREFIX + "first", PREFIX + "second"]
+    assert called == ["first"]
+
+
+def test_failed_statement_rolls_back_whole_unit(committed):
+    called = []
+
+    with transaction():
+        insert("kept")
+        departments.after_commit(called.append, "kept")
+
+        assert insert("orphan", head_id=-1) == TransactionResult.ERROR
+
+    assert committed() == []
+    assert called == []
+
+
+def test_exception_rolls_back_transaction(committed):
+    with pytest.raises(RuntimeError):
+        with transaction():
+            insert("raised")
+            raise RuntimeError
+
+    assert committed() == []
+    assert departments.connection.get_transaction_status() == (
+        psycopg2.extensions.TRANSACTION_STATUS_IDLE
+    )
+
+
+def test_finish_without_commit_discards_writes(committed):
+    PostgreSQLHandler.begin()
+    insert("discarded")
+    PostgreSQLHandler.finish(commit=False)
+
+    PostgreSQLHandler.begin()
+    assert departments.select_department_by_name(PREFIX + "discarded") is None
+    PostgreSQLHandler.finish()
+
+    assert committed() == []
@@ -0,0 +1,204 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import permissions
+import pytest
+from authorization_graph import authorization_graph
+from enums import Permission
+from http_exception import HTTPException
+from password_hashing import PasswordHasher, password_hasher
+from permission_cache import PermissionCache, VersionCache
+from services import user_import_service as service
+from werkzeug.security import check_password_hash
+
+PASSWORD = "Passw0rd!x"
+ADMIN = {"id": 1}
+
+
+@pytest.fixture
+def importing(database, monkeypatch):
+    """
+    Import into test database hashing passwords on calling thread
+    """
+
+    monkeypatch.setattr(password_hasher, "processes", 0)
+    monkeypatch.setattr(permissions, "permission_cache", PermissionCache())
+    monkeypatch.setattr(permissions, "version_cache", VersionCache())
+
+    yield database
+
+    authorization_graph.invalidate()
+
+
+def csv_document(*rows):
+    lines = ["first_name,last_name,middle_name,email,password"]
+    lines += [f"First,Last,,{email},{password}" for email, password in rows]
+
+    return "\n".join(lines) + "\n"
+
+
+def user_row(database, email):
+    database.cursor.execute(
+        'SELECT id, first_name, middle_name, password, register_date FROM "user" '
+        "WHERE email=%s;",
+        (email,),
+    )
+
+    return database.cursor.fetchone()
+
+
+def test_csv_rows_are_imported_and_rejected_by_line(importing):
+    importing.user("import-taken@test.io")
+    document = csv_document(
+        ("import-1@test.io", PASSWORD),
+        ("import-taken@test.io", PASSWORD),
+        ("import-2@test.io", "weak"),
+        ("import-1@test.io", PASSWORD),
+        ("import-3@test.io", PASSWORD),
+    )
+
+    report = service.import_users(document, "text/csv", {}, ADMIN)
+    users = {user["email"]: user for user in report["users"]}
+
+    assert (report["imported"], report["failed"]) == (2, 3)
+    assert [user["line"] for user in report["users"]] == [2, 6]
+    assert [(error["line"], error["email"]) for error in report["errors"]] == [
+        (3, "import-taken@test.io"),
+        (4, "import-2@test.io"),
+        (5, "import-1@test.io"),
+    ]
+    assert report["errors"][0]["error"] == "User already exist"
+
+    user_id, first_name, middle_name, password, register_date = user_row(
+        importing, "import-3@test.io"
+    )
+
+    assert user_id == users["import-3@test.io"]["id"]
+    assert (first_name, middle_name) == ("First", None)
+    assert check_password_hash(password, PASSWORD)
+    assert register_date is not None
+    assert user_row(importing, "import-2@test.io") is None
+    assert user_row(importing, "import-taken@test.io")[3] == "hash"
+
+
+def test_ndjson_import(importing):
+    document = "\n".join(
+        [
+            json.dumps(
+                {
+                    "first_name": "Ndjson",
+                    "last_name": "Last",
+                    "middle_name": "Middle",
+                    "email": "import-ndjson@test.io",
+                    "password": PASSWORD,
+                }
+            ),
+            "",
+            "[1, 2]",
+            "not json",
+        ]
+    )
+
+    report = service.import_users(document, "application/x-ndjson", {}, ADMIN)
+
+    assert report["imported"] == 1
+    assert [error["line"] for error in report["errors"]] == [3, 4]
+    assert user_row(importing, "import-ndjson@test.io")[1:3] == ("Ndjson", "Middle")
+
+
+def test_imported_users_get_roles_and_groups(importing):
+    department_id = importing.department("Import test")
+    role_id = importing.role("import-role", (Permission.MANAGE_UNITS, department_id))
+    group_id = importing.insert("group", name="import-group", description=None)
+    document = csv_document(
+        ("import-1@test.io", PASSWORD), ("import-2@test.io", PASSWORD)
+    )
+
+    report = service.import_users(
+        document,
+        "text/csv",
+        {"role_ids": str(role_id), "group_ids": str(group_id)},
+        ADMIN,
+    )
+    user_ids = [user["id"] for user in report["users"]]
+
+    assert importing.value(
+        "SELECT array_agg(user_id ORDER BY user_id) FROM user_role WHERE role_id=%s;",
+        (role_id,),
+    ) == sorted(user_ids)
+    assert importing.value(
+        "SELECT array_agg(user_id ORDER BY user_id) FROM user_group "
+        "WHERE group_id=%s;",
+        (group_id,),
+    ) == sorted(user_ids)
+    assert importing.value(
+        "SELECT count(*) FROM user_effective_policy "
+        "WHERE user_id=ANY(%s) AND department_id=%s;",
+        (user_ids, department_id),
+    ) == len(user_ids)
+
+
+def test_unknown_role_rolls_import_back(importing):
+    document = csv_document(("import-1@test.io", PASSWORD))
+
+    with pytest.raises(HTTPException) as error:
+        service.import_users(document, "text/csv", {"role_ids": "999999999"}, ADMIN)
+
+    assert error.value.status_code == 422
+    assert (
+        importing.value(
+            'SELECT count(*) FROM "user" WHERE email=%s;', ("import-1@test.io",)
+        )
+        == 0
+    )
+
+
+def test_roles_need_manage_users(importing):
+    clerk = importing.user("import-clerk@test.io")
+    document = csv_document(("import-1@test.io", PASSWORD))
+
+    with pytest.raises(HTTPException) as error:
+        service.import_users(document, "text/csv", {"role_ids": "1"}, {"id": clerk})
+
+    assert error.value.status_code == 403
+
+
+@pytest.mark.parametrize(
+    "data, content_type, status",
+    [
+        ("", "text/csv", 400),
+        ("email,password\n", "text/csv", 400),
+        ("first_name,last_name,email,password\n", "text/csv", 400),
+        ("{}", "application/json", 415),
+    ],
+)
+def test_invalid_document(data, content_type, status):
+    with pytest.raises(HTTPException) as error:
+        service.import_users(data, content_type, {}, ADMIN)
+
+    assert error.value.status_code == status
+
+
+def test_too_many_rows(monkeypatch):
+    monkeypatch.setattr(service, "MAX_IMPORT_ROWS", 1)
+    document = csv_document(("a@test.io", PASSWORD), ("b@test.io", PASSWORD))
+
+    with pytest.raises(HTTPException) as error:
+        service.import_users(document, "text/csv", {}, ADMIN)
+
+    assert error.value.status_code == 413
+
+
+def test_passwords_are_hashed_in_worker_processes():
+    hasher = PasswordHasher(2)
+    passwords = [f"{PASSWORD}{index}" for index in range(3)]
+
+    try:
+        hashes = hasher.hash_passwords(passwords)
+
+        assert isinstance(hasher._executor, ProcessPoolExecutor)
+    finally:
+        hasher._executor.shutdown()
+
+    assert all(map(check_password_hash, hashes, passwords))
+    assert len(set(hashes)) == 3
@@ -0,0 +1,146 @@
+import csv
+import gzip
+import io
+import json
+from datetime import date
+
+import pytest
+import streaming
+from http_exception import HTTPException
+from models.postgresql_handler import PostgreSQLHandler
+from services import users_service
+
+
+@pytest.fixture
+def exported(database, monkeypatch):
+    """
+    Three users of new department, streams read them two rows per round trip
+    """
+
+    monkeypatch.setattr(PostgreSQLHandler, "_itersize", 2)
+    department_id = database.department("Export test")
+    user_ids = [
+        database.user(
+            f"export-{day}@test.io",
+            first_name=f"First, {day}",
+            register_date=date(2021, 1, day),
+            department_id=department_id,
+        )
+        for day in range(1, 4)
+    ]
+
+    return department_id, user_ids
+
+
+def export(**arguments):
+    result = users_service.export_users(
+        {name: str(value) for name, value in arguments.items()}
+    )
+    data = b"".join(
+        chunk if isinstance(chunk, bytes) else chunk.encode() for chunk in result.chunks
+    )
+
+    return result.mimetype, result.filename, data
+
+
+def test_ndjson_export(exported):
+    department_id, user_ids = exported
+    mimetype, filename, data = export(department_id=department_id)
+    rows = [json.loads(line) for line in data.decode().splitlines()]
+
+    assert (mimetype, filename) == ("application/x-ndjson", "users.ndjson")
+    assert [row["id"] for row in rows] == user_ids
+    assert list(rows[0]) == list(users_service.EXPORT_COLUMNS)
+    assert rows[0]["register_date"] == "2021-01-01"
+    assert rows[0]["department_id"] == department_id
+
+
+def test_csv_export_of_selected_columns(exported):
+    department_id, user_ids = exported
+    mimetype, filename, data = export(
+        format="csv",
+        columns="id, first_name",
+        department_id=department_id,
+        registered_from="2021-01-02",
+    )
+
+    assert (mimetype, filename) == ("text/csv", "users.csv")
+    assert list(csv.reader(io.StringIO(data.decode()))) == [
+        ["id", "first_name"],
+        [str(user_ids[1]), "First, 2"],
+        [str(user_ids[2]), "First, 3"],
+    ]
+
+
+def test_gzip_export(exported):
+    department_id, user_ids = exported
+    mimetype, filename, data = export(
+        format="csv", columns="email", department_id=department_id, gzip="true"
+    )
+
+    assert (mimetype, filename) == ("application/gzip", "users.csv.gz")
+    assert gzip.decompress(data).decode().split() == [
+        "email",
+        "export-1@test.io",
+        "export-2@test.io",
+        "export-3@test.io",
+    ]
+
+
+def test_export_reads_rows_as_it_is_sent(database, exported, monkeypatch):
+    monkeypatch.setattr(streaming, "ROWS_PER_CHUNK", 1)
+    department_id, user_ids = exported
+    chunks = users_service.export_users({"department_id": str(department_id)}).chunks
+
+    assert json.loads(next(chunks))["id"] == user_ids[0]
+    assert database.value("SELECT count(*) FROM pg_cursors WHERE NOT is_holdable;") == 1
+
+    chunks.close()
+
+    assert database.value("SELECT count(*) FROM pg_cursors WHERE NOT is_holdable;") == 0
+
+
+def test_empty_export(database):
+    _, _, data = export(format="csv", registered_from="2999-01-01")
+
+    assert data.decode().splitlines() == [",".join(users_service.EXPORT_COLUMNS)]
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        {"format": "xml"},
+        {"columns": "id,password"},
+        {"gzip": "yes"},
+        {"department_id": "x"},
+        {"registered_to": "2021-13-01"},
+    ],
+)
+def test_invalid_export_arguments(arguments):
+    with pytest.raises(HTTPException) as error:
+        users_service.export_users(arguments)
+
+    assert error.value.status_code == 422
+
+
+def test_file_chunks_keep_selected_columns(monkeypatch):
+    monkeypatch.setattr(streaming, "ROWS_PER_CHUNK", 1)
+    rows = [
+        {"id": 1, "email": "a@test.io", "password": "hash"},
+        {"id": 2, "email": "b,c@test.io", "password": "hash"},
+    ]
+
+    ndjson = "".join(streaming.ndjson_chunks(rows, ["id", "email"]))
+    text = gzip.decompress(
+        b"".join(streaming.gzip_chunks(streaming.csv_chunks(rows, ["id", "email"])))
+    ).decode()
+
+    assert [json.loads(line) for line in ndjson.splitlines()] == [
+        {"id": 1, "email": "a@test.io"},
+        {"id": 2, "email": "b,c@test.io"},
+    ]
+    assert list(csv.reader(io.StringIO(text))) == [
+        ["id", "email"],
+        ["1", "a@test.io"],
+        ["2", "b,c@test.io"],
+    ]
@@ -0,0 +1,384 @@
+from datetime import date
+
+import pytest
+from authorization_graph import authorization_graph
+from enums import Permission
+from http_exception import HTTPException
+from models.postgresql_handler import PostgreSQLHandler
+from services import users_service
+from services.request_validators import MAX_PAGE_SIZE, PAGE_SIZE
+
+
+class UsersPages:
+    """
+    Users model serving pages of users with ids from 1 to 'count'
+    """
+
+    def __init__(self, count: int) -> None:
+        self.count = count
+        self.pages = []
+
+    def select_users_page(self, after, limit, **filters):
+        self.pages.append((after, limit, filters))
+        last = min(after + limit, self.count)
+
+        return [{"id": user_id} for user_id in range(after + 1, last + 1)]
+
+
+@pytest.fixture
+def users(monkeypatch):
+    model = UsersPages(5)
+    monkeypatch.setattr(users_service, "db", model)
+
+    return model
+
+
+def test_cursor_round_trip():
+    for user_id in (0, 1, 12345, 2**40):
+        cursor = users_service.encode_cursor(user_id)
+
+        assert "=" not in cursor
+        assert users_service.decode_cursor(cursor) == user_id
+
+
+def test_absent_cursor_starts_from_beginning():
+    assert users_service.decode_cursor(None) == 0
+    assert users_service.decode_cursor("") == 0
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "zzz",
+        users_service.encode_cursor(-1),
+        # Valid base64 of JSON without 'after', of list and of boolean
+        "e30",
+        "W10",
+        "eyJhZnRlciI6dHJ1ZX0",
+    ],
+)
+def test_invalid_cursor(cursor):
+    with pytest.raises(HTTPException) as error:
+        users_service.decode_cursor(cursor)
+
+    assert error.value.status_code == 422
+
+
+def test_pages_follow_next_cursor(users):
+    page = users_service.select_users_page({"limit": "2"})
+    identifiers = [user["id"] for user in page["users"]]
+
+    while page["next"] is not None:
+        page = users_service.select_users_page({"limit": "2", "cursor": page["next"]})
+        identifiers += [user["id"] for user in page["users"]]
+
+    assert identifiers == [1, 2, 3, 4, 5]
+    assert [after for after, _, _ in users.pages] == [0, 2, 4]
+
+
+def test_full_last_page_needs_one_more_request(users):
+    page = users_service.select_users_page({"limit": "5"})
+
+    assert len(page["users"]) == 5
+    assert users_service.decode_cursor(page["next"]) == 5
+    assert users_service.select_users_page({"limit": "5", "cursor": page["next"]}) == {
+        "users": [],
+        "next": None,
+    }
+
+
+def test_filters_are_passed_to_model(users):
+    users_service.select_users_page(
+        {"department_id": "3", "registered_from": "2021-01-31"}
+    )
+    _, limit, filters = users.pages[0]
+
+    assert limit == PAGE_SIZE
+    assert filters["department_id"] == 3
+    assert filters["unit_id"] is None
+    assert str(filters["registered_from"]) == "2021-01-31"
+
+
+@pytest.mark.parametrize(
+    "arguments", [{"limit": str(MAX_PAGE_SIZE + 1)}, {"limit": "x"}, {"limit": "-1"}]
+)
+def test_invalid_page_size(users, arguments):
+    with pytest.raises(HTTPException) as error:
+        users_service.select_users_page(arguments)
+
+    assert error.value.status_code == 422
+    assert users.pages == []
+
+
+class UserRoles:
+    """
+    Users model holding (user_id, role_id) pairs, writes return pairs which
+    changed like INSERT .. ON CONFLICT DO NOTHING RETURNING does
+    """
+
+    def __init__(self, *pairs) -> None:
+        self.pairs = set(pairs)
+        self.written = []
+
+    def insert_user_roles(self, pairs):
+        self.written.append(pairs)
+        created = [pair for pair in pairs if pair not in self.pairs]
+        self.pairs.update(created)
+
+        return created
+
+    def delete_user_roles(self, pairs):
+        deleted = [pair for pair in pairs if pair in self.pairs]
+        self.pairs.difference_update(deleted)
+
+        return deleted
+
+
+@pytest.fixture
+def user_roles(monkeypatch):
+    model = UserRoles((1, 10))
+    monkeypatch.setattr(users_service, "db", model)
+
+    return model
+
+
+def test_bulk_insert_reports_created_and_existing(user_roles):
+    report = users_service.insert_user_roles({"role_id": 10, "user_ids": [2, 1, 3, 2]})
+
+    assert report == {
+        "created": [{"user_id": 2, "role_id": 10}, {"user_id": 3, "role_id": 10}],
+        "existing": [{"user_id": 1, "role_id": 10}],
+    }
+    assert user_roles.written == [[(2, 10), (1, 10), (3, 10)]]
+
+    report = users_service.insert_user_roles({"user_id": 3, "role_ids": [10, 11]})
+
+    assert report == {
+        "created": [{"user_id": 3, "role_id": 11}],
+        "existing": [{"user_id": 3, "role_id": 10}],
+    }
+
+
+def test_bulk_delete_reports_deleted_and_missing(user_roles):
+    report = users_service.delete_user_roles({"role_id": 10, "user_ids": [1, 2]})
+
+    assert report == {
+        "deleted": [{"user_id": 1, "role_id": 10}],
+        "missing": [{"user_id": 2, "role_id": 10}],
+    }
+    assert user_roles.pairs == set()
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"role_id": 10},
+        {"role_id": 10, "role_ids": [1]},
+        {"role_id": 10, "user_ids": []},
+        {"role_id": 10, "user_ids": 1},
+        {"role_id": True, "user_ids": [1]},
+        {"role_id": 10, "user_ids": [1, "2"]},
+        {"role_id": 10, "user_ids": [0]},
+        {"role_id": 10, "user_ids": list(range(1, users_service.MAX_BULK_PAIRS + 2))},
+    ],
+)
+def test_invalid_bulk_body(user_roles, body):
+    with pytest.raises(HTTPException) as error:
+        users_service.insert_user_roles(body)
+
+    assert error.value.status_code == 400
+    assert user_roles.written == []
+
+
+@pytest.fixture
+def listed(database):
+    """
+    Five users of new department registered on 1-5 January 2021, even ones
+    in new unit, last one in new position
+    """
+
+    department_id = database.department("Listing test")
+    unit_id = database.insert(
+        "unit", name="Listing test", description=None, department_id=1, head_id=1
+    )
+    position_id = database.insert("position", title="Listing test", level=1)
+    user_ids = [
+        database.user(
+            f"listed-{day}@test.io",
+            register_date=date(2021, 1, day),
+            department_id=department_id,
+            unit_id=unit_id if day % 2 == 0 else None,
+            position_id=position_id if day == 5 else None,
+        )
+        for day in range(1, 6)
+    ]
+
+    return {
+        "users": user_ids,
+        "department_id": department_id,
+        "unit_id": unit_id,
+        "position_id": position_id,
+    }
+
+
+def listed_pages(**arguments):
+    """
+    Identifiers of users on every page, following 'next' of every page
+    """
+
+    arguments = {name: str(value) for name, value in arguments.items()}
+    pages = []
+
+    while True:
+        page = users_service.select_users_page(arguments)
+        pages.append([user["id"] for user in page["users"]])
+
+        if page["next"] is None:
+            return pages
+
+        arguments["cursor"] = page["next"]
+
+
+def test_department_is_paged(listed):
+    users = listed["users"]
+
+    assert listed_pages(department_id=listed["department_id"], limit=2) == [
+        users[:2],
+        users[2:4],
+        users[4:],
+    ]
+
+
+@pytest.mark.parametrize(
+    "filters, days",
+    [
+        ({"unit": True}, [2, 4]),
+        ({"position": True}, [5]),
+        ({"registered_from": "2021-01-02", "registered_to": "2021-01-04"}, [2, 3, 4]),
+        ({"unit": True, "registered_from": "2021-01-03"}, [4]),
+        ({"registered_from": "2021-01-06"}, []),
+    ],
+)
+def test_filters_select_matching_users(listed, filters, days):
+    filters = dict(filters, department_id=listed["department_id"])
+
+    if filters.pop("unit", False):
+        filters["unit_id"] = listed["unit_id"]
+
+    if filters.pop("position", False):
+        filters["position_id"] = listed["position_id"]
+
+    (page,) = listed_pages(**filters, limit=10)
+
+    assert page == [listed["users"][day - 1] for day in days]
+
+
+def test_page_has_no_password_and_plain_dates(listed):
+    arguments = {"department_id": str(listed["department_id"]), "limit": "1"}
+    (user,) = users_service.select_users_page(arguments)["users"]
+
+    assert user == {
+        "id": listed["users"][0],
+        "first_name": "First",
+        "last_name": "Last",
+        "middle_name": "Middle",
+        "email": "listed-1@test.io",
+        "register_date": "2021-01-01",
+        "near_manager_id": None,
+        "department_id": listed["department_id"],
+        "unit_id": None,
+        "position_id": None,
+    }
+
+
+def test_all_pages_list_every_user(database, listed):
+    users = [user_id for page in listed_pages(limit=1000) for user_id in page]
+
+    assert users == sorted(users)
+    assert len(users) == database.value('SELECT count(*) FROM "user";')
+    assert set(listed["users"]) <= set(users)
+
+
+@pytest.fixture
+def members(database):
+    """
+    Three users of new department, first one already has role granting
+    'Manage units' there and is in new group
+    """
+
+    department_id = database.department("Bulk test")
+    role_id = database.role("bulk-role", (Permission.MANAGE_UNITS, department_id))
+    group_id = database.insert("group", name="bulk-group", description=None)
+    user_ids = [database.user(f"bulk-{index}@test.io") for index in range(3)]
+    database.insert("user_role", user_id=user_ids[0], role_id=role_id)
+    database.insert("user_group", user_id=user_ids[0], group_id=group_id)
+
+    yield {
+        "users": user_ids,
+        "role_id": role_id,
+        "group_id": group_id,
+        "department_id": department_id,
+    }
+
+    authorization_graph.invalidate()
+
+
+def effective_users(database, members):
+    return database.value(
+        "SELECT coalesce(array_agg(user_id ORDER BY user_id), '{}') "
+        "FROM user_effective_policy WHERE department_id=%s;",
+        (members["department_id"],),
+    )
+
+
+def test_bulk_roles_are_written_in_database(database, members):
+    users, role_id = members["users"], members["role_id"]
+
+    report = users_service.insert_user_roles({"role_id": role_id, "user_ids": users})
+
+    assert report == {
+        "created": [{"user_id": user_id, "role_id": role_id} for user_id in users[1:]],
+        "existing": [{"user_id": users[0], "role_id": role_id}],
+    }
+    assert effective_users(database, members) == users
+
+    report = users_service.delete_user_roles(
+        {"user_id": users[1], "role_ids": [role_id, 1]}
+    )
+
+    assert report == {
+        "deleted": [{"user_id": users[1], "role_id": role_id}],
+        "missing": [{"user_id": users[1], "role_id": 1}],
+    }
+    assert effective_users(database, members) == [users[0], users[2]]
+
+
+def test_bulk_groups_are_written_in_database(database, members):
+    users, group_id = members["users"], members["group_id"]
+
+    report = users_service.insert_user_groups(
+        {"group_id": group_id, "user_ids": users[:2]}
+    )
+
+    assert [pair["user_id"] for pair in report["created"]] == [users[1]]
+    assert [pair["user_id"] for pair in report["existing"]] == [users[0]]
+
+    report = users_service.delete_user_groups(
+        {"group_id": group_id, "user_ids": [users[0], users[2]]}
+    )
+
+    assert [pair["user_id"] for pair in report["deleted"]] == [users[0]]
+    assert [pair["user_id"] for pair in report["missing"]] == [users[2]]
+    assert database.value(
+        "SELECT array_agg(user_id) FROM user_group WHERE group_id=%s;", (group_id,)
+    ) == [users[1]]
+
+
+def test_unknown_role_fails_whole_bulk_write(members):
+    pairs = {"user_id": members["users"][1], "role_ids": [members["role_id"], 999999]}
+
+    with pytest.raises(HTTPException) as error:
+        users_service.insert_user_roles(pairs)
+
+    assert error.value.status_code == 422
+    assert PostgreSQLHandler._local.failed is True